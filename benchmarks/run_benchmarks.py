@@ -0,0 +1,226 @@
+"""
+Набор бенчмарков: решатель, калькулятор траекторий, снимки формы,
+выборка поля скоростей и отрисовка графиков.
+
+Работает офлайн и без дисплея (backend Agg). Результаты пишутся в JSON,
+чтобы сравнивать запуски между собой:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json --threshold 0.2
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+
+# Добавляем корень проекта в пути
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.circle_body import CircleBody
+from models.disk_body import DiskBody
+from services.butcher_table import ButcherTable
+from services.runge_kutta import RungeKuttaSolver
+from services.trajectory_calculator import TrajectoryCalculator
+from services.velocity_field import VelocityField
+
+
+# Реестр бенчмарков: (имя, функция подготовки, набор)
+BENCHMARKS = []
+
+
+def benchmark(name: str, suite: str = 'quick'):
+    """
+    Регистрирует бенчмарк. Функция выполняет подготовку и возвращает
+    замеряемую функцию без аргументов.
+    """
+
+    def decorator(setup):
+        BENCHMARKS.append((name, setup, suite))
+        return setup
+
+    return decorator
+
+
+def make_body(num_points: int):
+    """Окружность из задания для 36 точек, заполненный круг для больших размеров"""
+    if num_points <= 36:
+        return CircleBody(5.0, -5.0, 3.0, num_points=num_points)
+    return DiskBody(5.0, -5.0, 3.0, num_points=num_points)
+
+
+def _register_solver_benchmarks():
+    field = VelocityField.get_default_field()
+    for n_steps, n_points, suite in [(200, 1, 'quick'), (2000, 1, 'quick'),
+                                     (200, 10 ** 4, 'quick'), (2000, 10 ** 5, 'full')]:
+        def setup(n_steps=n_steps, n_points=n_points):
+            solver = RungeKuttaSolver(ButcherTable())
+            y0 = np.tile([5.0, -5.0], (n_points, 1))
+            dt = (2.0 - 0.001) / (n_steps - 1)
+            return lambda: solver.solve_batch(field, y0, 0.001, 2.0, dt)
+
+        benchmark(f'solve[steps={n_steps},points={n_points}]', suite)(setup)
+
+    def setup_adaptive():
+        solver = RungeKuttaSolver(ButcherTable.dormand_prince())
+        y0 = np.tile([5.0, -5.0], (10 ** 4, 1))
+        return lambda: solver.solve_adaptive(field, y0, 0.001, 2.0, rtol=1e-6, atol=1e-9)
+
+    benchmark('solve_adaptive[dopri5,points=10000]')(setup_adaptive)
+
+
+def _register_calculator_benchmarks():
+    for num_points, suite in [(36, 'quick'), (10 ** 3, 'quick'), (10 ** 4, 'quick'),
+                              (10 ** 5, 'full'), (10 ** 6, 'full')]:
+        for method in ('batch', 'propagator'):
+            def setup(num_points=num_points, method=method):
+                calculator = TrajectoryCalculator(make_body(num_points), method=method)
+                return calculator.calculate_trajectories
+
+            benchmark(f'calculate_trajectories[{method},points={num_points}]', suite)(setup)
+
+    def setup_form():
+        calculator = TrajectoryCalculator(make_body(10 ** 4))
+        calculator.calculate_trajectories()
+        times = np.linspace(0.01, 1.99, 24)
+        return lambda: [calculator.get_form_at_time(t) for t in times]
+
+    benchmark('get_form_at_time[points=10000,queries=24]')(setup_form)
+
+
+def _register_field_benchmarks():
+    field = VelocityField.get_default_field()
+    for n, suite in [(30, 'quick'), (1000, 'quick')]:
+        def setup(n=n):
+            x = np.linspace(-10, 10, n)
+            grid = np.stack(np.meshgrid(x, x), axis=-1)
+            out = np.empty_like(grid)
+            return lambda: field.evaluate(0.5, grid, out=out)
+
+        benchmark(f'velocity_grid[{n}x{n}]', suite)(setup)
+
+
+def _register_rendering_benchmarks():
+    import matplotlib.pyplot as plt
+    from services.visualization import Visualization
+
+    def render(plot):
+        # plt.show() в режиме Agg ничего не делает: сохраняем и закрываем фигуру
+        plot()
+        plt.gcf().savefig(io.BytesIO(), format='png')
+        plt.close('all')
+
+    def setup_trajectories():
+        calculator = TrajectoryCalculator(make_body(36))
+        calculator.calculate_trajectories()
+        return lambda: render(lambda: Visualization.plot_trajectories_with_forms(calculator))
+
+    def setup_velocity():
+        return lambda: render(lambda: Visualization.plot_velocity_field_only(0.5))
+
+    def setup_streamlines():
+        return lambda: render(lambda: Visualization.plot_streamlines_only(0.5))
+
+    benchmark('render[trajectories]')(setup_trajectories)
+    benchmark('render[velocity_field]')(setup_velocity)
+    benchmark('render[streamlines]')(setup_streamlines)
+
+
+_register_solver_benchmarks()
+_register_calculator_benchmarks()
+_register_field_benchmarks()
+_register_rendering_benchmarks()
+
+
+def run_benchmark(setup, repeats: int, min_time: float) -> dict:
+    """Замеряет функцию repeats раз (не меньше min_time секунд суммарно)"""
+    func = setup()
+    func()  # прогрев
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeats or (time.perf_counter() - started < min_time and len(timings) < 100):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'median': float(np.median(timings)),
+        'min': float(np.min(timings)),
+        'mean': float(np.mean(timings)),
+        'repeats': len(timings)
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Возвращает бенчмарки, медиана которых выросла больше чем на threshold"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]['median']
+        new = result['median']
+        if old > 0 and new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарки расчета траекторий и визуализации')
+    parser.add_argument('--suite', choices=['quick', 'full'], default='quick',
+                        help='quick - быстрые размеры, full - включая 10^5-10^6 точек')
+    parser.add_argument('--filter', default=None, help='запускать только бенчмарки, содержащие подстроку')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='минимальное суммарное время замеров, с')
+    parser.add_argument('--output', default=None, help='файл JSON для результатов')
+    parser.add_argument('--compare', default=None, help='JSON предыдущего запуска для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='допустимый относительный рост медианы (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup, suite in BENCHMARKS:
+        if suite == 'full' and args.suite != 'full':
+            continue
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = run_benchmark(setup, args.repeats, args.min_time)
+        print(f"{name:55s} {results[name]['median'] * 1e3:12.3f} мс")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(),
+            'suite': args.suite
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"РЕГРЕССИЯ {name}: {old * 1e3:.3f} мс -> {new * 1e3:.3f} мс")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
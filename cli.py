@@ -0,0 +1,254 @@
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+from services.trajectory_calculator import TrajectoryCalculator
+from services.solver_stats import SolverStats
+from services.result_export import ResultExporter
+
+
+# Окружность из main.py: центр (5, -5), радиус 3, 36 точек
+DEFAULT_BODY = {'kind': 'circle', 'center_x': 5.0, 'center_y': -5.0, 'radius': 3.0, 'num_points': 36}
+
+
+def add_calculation_arguments(parser):
+    """Аргументы постановки расчета, общие для всех команд"""
+    parser.add_argument('--spec', default=None,
+                        help='JSON-файл спецификации; аргументы командной строки ее дополняют')
+    parser.add_argument('--body', default=None, help='вид тела (circle, disk, polygon, mesh_disk, mesh_polygon)')
+    parser.add_argument('--body-params', type=json.loads, default=None, help='параметры тела в JSON')
+    parser.add_argument('--field', default=None, help='имя зарегистрированного поля скоростей')
+    parser.add_argument('--field-params', type=json.loads, default=None, help='параметры поля в JSON')
+    parser.add_argument('--t0', type=float, default=None)
+    parser.add_argument('--t-end', type=float, default=None)
+    parser.add_argument('--dt', type=float, default=None)
+    parser.add_argument('--method', choices=TrajectoryCalculator.METHODS, default=None)
+    parser.add_argument('--butcher-table', choices=['rk4', 'bogacki_shampine', 'dormand_prince'], default=None)
+    parser.add_argument('--adaptive', action='store_true', default=None)
+    parser.add_argument('--rtol', type=float, default=None)
+    parser.add_argument('--atol', type=float, default=None)
+    parser.add_argument('--track-deformation', action='store_true', default=None)
+    parser.add_argument('--output-stride', type=int, default=None, help='сохранять каждый k-й шаг интегрирования')
+    parser.add_argument('--output-times', type=json.loads, default=None,
+                        help='моменты вывода в JSON, например [0.5, 1.0, 2.0]')
+    parser.add_argument('--output-dtype', choices=['float64', 'float32', 'float16'], default=None,
+                        help='тип хранения траекторий (интегрирование всегда в float64)')
+    parser.add_argument('--cache', default=None, help='каталог кеша результатов')
+    parser.add_argument('--stats', default=None, help='JSON-файл со статистикой расчета (счетчики, таймеры)')
+
+
+def build_spec(args) -> dict:
+    """Спецификация для TrajectoryCalculator.from_spec из файла и аргументов"""
+    spec = {}
+    if args.spec:
+        with open(args.spec, encoding='utf-8') as file:
+            spec = json.load(file)
+
+    body = dict(spec.get('body', DEFAULT_BODY))
+    if args.body is not None and args.body != body['kind']:
+        body = {'kind': args.body}
+    body.update(args.body_params or {})
+    spec['body'] = body
+
+    if args.field is not None or args.field_params is not None:
+        field = dict(spec.get('field', {'name': 'log_linear'}))
+        if args.field is not None and args.field != field['name']:
+            field = {'name': args.field}
+        if args.field_params is not None:
+            field['params'] = args.field_params
+        spec['field'] = field
+
+    options = {'t0': args.t0, 't_end': args.t_end, 'dt': args.dt, 'method': args.method,
+               'butcher_table': args.butcher_table, 'adaptive': args.adaptive, 'rtol': args.rtol,
+               'atol': args.atol, 'track_deformation': args.track_deformation,
+               'output_stride': args.output_stride, 'output_times': args.output_times,
+               'output_dtype': args.output_dtype}
+    spec.update({key: value for key, value in options.items() if value is not None})
+    return spec
+
+
+def calculate(args):
+    """Создает калькулятор по аргументам и выполняет расчет"""
+    spec = build_spec(args)
+    calculator = TrajectoryCalculator.from_spec(spec)
+    if args.cache:
+        from services.result_cache import ResultCache
+        calculator.cache = ResultCache(args.cache)
+    if args.stats:
+        calculator.stats = SolverStats()
+
+    started = time.perf_counter()
+    calculator.calculate_trajectories()
+    elapsed = time.perf_counter() - started
+    print(f"Расчет: {calculator.get_trajectory_array().shape[0]} точек, "
+          f"{len(calculator.t_points)} шагов, {elapsed:.3f} с", file=sys.stderr)
+    return calculator, spec
+
+
+def plot_phase(calculator):
+    """Замер отрисовки в статистике, если она включена"""
+    return calculator.stats.phase('plot') if calculator.stats is not None else contextlib.nullcontext()
+
+
+def write_stats(calculator, args):
+    if calculator.stats is not None:
+        calculator.stats.to_json(args.stats)
+
+
+def command_run(args):
+    calculator, spec = calculate(args)
+    if args.output is None:
+        trajectories = calculator.get_trajectory_array()
+        final = trajectories[:, -1]
+        summary = {
+            'spec': spec,
+            'n_points': int(final.shape[0]),
+            'n_steps': int(len(calculator.t_points)),
+            't_end': float(calculator.t_points[-1]) if len(calculator.t_points) else None,
+            'final_centroid': final.mean(axis=0).tolist() if len(final) else None,
+        }
+        print(json.dumps(summary, ensure_ascii=False))
+    else:
+        fmt = ResultExporter.export(calculator, args.output, args.format, spec)
+        print(f"Записано ({fmt}): {args.output}", file=sys.stderr)
+    write_stats(calculator, args)
+
+
+def command_plot(args):
+    # matplotlib загружается только командами отрисовки
+    from services.visualization import Visualization
+
+    calculator, _ = calculate(args)
+    with plot_phase(calculator):
+        if args.output_dir is None:
+            Visualization.show_minimal_graphs(calculator)
+        else:
+            paths = Visualization.save_minimal_graphs(calculator, args.output_dir,
+                                                      formats=tuple(args.formats),
+                                                      workers=args.workers, dpi=args.dpi)
+            print(f"Сохранено файлов: {len(paths)}", file=sys.stderr)
+    write_stats(calculator, args)
+
+
+def command_animate(args):
+    from services.visualization import Visualization
+
+    calculator, _ = calculate(args)
+    with plot_phase(calculator):
+        Visualization.animate_deformation(calculator, path=args.output, fps=args.fps, stride=args.stride,
+                                          trail=args.trail, show_field=not args.no_field, dpi=args.dpi)
+    write_stats(calculator, args)
+
+
+def command_convergence(args):
+    from services.convergence import ConvergenceStudy
+
+    spec = build_spec(args)
+    calculator = TrajectoryCalculator.from_spec(spec)
+    study = ConvergenceStudy(calculator, levels=args.levels)
+    result = study.run(tolerance=args.tolerance, verify=not args.no_verify)
+    print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+    if result.converged is False:
+        print(f"Допуск {args.tolerance} не достигнут: рекомендован самый мелкий проверенный шаг",
+              file=sys.stderr)
+
+
+def command_serve(args):
+    import asyncio
+    import secrets
+    from services.job_service import JobService, default_socket_path
+
+    # TCP доступен всем локальным пользователям: только со случайным token
+    token = secrets.token_urlsafe(32) if args.tcp else None
+    path = None if args.tcp else args.socket or default_socket_path()
+
+    async def serve():
+        async with JobService(args.workers, args.chunk_size, args.progress_interval,
+                              allow_expressions=args.allow_expressions, token=token) as service:
+            server = await service.serve(path, port=args.port)
+            address = path or '%s:%d' % server.sockets[0].getsockname()[:2]
+            print(f"Служба расчетов: {address}, процессов: {service.max_workers}", file=sys.stderr)
+            if token is not None:
+                print(f"Token: {token}", file=sys.stderr)
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def command_sweep(args):
+    import sweep
+    sweep.main(args.sweep_args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Движение тела в поле скоростей')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='только расчет, результат в CSV/NPZ/JSON')
+    add_calculation_arguments(run)
+    run.add_argument('--output', '-o', default=None,
+                     help='файл результата; без него в stdout печатается сводка в JSON')
+    run.add_argument('--format', choices=ResultExporter.FORMATS, default=None,
+                     help='формат файла (по умолчанию по расширению)')
+    run.set_defaults(handler=command_run)
+
+    plot = commands.add_parser('plot', help='расчет и графики')
+    add_calculation_arguments(plot)
+    plot.add_argument('--output-dir', default=None, help='каталог для файлов; без него графики показываются')
+    plot.add_argument('--formats', nargs='+', default=['png'])
+    plot.add_argument('--workers', type=int, default=1)
+    plot.add_argument('--dpi', type=int, default=100)
+    plot.set_defaults(handler=command_plot)
+
+    animate = commands.add_parser('animate', help='расчет и анимация деформации')
+    add_calculation_arguments(animate)
+    animate.add_argument('--output', '-o', default=None, help='файл .gif или .mp4; без него анимация показывается')
+    animate.add_argument('--fps', type=int, default=20)
+    animate.add_argument('--stride', type=int, default=1)
+    animate.add_argument('--trail', type=int, default=20)
+    animate.add_argument('--no-field', action='store_true')
+    animate.add_argument('--dpi', type=int, default=100)
+    animate.set_defaults(handler=command_animate)
+
+    convergence = commands.add_parser('convergence', help='сходимость по шагу и подбор dt под допуск')
+    add_calculation_arguments(convergence)
+    convergence.add_argument('--levels', type=int, default=5, help='число уровней dt, dt/2, dt/4, ...')
+    convergence.add_argument('--tolerance', type=float, default=None, help='допуск погрешности конечных положений')
+    convergence.add_argument('--no-verify', action='store_true', help='не проверять рекомендованный шаг расчетом')
+    convergence.set_defaults(handler=command_convergence)
+
+    serve = commands.add_parser('serve', help='служба расчетов (JSON Lines через Unix-сокет или localhost)')
+    serve.add_argument('--socket', default=None, help='путь Unix-сокета (права 0600); по умолчанию в XDG_RUNTIME_DIR')
+    serve.add_argument('--tcp', action='store_true',
+                       help='TCP на 127.0.0.1 вместо Unix-сокета; запросы должны содержать выданный token')
+    serve.add_argument('--port', type=int, default=0, help='порт TCP; 0 - случайный')
+    serve.add_argument('--allow-expressions', action='store_true',
+                       help='принимать поля, исполняющие код (expression); только для доверенных клиентов')
+    serve.add_argument('--workers', type=int, default=None, help='размер пула процессов')
+    serve.add_argument('--chunk-size', type=int, default=50, help='моментов вывода в порции')
+    serve.add_argument('--progress-interval', type=int, default=100, help='шагов между событиями прогресса')
+    serve.set_defaults(handler=command_serve)
+
+    # Аргументы перебора разбирает sweep.py, здесь они передаются как есть
+    sweep = commands.add_parser('sweep', help='перебор параметров (аргументы sweep.py)', add_help=False)
+    sweep.set_defaults(handler=command_sweep)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command != 'sweep' and extra:
+        parser.error(f"нераспознанные аргументы: {' '.join(extra)}")
+    args.sweep_args = extra
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
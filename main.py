@@ -1,18 +1,11 @@
-import sys
-import os
-
-# Добавляем пути
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
-
 from models.circle_body import CircleBody
 from services.trajectory_calculator import TrajectoryCalculator
 
-# Импортируем визуализацию напрямую из файла
-from services.visualization import Visualization
-
 
 def main():
+    # matplotlib загружается только при запуске, а не при импорте модуля
+    from services.visualization import Visualization
+
     print("=" * 70)
     print("ДВИЖЕНИЕ ОКРУЖНОСТИ В ПОЛЕ СКОРОСТЕЙ")
     print("=" * 70)
@@ -3,5 +3,16 @@ from .material_point import MaterialPoint
 from .trajectory import Trajectory
 from .body import Body
 from .circle_body import CircleBody
+from .point_cloud import PointView, PointCloud, MaterialPointView, MaterialPointCloud
+from .array_body import ArrayBody
+from .disk_body import DiskBody
+from .polygon_body import PolygonBody
+from .mesh_body import MeshBody
+from .scene import Scene
+from .body_factory import create_body, BODY_TYPES
+from .geometry import quadrant_mask, disk_mask, polygon_mask, lattice_coordinates
 
-__all__ = ['SpatialPoint', 'MaterialPoint', 'Trajectory', 'Body', 'CircleBody']
\ No newline at end of file
+__all__ = ['SpatialPoint', 'MaterialPoint', 'Trajectory', 'PointView', 'PointCloud',
+           'MaterialPointView', 'MaterialPointCloud', 'Body', 'CircleBody', 'ArrayBody',
+           'DiskBody', 'PolygonBody', 'MeshBody', 'Scene', 'create_body', 'BODY_TYPES',
+           'quadrant_mask', 'disk_mask', 'polygon_mask', 'lattice_coordinates']
\ No newline at end of file
@@ -0,0 +1,51 @@
+import numpy as np
+from .body import Body
+from .point_cloud import MaterialPointCloud
+
+
+class ArrayBody(Body):
+    """
+    Тело, точки которого заданы массивом координат (n_points, 2).
+
+    get_points() возвращает MaterialPointCloud: элементы - легкие
+    представления в общие массивы, отдельные объекты на точку не хранятся.
+    """
+
+    def __init__(self, coordinates: np.ndarray = None):
+        super().__init__()
+        self.coordinates = np.empty((0, 2)) if coordinates is None else \
+            np.ascontiguousarray(coordinates, dtype=float).reshape(-1, 2)
+        self._trajectories = None
+        self.material_points = None
+
+    def initialize_points(self):
+        """Создает облако материальных точек поверх массива координат"""
+        self.material_points = MaterialPointCloud(self.coordinates, self._trajectories)
+
+    def get_points(self):
+        if self.material_points is None:
+            self.initialize_points()
+        return self.material_points
+
+    def add_point(self, point):
+        raise TypeError("Точки ArrayBody задаются массивом координат")
+
+    def get_num_points(self) -> int:
+        return len(self.coordinates)
+
+    def get_coordinates(self) -> np.ndarray:
+        """Отсчетные координаты - представление только для чтения"""
+        coordinates = self.coordinates.view()
+        coordinates.setflags(write=False)
+        return coordinates
+
+    def attach_trajectories(self, trajectories: np.ndarray):
+        self._trajectories = trajectories
+        self.material_points = None
+
+    def apply_mask(self, mask: np.ndarray):
+        """Оставляет только точки, отмеченные маской (например, quadrant_mask)"""
+        self.coordinates = np.ascontiguousarray(self.coordinates[mask])
+        self.material_points = None
+        self._trajectories = None
+        return self
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List
+import numpy as np
 from .material_point import MaterialPoint
 from .spatial_point import SpatialPoint
 
@@ -9,6 +10,8 @@ class Body(ABC):
 
     def __init__(self, material_points: List[MaterialPoint] = None):
         self.material_points = material_points if material_points is not None else []
+        # Отсчетные координаты, зафиксированные до первого связывания с траекториями
+        self._reference = None
 
     @abstractmethod
     def initialize_points(self, *args, **kwargs):
@@ -17,10 +20,58 @@ class Body(ABC):
 
     def add_point(self, point: MaterialPoint):
         self.material_points.append(point)
+        if self._reference is not None:
+            self._reference = self._read_only(np.vstack([self._reference, self._point_reference(point)]))
 
     def get_points(self):
         return self.material_points
 
     def get_trajectories(self):
         """Возвращает траектории всех материальных точек"""
-        return [point.get_trajectory() for point in self.material_points]
\ No newline at end of file
+        return [point.get_trajectory() for point in self.get_points()]
+
+    def get_num_points(self) -> int:
+        return len(self.material_points)
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        array.setflags(write=False)
+        return array
+
+    @staticmethod
+    def _point_reference(point: MaterialPoint) -> tuple:
+        """Первая точка траектории или текущая позиция, если траектория пуста"""
+        if len(point.trajectory) > 0:
+            return tuple(point.trajectory.as_array()[0])
+        return point.x, point.y
+
+    def get_coordinates(self) -> np.ndarray:
+        """
+        Отсчетные координаты точек массивом (n_points, 2), только для чтения.
+
+        До расчета - первые точки траекторий; при первом связывании с
+        хранилищем они фиксируются: после расчета с output_times без t0
+        или в float32 первая точка траектории уже не отсчетное положение.
+        """
+        if self._reference is not None:
+            return self._reference
+        points = self.get_points()
+        coordinates = np.empty((len(points), 2))
+        for index, point in enumerate(points):
+            coordinates[index] = self._point_reference(point)
+        return self._read_only(coordinates)
+
+    def attach_trajectories(self, trajectories: np.ndarray):
+        """Связывает траектории точек с хранилищем (n_points, n_steps, 2) без копирования"""
+        if self._reference is None:
+            self._reference = self.get_coordinates()
+        for index, point in enumerate(self.get_points()):
+            point.trajectory.attach(trajectories[index])
+            point.x, point.y = trajectories[index, -1]
+
+    def get_outline(self):
+        """Замкнутый контур тела в отсчетной конфигурации (массивы x и y)"""
+        coordinates = self.get_coordinates()
+        if len(coordinates) > 0:
+            coordinates = np.vstack([coordinates, coordinates[:1]])
+        return coordinates[:, 0], coordinates[:, 1]
@@ -0,0 +1,27 @@
+from .circle_body import CircleBody
+from .disk_body import DiskBody
+from .polygon_body import PolygonBody
+from .mesh_body import MeshBody
+from .scene import Scene
+
+
+# Конструкторы тел по имени: спецификация тела - словарь {'kind': ..., параметры}
+BODY_TYPES = {
+    'circle': CircleBody,
+    'disk': DiskBody,
+    'polygon': PolygonBody,
+    'mesh_disk': MeshBody.from_disk,
+    'mesh_polygon': MeshBody.from_polygon,
+    'scene': lambda bodies: Scene([create_body(**spec) for spec in bodies]),
+}
+
+
+def create_body(kind: str, **params):
+    """
+    Создает тело по имени типа и параметрам (например, из параметров перебора или CLI).
+
+    Сцена задается списком спецификаций тел: {'kind': 'scene', 'bodies': [{'kind': ...}, ...]}.
+    """
+    if kind not in BODY_TYPES:
+        raise KeyError(f"Неизвестный тип тела '{kind}'. Доступны: {', '.join(sorted(BODY_TYPES))}")
+    return BODY_TYPES[kind](**params)
@@ -0,0 +1,38 @@
+import numpy as np
+from .array_body import ArrayBody
+from .geometry import lattice_coordinates, disk_mask, spacing_for_count
+
+
+class DiskBody(ArrayBody):
+    """Класс для представления заполненного круга, дискретизированного решеткой"""
+
+    def __init__(self, center_x: float, center_y: float, radius: float, spacing: float = None,
+                 num_points: int = None, layout: str = 'grid', seed: int = None):
+        super().__init__()
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        if spacing is None:
+            spacing = spacing_for_count(np.pi * radius ** 2, num_points or 1000, layout)
+        self.spacing = spacing
+        self.layout = layout
+        self.seed = seed
+        self.initialize_coordinates()
+
+    def initialize_coordinates(self):
+        """Строит узлы решетки в описанном квадрате и оставляет точки внутри круга"""
+        coordinates = lattice_coordinates(
+            (self.center_x - self.radius, self.center_x + self.radius),
+            (self.center_y - self.radius, self.center_y + self.radius),
+            self.spacing, self.layout, seed=self.seed
+        )
+        self.coordinates = np.ascontiguousarray(
+            coordinates[disk_mask(coordinates, (self.center_x, self.center_y), self.radius)]
+        )
+        self.material_points = None
+
+    def get_outline(self, num_segments: int = 360):
+        """Граничная окружность"""
+        angles = np.linspace(0, 2 * np.pi, num_segments + 1)
+        return (self.center_x + self.radius * np.cos(angles),
+                self.center_y + self.radius * np.sin(angles))
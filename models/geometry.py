@@ -0,0 +1,128 @@
+import numpy as np
+
+
+def quadrant_mask(coordinates: np.ndarray, quadrant: int = 4) -> np.ndarray:
+    """
+    Маска точек, лежащих строго внутри заданной координатной четверти.
+
+    coordinates - массив (n_points, 2); quadrant - номер четверти 1..4.
+    """
+    signs = {1: (1, 1), 2: (-1, 1), 3: (-1, -1), 4: (1, -1)}
+    if quadrant not in signs:
+        raise ValueError(f"Номер четверти должен быть от 1 до 4, получен {quadrant}")
+    sx, sy = signs[quadrant]
+    return (sx * coordinates[:, 0] > 0) & (sy * coordinates[:, 1] > 0)
+
+
+def lattice_coordinates(x_range: tuple, y_range: tuple, spacing: float, layout: str = 'grid',
+                        jitter: float = 0.5, seed: int = None) -> np.ndarray:
+    """
+    Узлы решетки в прямоугольнике x_range × y_range массивом (n_points, 2).
+
+    layout:
+      'grid'     - квадратная решетка с шагом spacing;
+      'hex'      - гексагональная решетка (ряды сдвинуты на половину шага);
+      'jittered' - квадратная решетка со случайным сдвигом узлов в пределах
+                   jitter·spacing/2; векторизованная замена выборки Пуассона:
+                   расстояние между точками не меньше (1 - jitter)·spacing.
+    """
+    if spacing <= 0:
+        raise ValueError("Шаг решетки должен быть положительным")
+
+    if layout == 'hex':
+        dy = spacing * np.sqrt(3) / 2
+        x = np.arange(x_range[0], x_range[1] + spacing, spacing)
+        y = np.arange(y_range[0], y_range[1] + dy, dy)
+        xx, yy = np.meshgrid(x, y)
+        xx[1::2] += spacing / 2
+    elif layout in ('grid', 'jittered'):
+        x = np.arange(x_range[0], x_range[1] + spacing / 2, spacing)
+        y = np.arange(y_range[0], y_range[1] + spacing / 2, spacing)
+        xx, yy = np.meshgrid(x, y)
+    else:
+        raise ValueError(f"Неизвестная решетка '{layout}'. Доступны: grid, hex, jittered")
+
+    coordinates = np.column_stack([xx.ravel(), yy.ravel()])
+    if layout == 'jittered':
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter должен лежать в [0, 1)")
+        rng = np.random.default_rng(seed)
+        coordinates += rng.uniform(-0.5, 0.5, coordinates.shape) * (jitter * spacing)
+    return coordinates
+
+
+def disk_mask(coordinates: np.ndarray, center: tuple, radius: float) -> np.ndarray:
+    """Маска точек внутри круга (включая границу)"""
+    dx = coordinates[:, 0] - center[0]
+    dy = coordinates[:, 1] - center[1]
+    return dx * dx + dy * dy <= radius * radius
+
+
+def polygon_mask(coordinates: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """
+    Маска точек внутри многоугольника (правило четности пересечений).
+
+    Цикл идет только по ребрам многоугольника, все точки обрабатываются
+    одной векторной операцией на ребро.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    x = coordinates[:, 0]
+    y = coordinates[:, 1]
+    inside = np.zeros(len(coordinates), dtype=bool)
+
+    x1, y1 = vertices[-1]
+    for x2, y2 in vertices:
+        crosses = (y1 > y) != (y2 > y)
+        if np.any(crosses):
+            x_cross = x1 + (y - y1) * (x2 - x1) / np.where(y2 != y1, y2 - y1, 1.0)
+            inside ^= crosses & (x < x_cross)
+        x1, y1 = x2, y2
+    return inside
+
+
+def polygon_area(vertices: np.ndarray) -> float:
+    """Площадь многоугольника по формуле шнурования"""
+    vertices = np.asarray(vertices, dtype=float)
+    x = vertices[:, 0]
+    y = vertices[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def spacing_for_count(area: float, num_points: int, layout: str = 'grid') -> float:
+    """Шаг решетки, дающий примерно num_points узлов на площади area"""
+    if num_points <= 0:
+        raise ValueError("Число точек должно быть положительным")
+    spacing = np.sqrt(area / num_points)
+    if layout == 'hex':
+        # Ячейка гексагональной решетки имеет площадь √3/2·h²
+        spacing *= np.sqrt(2 / np.sqrt(3))
+    return float(spacing)
+
+
+def structured_triangulation(x_range: tuple, y_range: tuple, spacing: float) -> tuple:
+    """
+    Структурированная треугольная сетка прямоугольника.
+
+    Возвращает вершины (n_vertices, 2) и треугольники (n_triangles, 3):
+    каждая ячейка квадратной решетки делится диагональю на два треугольника.
+    """
+    x = np.arange(x_range[0], x_range[1] + spacing / 2, spacing)
+    y = np.arange(y_range[0], y_range[1] + spacing / 2, spacing)
+    nx, ny = len(x), len(y)
+    xx, yy = np.meshgrid(x, y)
+    vertices = np.column_stack([xx.ravel(), yy.ravel()])
+
+    # Индекс левого нижнего угла каждой ячейки
+    corner = (np.arange(ny - 1)[:, None] * nx + np.arange(nx - 1)[None, :]).ravel()
+    lower = np.column_stack([corner, corner + 1, corner + nx + 1])
+    upper = np.column_stack([corner, corner + nx + 1, corner + nx])
+    triangles = np.vstack([lower, upper])
+    return vertices, triangles
+
+
+def compact_mesh(vertices: np.ndarray, triangles: np.ndarray) -> tuple:
+    """Удаляет вершины, не входящие ни в один треугольник, и перенумеровывает треугольники"""
+    used = np.zeros(len(vertices), dtype=bool)
+    used[triangles] = True
+    new_index = np.cumsum(used) - 1
+    return vertices[used], new_index[triangles]
@@ -1,18 +1,21 @@
 from .spatial_point import SpatialPoint
+from .trajectory import Trajectory
 
 
 class MaterialPoint(SpatialPoint):
     """Класс для представления материальной точки с массой"""
 
+    __slots__ = ('mass', 'trajectory')
+
     def __init__(self, x: float, y: float, mass: float = 1.0):
         super().__init__(x, y)
         self.mass = mass
-        self.trajectory = []
+        self.trajectory = Trajectory()
 
     def add_position_to_trajectory(self):
         """Добавляет текущую позицию в траекторию"""
-        self.trajectory.append(SpatialPoint(self.x, self.y))
+        self.trajectory.append(self.x, self.y)
 
     def get_trajectory(self):
-        """Возвращает траекторию в виде массива точек"""
-        return self.trajectory
\ No newline at end of file
+        """Возвращает траекторию материальной точки"""
+        return self.trajectory
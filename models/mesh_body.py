@@ -0,0 +1,71 @@
+import numpy as np
+from .array_body import ArrayBody
+from .geometry import structured_triangulation, compact_mesh, disk_mask, polygon_mask
+
+
+class MeshBody(ArrayBody):
+    """
+    Класс для представления тела, заданного треугольной сеткой.
+
+    Материальные точки - вершины сетки, triangles - массив (n_triangles, 3)
+    индексов вершин (связность сохраняется при деформации).
+    """
+
+    def __init__(self, vertices, triangles):
+        super().__init__(vertices)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        if len(self.triangles) and (self.triangles.min() < 0 or self.triangles.max() >= len(self.coordinates)):
+            raise ValueError("Индексы треугольников выходят за пределы массива вершин")
+
+    @classmethod
+    def from_polygon(cls, vertices, spacing: float):
+        """Структурированная сетка многоугольника: треугольники с центром внутри контура"""
+        vertices = np.asarray(vertices, dtype=float)
+        lower = vertices.min(axis=0)
+        upper = vertices.max(axis=0)
+        nodes, triangles = structured_triangulation((lower[0], upper[0]), (lower[1], upper[1]), spacing)
+        centroids = nodes[triangles].mean(axis=1)
+        return cls(*compact_mesh(nodes, triangles[polygon_mask(centroids, vertices)]))
+
+    @classmethod
+    def from_disk(cls, center_x: float, center_y: float, radius: float, spacing: float):
+        """Структурированная сетка круга: треугольники с центром внутри окружности"""
+        nodes, triangles = structured_triangulation((center_x - radius, center_x + radius),
+                                                    (center_y - radius, center_y + radius), spacing)
+        centroids = nodes[triangles].mean(axis=1)
+        return cls(*compact_mesh(nodes, triangles[disk_mask(centroids, (center_x, center_y), radius)]))
+
+    def get_edges(self) -> np.ndarray:
+        """Уникальные ребра сетки массивом (n_edges, 2)"""
+        edges = np.sort(self.triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        return np.unique(edges, axis=0)
+
+    def get_boundary_edges(self) -> np.ndarray:
+        """Граничные ребра - ребра, принадлежащие ровно одному треугольнику"""
+        edges = np.sort(self.triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        unique, counts = np.unique(edges, axis=0, return_counts=True)
+        return unique[counts == 1]
+
+    def get_outline(self):
+        """Граничные ребра как отрезки, разделенные NaN (удобно для plt.plot)"""
+        edges = self.get_boundary_edges()
+        segments = np.full((len(edges), 3, 2), np.nan)
+        segments[:, :2] = self.coordinates[edges]
+        segments = segments.reshape(-1, 2)
+        return segments[:, 0], segments[:, 1]
+
+    def get_triangle_areas(self, coordinates: np.ndarray = None) -> np.ndarray:
+        """Ориентированные площади треугольников в заданной (по умолчанию отсчетной) конфигурации"""
+        if coordinates is None:
+            coordinates = self.coordinates
+        p0, p1, p2 = (coordinates[self.triangles[:, i]] for i in range(3))
+        return 0.5 * ((p1[:, 0] - p0[:, 0]) * (p2[:, 1] - p0[:, 1])
+                      - (p2[:, 0] - p0[:, 0]) * (p1[:, 1] - p0[:, 1]))
+
+    def apply_mask(self, mask: np.ndarray):
+        """Оставляет отмеченные вершины и треугольники, все вершины которых сохранены"""
+        mask = np.asarray(mask, dtype=bool)
+        keep = mask[self.triangles].all(axis=1)
+        new_index = np.cumsum(mask) - 1
+        self.triangles = new_index[self.triangles[keep]]
+        return super().apply_mask(mask)
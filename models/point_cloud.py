@@ -0,0 +1,181 @@
+import numpy as np
+from .spatial_point import SpatialPoint
+from .trajectory import Trajectory
+
+
+class PointView:
+    """
+    Легкое представление одной точки облака.
+
+    Не хранит координат: x и y читаются и записываются прямо в общие
+    массивы облака, поэтому на точку приходится только память массивов.
+    """
+
+    __slots__ = ('_cloud', '_index')
+
+    def __init__(self, cloud, index: int):
+        self._cloud = cloud
+        self._index = index
+
+    @property
+    def x(self):
+        return self._cloud.x[self._index]
+
+    @x.setter
+    def x(self, value):
+        self._cloud.x[self._index] = value
+
+    @property
+    def y(self):
+        return self._cloud.y[self._index]
+
+    @y.setter
+    def y(self, value):
+        self._cloud.y[self._index] = value
+
+    def to_array(self, out: np.ndarray = None):
+        if out is None:
+            return self._cloud.coordinates[self._index]
+        out[:] = self._cloud.coordinates[self._index]
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.x:.3f}, {self.y:.3f})"
+
+    def __add__(self, other):
+        if hasattr(other, 'x') and hasattr(other, 'y'):
+            return SpatialPoint(self.x + other.x, self.y + other.y)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if hasattr(other, 'x') and hasattr(other, 'y'):
+            return SpatialPoint(self.x - other.x, self.y - other.y)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if hasattr(other, 'x') and hasattr(other, 'y'):
+            return SpatialPoint(other.x - self.x, other.y - self.y)
+        return NotImplemented
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, (int, float)):
+            return SpatialPoint(self.x * scalar, self.y * scalar)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+
+class PointCloud:
+    """
+    Облако точек в виде структуры массивов.
+
+    Координаты хранятся одним массивом (n_points, 2) (16 байт на точку),
+    x и y - представления его столбцов. Элементы облака - PointView,
+    арифметика выполняется над всем облаком сразу.
+    """
+
+    view_class = PointView
+
+    def __init__(self, coordinates: np.ndarray):
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        self.x = self.coordinates[:, 0]
+        self.y = self.coordinates[:, 1]
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointCloud(self.coordinates[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс точки вне облака")
+        return self.view_class(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.view_class(self, index)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def to_array(self):
+        """Координаты массивом (n_points, 2) без копирования"""
+        return self.coordinates
+
+    @staticmethod
+    def _operand(other):
+        if isinstance(other, PointCloud):
+            return other.coordinates
+        if isinstance(other, (SpatialPoint, PointView)):
+            return np.array([other.x, other.y])
+        return np.asarray(other, dtype=float)
+
+    def __add__(self, other):
+        return PointCloud(self.coordinates + self._operand(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return PointCloud(self.coordinates - self._operand(other))
+
+    def __rsub__(self, other):
+        return PointCloud(self._operand(other) - self.coordinates)
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, (int, float)):
+            return PointCloud(self.coordinates * scalar)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} точек)"
+
+
+class MaterialPointView(PointView):
+    """Представление материальной точки: текущая позиция, масса и траектория из хранилища"""
+
+    __slots__ = ()
+
+    @property
+    def mass(self):
+        return self._cloud.get_mass(self._index)
+
+    @property
+    def trajectory(self):
+        return self._cloud.get_trajectory(self._index)
+
+    def get_trajectory(self):
+        return self.trajectory
+
+
+class MaterialPointCloud(PointCloud):
+    """
+    Облако материальных точек тела.
+
+    reference - отсчетные координаты (n_points, 2); после расчета траекторий
+    x и y - копия последнего шага хранилища (n_points, n_steps, 2), как у
+    MaterialPoint после интегрирования. Копия не дает записи в точки
+    изменить историю траекторий и работает с хранилищами только для чтения
+    (memmap кеша результатов).
+    """
+
+    view_class = MaterialPointView
+
+    def __init__(self, reference: np.ndarray, trajectories: np.ndarray = None, mass=1.0):
+        self.reference = reference
+        self.trajectories = trajectories
+        self.mass = mass
+        super().__init__(reference if trajectories is None else np.array(trajectories[:, -1], dtype=float))
+
+    def get_mass(self, index: int) -> float:
+        return self.mass if np.isscalar(self.mass) else self.mass[index]
+
+    def get_trajectory(self, index: int) -> Trajectory:
+        if self.trajectories is None:
+            return Trajectory(data=self.reference[index:index + 1])
+        return Trajectory(data=self.trajectories[index])
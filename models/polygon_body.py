@@ -0,0 +1,34 @@
+import numpy as np
+from .array_body import ArrayBody
+from .geometry import lattice_coordinates, polygon_mask, polygon_area, spacing_for_count
+
+
+class PolygonBody(ArrayBody):
+    """Класс для представления заполненного многоугольника произвольной формы"""
+
+    def __init__(self, vertices, spacing: float = None, num_points: int = None,
+                 layout: str = 'grid', seed: int = None):
+        super().__init__()
+        self.vertices = np.asarray(vertices, dtype=float)
+        if self.vertices.ndim != 2 or self.vertices.shape[1] != 2 or len(self.vertices) < 3:
+            raise ValueError("Многоугольник задается массивом не менее трех вершин (n, 2)")
+        if spacing is None:
+            spacing = spacing_for_count(polygon_area(self.vertices), num_points or 1000, layout)
+        self.spacing = spacing
+        self.layout = layout
+        self.seed = seed
+        self.initialize_coordinates()
+
+    def initialize_coordinates(self):
+        """Строит узлы решетки в ограничивающем прямоугольнике и оставляет внутренние"""
+        lower = self.vertices.min(axis=0)
+        upper = self.vertices.max(axis=0)
+        coordinates = lattice_coordinates((lower[0], upper[0]), (lower[1], upper[1]),
+                                          self.spacing, self.layout, seed=self.seed)
+        self.coordinates = np.ascontiguousarray(coordinates[polygon_mask(coordinates, self.vertices)])
+        self.material_points = None
+
+    def get_outline(self):
+        """Замкнутый контур многоугольника"""
+        closed = np.vstack([self.vertices, self.vertices[:1]])
+        return closed[:, 0], closed[:, 1]
@@ -0,0 +1,87 @@
+import numpy as np
+from .array_body import ArrayBody
+from .body import Body
+
+
+class Scene(ArrayBody):
+    """
+    Сцена из нескольких тел, упакованных в один массив координат.
+
+    Точки тела i занимают строки offsets[i]:offsets[i + 1] общего массива,
+    поэтому калькулятор интегрирует всю сцену как одно тело за один проход
+    решателя. После расчета каждое тело получает представление своей части
+    общего хранилища траекторий без копирования. Тела добавляются до
+    расчета; изменение тел после упаковки не отслеживается.
+    """
+
+    def __init__(self, bodies: list = None):
+        super().__init__()
+        self.bodies = list(bodies or [])
+        parts = [self._body_coordinates(body) for body in self.bodies]
+        self.offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(part) for part in parts], out=self.offsets[1:])
+        if parts:
+            self.coordinates = np.ascontiguousarray(np.concatenate(parts))
+
+    @staticmethod
+    def _body_coordinates(body: Body) -> np.ndarray:
+        return np.asarray(body.get_coordinates(), dtype=float).reshape(-1, 2)
+
+    def add_body(self, body: Body) -> int:
+        """Добавляет тело в сцену; возвращает его номер"""
+        part = self._body_coordinates(body)
+        self.bodies.append(body)
+        self.coordinates = np.ascontiguousarray(np.concatenate([self.coordinates, part]))
+        self.offsets = np.append(self.offsets, self.offsets[-1] + len(part))
+        self.material_points = None
+        self._trajectories = None
+        return len(self.bodies) - 1
+
+    @property
+    def triangles(self):
+        """Общая сетка сцены, если все тела заданы треугольниками; иначе None"""
+        if not self.bodies or not all(getattr(body, 'triangles', None) is not None for body in self.bodies):
+            return None
+        return np.concatenate([body.triangles + offset for body, offset in zip(self.bodies, self.offsets)])
+
+    def get_num_bodies(self) -> int:
+        return len(self.bodies)
+
+    def get_body(self, index: int) -> Body:
+        return self.bodies[index]
+
+    def get_body_slice(self, index: int) -> slice:
+        """Строки общего массива, принадлежащие телу index"""
+        return slice(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def split(self, array: np.ndarray) -> list:
+        """Делит массив по первой оси (точки сцены) на представления по телам"""
+        return [array[self.get_body_slice(index)] for index in range(len(self.bodies))]
+
+    def get_body_trajectories(self, index: int) -> np.ndarray:
+        """Траектории тела index формы (n_i, n_steps, 2) - представление общего хранилища"""
+        if self._trajectories is None:
+            raise RuntimeError("Траектории сцены еще не рассчитаны")
+        return self._trajectories[self.get_body_slice(index)]
+
+    def attach_trajectories(self, trajectories: np.ndarray):
+        super().attach_trajectories(trajectories)
+        for body, part in zip(self.bodies, self.split(trajectories)):
+            body.attach_trajectories(part)
+
+    def apply_mask(self, mask: np.ndarray):
+        raise TypeError("Маска применяется к отдельным телам до добавления в сцену")
+
+    def get_outlines(self) -> list:
+        """Контуры тел в отсчетной конфигурации: список пар (x, y)"""
+        return [body.get_outline() for body in self.bodies]
+
+    def get_outline(self):
+        """Контуры всех тел, разделенные NaN (удобно для plt.plot)"""
+        xs, ys = [], []
+        for x, y in self.get_outlines():
+            xs.extend([np.asarray(x, dtype=float), [np.nan]])
+            ys.extend([np.asarray(y, dtype=float), [np.nan]])
+        if not xs:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(xs[:-1]), np.concatenate(ys[:-1])
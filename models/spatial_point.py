@@ -4,6 +4,8 @@ import numpy as np
 class SpatialPoint:
     """Класс для представления точки в пространстве"""
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -29,5 +31,10 @@ class SpatialPoint:
     def __rmul__(self, scalar):
         return self.__mul__(scalar)
 
-    def to_array(self):
-        return np.array([self.x, self.y])
\ No newline at end of file
+    def to_array(self, out: np.ndarray = None):
+        """Координаты точки массивом; при переданном out запись идет в него без выделения памяти"""
+        if out is None:
+            return np.array([self.x, self.y])
+        out[0] = self.x
+        out[1] = self.y
+        return out
\ No newline at end of file
@@ -4,16 +4,74 @@ import numpy as np
 
 
 class Trajectory:
-    """Класс для представления траектории движения"""
+    """
+    Класс для представления траектории движения.
 
-    def __init__(self, points: List[SpatialPoint] = None):
-        self.points = points if points is not None else []
+    Координаты хранятся в массиве формы (n_steps, 2). Траектория может
+    владеть собственным буфером или быть представлением (view) в общем
+    хранилище траекторий калькулятора - тогда данные не копируются.
+    """
+
+    __slots__ = ('_data', '_length')
+
+    def __init__(self, points: List[SpatialPoint] = None, data: np.ndarray = None):
+        if data is not None:
+            self._data = data
+            self._length = len(data)
+        else:
+            self._data = np.empty((0, 2))
+            self._length = 0
+            for point in points or []:
+                self.add_point(point)
 
     def add_point(self, point: SpatialPoint):
-        self.points.append(point)
+        self.append(point.x, point.y)
+
+    def append(self, x: float, y: float):
+        """Добавляет точку, при необходимости расширяя собственный буфер"""
+        if self._length == len(self._data):
+            capacity = max(8, 2 * len(self._data))
+            data = np.empty((capacity, 2))
+            data[:self._length] = self._data[:self._length]
+            self._data = data
+        self._data[self._length] = (x, y)
+        self._length += 1
+
+    def attach(self, data: np.ndarray):
+        """Делает траекторию представлением массива data формы (n_steps, 2) без копирования"""
+        self._data = data
+        self._length = len(data)
+
+    def clear(self):
+        self._data = np.empty((0, 2))
+        self._length = 0
+
+    @property
+    def points(self):
+        """Точки траектории в виде списка SpatialPoint (создаются по запросу)"""
+        return [SpatialPoint(x, y) for x, y in self.as_array()]
+
+    def as_array(self):
+        """Возвращает координаты массивом (n_steps, 2) без копирования"""
+        return self._data[:self._length]
 
     def get_coordinates(self):
         """Возвращает координаты x и y отдельными массивами"""
-        x_coords = [p.x for p in self.points]
-        y_coords = [p.y for p in self.points]
-        return np.array(x_coords), np.array(y_coords)
\ No newline at end of file
+        data = self.as_array()
+        return data[:, 0], data[:, 1]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Trajectory(data=self.as_array()[index])
+        x, y = self.as_array()[index]
+        return SpatialPoint(x, y)
+
+    def __iter__(self):
+        for x, y in self.as_array():
+            yield SpatialPoint(x, y)
+
+    def __repr__(self):
+        return f"Trajectory({self._length} точек)"
@@ -1,7 +1,50 @@
+import importlib
+
 from .butcher_table import ButcherTable
 from .runge_kutta import RungeKuttaSolver
-from .velocity_field import VelocityField
+from .velocity_field import (VelocityField, BaseVelocityField, LogLinearField, LinearField,
+                             ExpressionField, TabulatedField, register_field, create_field,
+                             get_field_class, available_fields)
 from .trajectory_calculator import TrajectoryCalculator
 
-__all__ = ['ButcherTable', 'RungeKuttaSolver', 'VelocityField',
-           'TrajectoryCalculator']
+# Остальные сервисы импортируются при первом обращении: `import services`
+# не должен тянуть asyncio/multiprocessing сервиса задач и прочие модули,
+# которые нужны не каждому сценарию
+_LAZY = {
+    'StrainMeasures': 'strain_measures',
+    'SolverStats': 'solver_stats',
+    'TrajectoryWriter': 'trajectory_io',
+    'TrajectoryReader': 'trajectory_io',
+    'ResultCache': 'result_cache',
+    'make_cache_key': 'result_cache',
+    'UncacheableError': 'result_cache',
+    'ResultExporter': 'result_export',
+    'FieldSampler': 'field_sampler',
+    'GridSpec': 'field_sampler',
+    'FlowTracer': 'flow_tracer',
+    'SpatialIndex': 'spatial_index',
+    'ConvergenceStudy': 'convergence',
+    'ConvergenceResult': 'convergence',
+    'JobService': 'job_service',
+    'JobClient': 'job_service',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = ['ButcherTable', 'RungeKuttaSolver', 'VelocityField', 'BaseVelocityField',
+           'LogLinearField', 'LinearField', 'ExpressionField', 'TabulatedField',
+           'register_field', 'create_field', 'get_field_class', 'available_fields', 'StrainMeasures', 'SolverStats', 'TrajectoryWriter', 'TrajectoryReader',
+           'ResultCache', 'make_cache_key', 'UncacheableError', 'ResultExporter', 'FieldSampler', 'GridSpec', 'FlowTracer', 'SpatialIndex', 'ConvergenceStudy',
+           'ConvergenceResult', 'TrajectoryCalculator', 'JobService', 'JobClient']
@@ -0,0 +1,162 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# Размеры фигур по типам графиков (как в интерактивных plot_*)
+FIGURE_SIZES = {
+    'trajectories': (10, 8),
+    'initial_form': (8, 8),
+    'deformed_form': (8, 8),
+    'velocity_field': (10, 8),
+    'streamlines': (10, 8),
+}
+
+
+class _FigurePool:
+    """
+    Фигуры Agg, переиспользуемые между графиками одного процесса.
+
+    Для каждого типа графика хранится одна фигура с одними осями: перед
+    новым графиком оси очищаются, дополнительные оси (цветовые шкалы)
+    удаляются, а исходная ячейка сетки осей восстанавливается - colorbar
+    сдвигает оси в новую сетку, и без этого каждый график сужался бы.
+    """
+
+    def __init__(self, dpi: int):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self._figure_class = Figure
+        self._canvas_class = FigureCanvasAgg
+        self.dpi = dpi
+        self.figures = {}
+        self.margins = None
+
+    def get_axes(self, kind: str):
+        if kind not in self.figures:
+            figure = self._figure_class(figsize=FIGURE_SIZES[kind], dpi=self.dpi)
+            self._canvas_class(figure)
+            if self.margins is None:
+                params = figure.subplotpars
+                self.margins = {name: getattr(params, name)
+                                for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+            ax = figure.add_subplot()
+            self.figures[kind] = (figure, ax, ax.get_subplotspec())
+        figure, ax, subplotspec = self.figures[kind]
+        for extra in figure.axes:
+            if extra is not ax:
+                extra.remove()
+        ax.cla()
+        # tight_layout предыдущего графика изменил поля фигуры
+        figure.subplots_adjust(**self.margins)
+        ax.set_subplotspec(subplotspec)
+        ax.set_position(subplotspec.get_position(figure))
+        ax.set_anchor('C')
+        return figure, ax
+
+
+def _draw(ax, kind: str, data: dict):
+    from services.visualization import Visualization
+
+    if kind == 'trajectories':
+        Visualization.draw_trajectories_with_forms(ax, data['trajectories'], data['initial_outline'],
+                                                   data['t_end'])
+    elif kind == 'initial_form':
+        Visualization.draw_initial_form(ax, data['initial_outline'], data['initial_points'])
+    elif kind == 'deformed_form':
+        Visualization.draw_deformed_form(ax, data['x'], data['y'], data['t'])
+    elif kind == 'velocity_field':
+        Visualization.draw_velocity_field(ax, data['t'], data.get('velocity_field'))
+    elif kind == 'streamlines':
+        Visualization.draw_streamlines(ax, data['t'], data.get('velocity_field'))
+    else:
+        raise ValueError(f"Неизвестный тип графика '{kind}'")
+
+
+def _init_worker():
+    """Рабочие процессы рисуют без дисплея; backend вызывающего процесса не меняется"""
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+def _render_jobs(jobs: list, output_dir: str, formats: tuple, dpi: int) -> list:
+    """Рисует список графиков в текущем процессе на переиспользуемых фигурах"""
+    pool = _FigurePool(dpi)
+    paths = []
+    for name, kind, data in jobs:
+        figure, ax = pool.get_axes(kind)
+        _draw(ax, kind, data)
+        figure.tight_layout()
+        for file_format in formats:
+            path = os.path.join(output_dir, f'{name}.{file_format}')
+            figure.savefig(path, format=file_format)
+            paths.append(path)
+    return paths
+
+
+class BatchRenderer:
+    """
+    Пакетная отрисовка графиков в файлы без дисплея (backend Agg).
+
+    Графики добавляются как задания (имя, тип, данные-массивы) и рисуются
+    в PNG/SVG/PDF в output_dir. Фигуры переиспользуются, при workers > 1
+    задания распределяются по процессам.
+    """
+
+    FORMATS = ('png', 'svg', 'pdf')
+
+    def __init__(self, output_dir: str, formats=('png',), workers: int = 1, dpi: int = 100):
+        unknown = set(formats) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Неподдерживаемые форматы: {', '.join(sorted(unknown))}")
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.workers = max(1, workers)
+        self.dpi = dpi
+        self.jobs = []
+
+    def add(self, name: str, kind: str, **data):
+        """Добавляет график типа kind (trajectories, initial_form, deformed_form, velocity_field, streamlines)"""
+        if kind not in FIGURE_SIZES:
+            raise ValueError(f"Неизвестный тип графика '{kind}'")
+        self.jobs.append((name, kind, data))
+
+    def add_calculator_report(self, trajectory_calculator, prefix: str = '', deformed_time: float = None,
+                              field_times=(0.5, 1.0, 2.0)):
+        """Добавляет набор графиков show_minimal_graphs по результатам калькулятора"""
+        trajectories = np.asarray(trajectory_calculator.get_trajectory_array())
+        outline = trajectory_calculator.get_initial_circle()
+        field = trajectory_calculator.velocity_field
+        if deformed_time is None:
+            deformed_time = trajectory_calculator.t_end
+        current_x, current_y = trajectory_calculator.get_form_at_time(deformed_time)
+
+        self.add(f'{prefix}01_trajectories', 'trajectories', trajectories=trajectories,
+                 initial_outline=outline, t_end=trajectory_calculator.t_end)
+        self.add(f'{prefix}02_initial_form', 'initial_form', initial_outline=outline,
+                 initial_points=np.array(trajectory_calculator.body.get_coordinates()))
+        self.add(f'{prefix}03_deformed_form', 'deformed_form', x=current_x, y=current_y, t=deformed_time)
+        for i, t in enumerate(field_times):
+            self.add(f'{prefix}{4 + 2 * i:02d}_velocity_field_t{t:g}', 'velocity_field', t=t,
+                     velocity_field=field)
+            self.add(f'{prefix}{5 + 2 * i:02d}_streamlines_t{t:g}', 'streamlines', t=t,
+                     velocity_field=field)
+
+    def render(self) -> list:
+        """Рисует все задания и возвращает пути к файлам"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        jobs, self.jobs = self.jobs, []
+        if self.workers == 1 or len(jobs) <= 1:
+            return _render_jobs(jobs, self.output_dir, self.formats, self.dpi)
+
+        # Равномерное распределение заданий: каждый процесс переиспользует свои фигуры
+        chunks = [jobs[i::self.workers] for i in range(self.workers) if jobs[i::self.workers]]
+        paths = []
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker) as executor:
+            for chunk_paths in executor.map(_render_jobs, chunks, [self.output_dir] * len(chunks),
+                                            [self.formats] * len(chunks), [self.dpi] * len(chunks)):
+                paths.extend(chunk_paths)
+        return paths
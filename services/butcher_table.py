@@ -2,25 +2,132 @@ import numpy as np
 
 
 class ButcherTable:
-    """Класс для работы с таблицей Бутчера метода Рунге-Кутты 4-го порядка"""
+    """Класс для работы с таблицей Бутчера явного метода Рунге-Кутты"""
 
-    def __init__(self):
-        # Таблица Бутчера из задания (4-стадийный метод)
-        self.stages = 4
+    def __init__(self, a=None, b=None, c=None, b_embedded=None, order: int = 4,
+                 embedded_order: int = None, name: str = None, dense=None, dense_order: int = None):
+        if a is None:
+            # Таблица Бутчера из задания (4-стадийный метод)
+            # Матрица коэффициентов a
+            a = [
+                [0, 0, 0, 0],
+                [1 / 2, 0, 0, 0],
+                [0, 1 / 2, 0, 0],
+                [0, 0, 1, 0]
+            ]
+            # Вектор коэффициентов b (веса)
+            b = [1 / 6, 2 / 6, 2 / 6, 1 / 6]
+            # Вектор коэффициентов c (узлы)
+            c = [0, 1 / 2, 1 / 2, 1]
+            order = 4
+            name = name or 'RK4 (4-стадийный метод Рунге-Кутты 4-го порядка)'
 
-        # Матрица коэффициентов a
-        self.a = np.array([
-            [0, 0, 0, 0],
-            [1 / 2, 0, 0, 0],
-            [0, 1 / 2, 0, 0],
-            [0, 0, 1, 0]
-        ])
+        self.a = np.array(a, dtype=float)
+        self.b = np.array(b, dtype=float)
+        self.c = np.array(c, dtype=float)
+        self.stages = len(self.b)
 
-        # Вектор коэффициентов b (веса)
-        self.b = np.array([1 / 6, 2 / 6, 2 / 6, 1 / 6])
+        if self.a.shape != (self.stages, self.stages) or self.c.shape != (self.stages,):
+            raise ValueError("Размеры a, b и c таблицы Бутчера не согласованы")
+        if np.any(np.triu(self.a) != 0):
+            raise ValueError("Поддерживаются только явные методы (a строго нижнетреугольная)")
 
-        # Вектор коэффициентов c (узлы)
-        self.c = np.array([0, 1 / 2, 1 / 2, 1])
+        # Веса вложенного метода для оценки локальной погрешности
+        self.b_embedded = None if b_embedded is None else np.array(b_embedded, dtype=float)
+        if self.b_embedded is not None and self.b_embedded.shape != self.b.shape:
+            raise ValueError("Размер весов вложенного метода не совпадает с числом стадий")
+
+        # Плотный вывод: веса b_i(θ) = Σ_p dense[i, p]·θ^(p+1) внутри шага, b_i(1) = b_i
+        self.dense = None if dense is None else np.array(dense, dtype=float)
+        if self.dense is not None:
+            if self.dense.ndim != 2 or len(self.dense) != self.stages:
+                raise ValueError("Коэффициенты плотного вывода должны иметь форму (stages, degree)")
+            if not np.allclose(self.dense.sum(axis=1), self.b):
+                raise ValueError("Плотный вывод при θ = 1 должен совпадать с весами b")
+        self.dense_order = dense_order
+
+        self.order = order
+        self.embedded_order = embedded_order
+        self.name = name or f'Явный {self.stages}-стадийный метод порядка {order}'
+
+        # FSAL: последняя стадия шага совпадает с первой стадией следующего
+        self.fsal = bool(self.c[-1] == 1 and np.allclose(self.a[-1], self.b))
+
+    @classmethod
+    def rk4(cls):
+        """Классический метод Рунге-Кутты 4-го порядка"""
+        return cls()
+
+    @classmethod
+    def bogacki_shampine(cls):
+        """Вложенная пара Богацкого-Шампина 3(2)"""
+        return cls(
+            a=[
+                [0, 0, 0, 0],
+                [1 / 2, 0, 0, 0],
+                [0, 3 / 4, 0, 0],
+                [2 / 9, 1 / 3, 4 / 9, 0]
+            ],
+            b=[2 / 9, 1 / 3, 4 / 9, 0],
+            c=[0, 1 / 2, 3 / 4, 1],
+            b_embedded=[7 / 24, 1 / 4, 1 / 3, 1 / 8],
+            order=3,
+            embedded_order=2,
+            name='Bogacki-Shampine 3(2)',
+            # Эрмитова интерполяция 3-го порядка по концам шага (стадия FSAL - производная в конце)
+            dense=[
+                [1, -4 / 3, 5 / 9],
+                [0, 1, -2 / 3],
+                [0, 4 / 3, -8 / 9],
+                [0, -1, 1]
+            ],
+            dense_order=3
+        )
+
+    @classmethod
+    def dormand_prince(cls):
+        """Вложенная пара Дормана-Принса 5(4)"""
+        return cls(
+            a=[
+                [0, 0, 0, 0, 0, 0, 0],
+                [1 / 5, 0, 0, 0, 0, 0, 0],
+                [3 / 40, 9 / 40, 0, 0, 0, 0, 0],
+                [44 / 45, -56 / 15, 32 / 9, 0, 0, 0, 0],
+                [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0, 0],
+                [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0, 0],
+                [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0]
+            ],
+            b=[35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0],
+            c=[0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1],
+            b_embedded=[5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200,
+                        187 / 2100, 1 / 40],
+            order=5,
+            embedded_order=4,
+            name='Dormand-Prince 5(4)',
+            # Непрерывное продолжение 4-го порядка (Hairer, Nørsett, Wanner; Shampine)
+            dense=[
+                [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+                [0, 0, 0, 0],
+                [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+                [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+                [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+                [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+                [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423]
+            ],
+            dense_order=4
+        )
+
+    @classmethod
+    def from_name(cls, name: str):
+        """Таблица по имени: rk4, bogacki_shampine, dormand_prince"""
+        constructors = {
+            'rk4': cls.rk4,
+            'bogacki_shampine': cls.bogacki_shampine,
+            'dormand_prince': cls.dormand_prince,
+        }
+        if name not in constructors:
+            raise KeyError(f"Неизвестная таблица '{name}'. Доступны: {', '.join(constructors)}")
+        return constructors[name]()
 
     def get_stages(self):
         return self.stages
@@ -28,9 +135,25 @@ class ButcherTable:
     def get_coefficients(self):
         return self.a, self.b, self.c
 
+    def is_embedded(self):
+        """Есть ли у таблицы вложенный метод для адаптивного шага"""
+        return self.b_embedded is not None
+
+    def has_dense_output(self):
+        """Есть ли у таблицы собственный плотный вывод внутри шага"""
+        return self.dense is not None
+
+    def dense_weights(self, theta: float) -> np.ndarray:
+        """Веса b_i(θ) плотного вывода в доле шага θ ∈ [0, 1]"""
+        powers = theta ** np.arange(1, self.dense.shape[1] + 1)
+        return self.dense @ powers
+
     def get_method_info(self):
         return {
-            'name': 'RK4 (4-стадийный метод Рунге-Кутты 4-го порядка)',
+            'name': self.name,
             'stages': self.stages,
-            'order': 4
-        }
\ No newline at end of file
+            'order': self.order,
+            'embedded_order': self.embedded_order,
+            'dense_order': self.dense_order,
+            'fsal': self.fsal
+        }
@@ -0,0 +1,193 @@
+import numpy as np
+
+from services.runge_kutta import RungeKuttaSolver
+
+
+class ConvergenceResult:
+    """
+    Итог исследования сходимости.
+
+    dts - шаги от крупного к мелкому; errors - оценка погрешности конечных
+    положений на каждом шаге (по точному решению, если оно известно, иначе
+    по Ричардсону); orders - наблюдаемый порядок между соседними шагами.
+    converged - рекомендованный шаг проверен и укладывается в допуск (False -
+    допуск не достигнут и рекомендован самый мелкий проверенный шаг, None -
+    рекомендация не проверялась).
+    """
+    __slots__ = ('dts', 'errors', 'estimated_errors', 'exact_errors', 'orders', 'nominal_order',
+                 'tolerance', 'recommended_dt', 'recommended_error', 'converged', 'extrapolated')
+
+    def __init__(self, dts, errors, estimated_errors, exact_errors, orders, nominal_order):
+        self.dts = dts
+        self.errors = errors
+        self.estimated_errors = estimated_errors
+        self.exact_errors = exact_errors
+        self.orders = orders
+        self.nominal_order = nominal_order
+        self.tolerance = None
+        self.recommended_dt = None
+        self.recommended_error = None
+        self.converged = None
+        self.extrapolated = None
+
+    def to_dict(self) -> dict:
+        def as_list(values):
+            return None if values is None else [float(value) for value in values]
+
+        return {
+            'dts': as_list(self.dts),
+            'errors': as_list(self.errors),
+            'estimated_errors': as_list(self.estimated_errors),
+            'exact_errors': as_list(self.exact_errors),
+            'orders': as_list(self.orders),
+            'nominal_order': self.nominal_order,
+            'tolerance': self.tolerance,
+            'recommended_dt': self.recommended_dt,
+            'recommended_error': self.recommended_error,
+            'converged': self.converged,
+        }
+
+
+class ConvergenceStudy:
+    """
+    Исследование сходимости метода Рунге-Кутты по шагу для постановки калькулятора.
+
+    Расчет повторяется с числом шагов N, 2N, 4N, ... (dt, dt/2, dt/4, ...)
+    на тех же точках, поле и таблице Бутчера. Погрешность измеряется в
+    максимум-норме по конечным положениям всех точек.
+    """
+
+    def __init__(self, calculator, levels: int = 5, dt: float = None):
+        if levels < 2:
+            raise ValueError("Для оценки сходимости нужно не меньше двух уровней")
+        self.calculator = calculator
+        self.levels = levels
+        self.dt = calculator.dt if dt is None else dt
+        self.solver = RungeKuttaSolver(calculator.butcher_table)
+
+    def _solve_final(self, n_intervals: int) -> np.ndarray:
+        """Конечные положения при n_intervals равных шагах; хранится только последний шаг"""
+        calculator = self.calculator
+        dt = (calculator.t_end - calculator.t0) / n_intervals
+        y0 = calculator.body.get_coordinates()
+        final = None
+        for _, chunk in self.solver.iter_solve(calculator.batch_velocity_func, y0, calculator.t0,
+                                               calculator.t_end, dt, chunk_size=2, stride=n_intervals):
+            final = chunk[-1].copy()
+        return final
+
+    def _exact_final(self):
+        calculator = self.calculator
+        try:
+            return calculator.velocity_field.exact_solution(calculator.t0, calculator.body.get_coordinates(),
+                                                            calculator.t_end)
+        except (AttributeError, NotImplementedError):
+            return None
+
+    def _n_intervals(self, dt: float) -> int:
+        span = self.calculator.t_end - self.calculator.t0
+        return max(1, int(round(span / dt)))
+
+    def run(self, tolerance: float = None, extrapolate: bool = False, verify: bool = True,
+            safety: float = 0.9) -> ConvergenceResult:
+        """
+        Выполняет серию расчетов и оценивает сходимость.
+
+        При заданном tolerance рекомендуется наибольший шаг с погрешностью
+        не выше допуска: по асимптотике err ≈ C·dt^p для самого мелкого
+        уровня. При verify рекомендация проверяется расчетом и при
+        необходимости уменьшается вдвое. extrapolate добавляет результат
+        экстраполяции Ричардсона по двум самым мелким уровням.
+        """
+        nominal_order = self.calculator.butcher_table.order
+        base = self._n_intervals(self.dt)
+        span = self.calculator.t_end - self.calculator.t0
+        intervals = [base * 2 ** level for level in range(self.levels)]
+        dts = np.array([span / n for n in intervals])
+        finals = [self._solve_final(n) for n in intervals]
+
+        # Разности соседних уровней и наблюдаемый порядок
+        differences = np.array([np.abs(finals[k] - finals[k + 1]).max() for k in range(self.levels - 1)])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            orders = np.log2(differences[:-1] / differences[1:])
+
+        # Погрешность уровня k по Ричардсону: |y_k - y_{k+1}| · 2^p / (2^p - 1)
+        factor = 2.0 ** nominal_order
+        estimated = np.append(differences * factor / (factor - 1), np.nan)
+        estimated[-1] = differences[-1] / (factor - 1)
+
+        exact = self._exact_final()
+        exact_errors = None if exact is None else np.array([np.abs(final - exact).max() for final in finals])
+        errors = exact_errors if exact_errors is not None else estimated
+
+        result = ConvergenceResult(dts, errors, estimated, exact_errors, orders, nominal_order)
+        if extrapolate:
+            result.extrapolated = finals[-1] + (finals[-1] - finals[-2]) / (factor - 1)
+        if tolerance is not None:
+            self._recommend(result, tolerance, verify, safety, exact)
+        return result
+
+    def _measure_error(self, dt: float, order: float, exact) -> float:
+        """Погрешность расчета с шагом dt: по точному решению или по расчету с шагом dt/2"""
+        n_intervals = self._n_intervals(dt)
+        final = self._solve_final(n_intervals)
+        if exact is not None:
+            return float(np.abs(final - exact).max())
+        factor = 2.0 ** order
+        return float(np.abs(final - self._solve_final(2 * n_intervals)).max()) * factor / (factor - 1)
+
+    def _recommend(self, result: ConvergenceResult, tolerance: float, verify: bool, safety: float, exact,
+                   max_iterations: int = 8):
+        """
+        Шаг под допуск по модели err = C·dt^p.
+
+        p берется по двум последним точкам (dt, err) - на крупных шагах
+        наблюдаемый порядок бывает ниже номинального (например, у -ln(t)
+        возле t0 = 0.001), и экстраполяция по номинальному порядку
+        промахивается. При verify каждая проверка добавляет точку, модель
+        уточняется секущей, пока погрешность не окажется в допуске.
+        """
+        result.tolerance = tolerance
+        span = self.calculator.t_end - self.calculator.t0
+        nominal = result.nominal_order
+        points = [(dt, error) for dt, error in zip(result.dts, result.errors) if np.isfinite(error) and error > 0]
+        if not points:
+            # Все уровни точны: подходит самый крупный шаг
+            result.recommended_dt = float(span / self._n_intervals(result.dts[0]))
+            result.recommended_error = 0.0
+            result.converged = True
+            return
+
+        def predict():
+            (dt_1, error_1), (dt_2, error_2) = (points[-2], points[-1]) if len(points) > 1 else (None, points[-1])
+            order = nominal
+            if dt_1 is not None and dt_1 != dt_2 and error_1 != error_2:
+                order = float(np.clip(np.log(error_1 / error_2) / np.log(dt_1 / dt_2), 0.5, nominal))
+            return min(safety * dt_2 * (tolerance / error_2) ** (1.0 / order), span), order
+
+        dt, order = predict()
+        error = None
+        if verify:
+            accepted, checked = None, []
+            for _ in range(max_iterations):
+                dt = span / self._n_intervals(dt)
+                error = self._measure_error(dt, order, exact)
+                checked.append((dt, error))
+                if error <= tolerance:
+                    accepted = (dt, error)
+                    # Запас больше порядка величины - пробуем шаг крупнее
+                    if error > 0.1 * tolerance:
+                        break
+                points.append((dt, error))
+                dt, order = predict()
+                # Уточнение имеет смысл, только пока шаг крупнее уже принятого
+                if accepted is not None and span / self._n_intervals(dt) <= accepted[0]:
+                    break
+            result.converged = accepted is not None
+            if accepted is None:
+                # Допуск не достигнут за max_iterations: самый мелкий проверенный шаг, converged = False
+                accepted = min(checked)
+            dt, error = accepted
+
+        result.recommended_dt = float(span / self._n_intervals(dt))
+        result.recommended_error = error
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from services.velocity_field import VelocityField, BaseVelocityField
+
+
+class GridSpec(NamedTuple):
+    """Прямоугольная сетка выборки поля: диапазоны по осям и число узлов"""
+    x_range: tuple
+    y_range: tuple
+    nx: int
+    ny: int
+
+    @classmethod
+    def square(cls, x_range: tuple, y_range: tuple, n: int):
+        return cls(tuple(x_range), tuple(y_range), n, n)
+
+    def meshgrid(self) -> tuple:
+        x = np.linspace(self.x_range[0], self.x_range[1], self.nx)
+        y = np.linspace(self.y_range[0], self.y_range[1], self.ny)
+        return np.meshgrid(x, y)
+
+
+class _LRUCache:
+    """LRU-кеш, ограниченный числом записей и суммарным объемом массивов в байтах"""
+
+    def __init__(self, maxsize: int, max_bytes: int):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, nbytes: int):
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        # Запись больше всего лимита не кешируется и не вытесняет остальные
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+class FieldSampler:
+    """
+    Выборка поля скоростей на сетках с кешированием.
+
+    Вся сетка вычисляется одним векторизованным вызовом поля. Результаты
+    хранятся в LRU-кеше по ключу (поле, t, сетка), ограниченном числом
+    записей maxsize и объемом max_bytes, поэтому повторные графики одного
+    момента времени не пересчитывают поле, а крупные сетки не копятся.
+    Возвращаемые массивы доступны только для чтения.
+    """
+
+    _default = None
+
+    def __init__(self, velocity_field: BaseVelocityField = None, maxsize: int = 64,
+                 max_bytes: int = 64 * 1024 ** 2):
+        self.velocity_field = velocity_field if velocity_field is not None else VelocityField.get_default_field()
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._grids = _LRUCache(maxsize, max_bytes)
+        self._samples = _LRUCache(maxsize, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_default(cls):
+        """Общий экземпляр, разделяемый графиками"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @staticmethod
+    def _read_only(*arrays):
+        for array in arrays:
+            array.setflags(write=False)
+        return arrays
+
+    def get_grid(self, spec: GridSpec) -> tuple:
+        """Узлы сетки (X, Y) формы (ny, nx)"""
+        grid = self._grids.get(spec)
+        if grid is None:
+            grid = self._read_only(*spec.meshgrid())
+            self._grids.put(spec, grid, sum(array.nbytes for array in grid))
+        return grid
+
+    def sample(self, t: float, spec: GridSpec, velocity_field: BaseVelocityField = None) -> tuple:
+        """Возвращает (X, Y, U, V) для момента t; U и V формы (ny, nx)"""
+        field = velocity_field if velocity_field is not None else self.velocity_field
+        key = (field, float(t), spec)
+        cached = self._samples.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        x_grid, y_grid = self.get_grid(spec)
+        velocity = field.evaluate(t, np.stack([x_grid, y_grid], axis=-1))
+        result = (x_grid, y_grid) + self._read_only(velocity[..., 0], velocity[..., 1])
+        # Узлы сетки учтены в кеше сеток; U и V - представления одного массива velocity
+        self._samples.put(key, result, velocity.nbytes)
+        return result
+
+    def sample_times(self, times, spec: GridSpec, velocity_field: BaseVelocityField = None) -> np.ndarray:
+        """Скорости для набора моментов времени тензором (n_t, ny, nx, 2)"""
+        field = velocity_field if velocity_field is not None else self.velocity_field
+        x_grid, y_grid = self.get_grid(spec)
+        points = np.stack([x_grid, y_grid], axis=-1)
+        result = np.empty((len(times), spec.ny, spec.nx, 2))
+        for index, t in enumerate(times):
+            key = (field, float(t), spec)
+            cached = self._samples.get(key)
+            if cached is not None:
+                self.hits += 1
+                result[index, ..., 0] = cached[2]
+                result[index, ..., 1] = cached[3]
+            else:
+                self.misses += 1
+                field.evaluate(t, points, out=result[index])
+        return result
+
+    def clear(self):
+        self._grids.clear()
+        self._samples.clear()
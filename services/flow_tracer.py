@@ -0,0 +1,116 @@
+import numpy as np
+
+from services.butcher_table import ButcherTable
+from services.runge_kutta import RungeKuttaSolver
+from services.velocity_field import VelocityField, BaseVelocityField
+from services.field_sampler import GridSpec
+
+
+class FlowTracer:
+    """
+    Построение линий тока, траекторий и линий отмеченных частиц.
+
+    Все линии интегрируются одновременно: состояние - массив (n_seeds, 2),
+    поле вызывается один раз на стадию метода Рунге-Кутты для всех затравок.
+    Результаты - массивы NumPy; точки, покинувшие область bounds, заменяются
+    на NaN (matplotlib разрывает по ним линии).
+    """
+
+    def __init__(self, velocity_field: BaseVelocityField = None, butcher_table: ButcherTable = None):
+        self.velocity_field = velocity_field if velocity_field is not None else VelocityField.get_default_field()
+        self.rk_solver = RungeKuttaSolver(butcher_table if butcher_table is not None else ButcherTable())
+
+    @staticmethod
+    def grid_seeds(x_range: tuple, y_range: tuple, n: int) -> np.ndarray:
+        """Затравки в узлах сетки n×n, массив (n * n, 2)"""
+        x_grid, y_grid = GridSpec.square(x_range, y_range, n).meshgrid()
+        return np.column_stack([x_grid.ravel(), y_grid.ravel()])
+
+    @staticmethod
+    def _mask_outside(lines: np.ndarray, bounds: tuple) -> np.ndarray:
+        """Заменяет на NaN точки после первого выхода линии из bounds"""
+        if bounds is None:
+            return lines
+        (x_min, x_max), (y_min, y_max) = bounds
+        x = lines[..., 0]
+        y = lines[..., 1]
+        outside = (x < x_min) | (x > x_max) | (y < y_min) | (y > y_max) | np.isnan(x)
+        lines[np.logical_or.accumulate(outside, axis=1)] = np.nan
+        return lines
+
+    def _frozen_direction(self, t: float, sign: float):
+        """Единичное направление замороженного поля: линии параметризуются длиной дуги"""
+        field = self.velocity_field
+
+        def rhs(s, positions, out=None):
+            out = field.evaluate(t, positions, out)
+            speed = np.hypot(out[..., 0], out[..., 1])
+            # В точках покоя направление не определено: точка остается на месте
+            np.maximum(speed, 1e-300, out=speed)
+            out *= (sign / speed)[..., None]
+            return out
+
+        rhs.supports_out = True
+        return rhs
+
+    def streamlines(self, seeds: np.ndarray, t: float, length: float = 4.0, ds: float = 0.1,
+                    direction: str = 'both', bounds: tuple = None) -> np.ndarray:
+        """
+        Линии тока поля, замороженного в момент t.
+
+        direction - 'forward', 'backward' или 'both'. Возвращает массив
+        (n_seeds, n_samples, 2); при 'both' затравка находится в середине
+        линии, точки упорядочены по направлению течения.
+        """
+        if direction not in ('forward', 'backward', 'both'):
+            raise ValueError(f"Неизвестное направление '{direction}'")
+        seeds = np.asarray(seeds, dtype=float).reshape(-1, 2)
+
+        parts = []
+        if direction in ('backward', 'both'):
+            _, backward = self.rk_solver.solve_batch(self._frozen_direction(t, -1.0), seeds, 0.0, length, ds)
+            parts.append(self._mask_outside(backward.transpose(1, 0, 2), bounds)[:, ::-1])
+        if direction in ('forward', 'both'):
+            _, forward = self.rk_solver.solve_batch(self._frozen_direction(t, 1.0), seeds, 0.0, length, ds)
+            forward = self._mask_outside(forward.transpose(1, 0, 2), bounds)
+            # Затравка уже есть в конце обратной части
+            parts.append(forward[:, 1:] if parts else forward)
+        return np.ascontiguousarray(np.concatenate(parts, axis=1))
+
+    def pathlines(self, seeds: np.ndarray, t0: float, t_end: float, dt: float,
+                  bounds: tuple = None) -> tuple:
+        """Траектории частиц из seeds: (t_points, массив (n_seeds, n_steps, 2))"""
+        seeds = np.asarray(seeds, dtype=float).reshape(-1, 2)
+        t_points, states = self.rk_solver.solve_batch(self.velocity_field, seeds, t0, t_end, dt)
+        lines = np.ascontiguousarray(states.transpose(1, 0, 2))
+        return t_points, self._mask_outside(lines, bounds)
+
+    def streaklines(self, seeds: np.ndarray, t0: float, t_end: float, dt: float,
+                    bounds: tuple = None) -> tuple:
+        """
+        Линии отмеченных частиц к моменту t_end.
+
+        В каждый узел сетки времени из каждой затравки выпускается частица;
+        все выпущенные частицы образуют одну систему и интегрируются вместе.
+        Возвращает (release_times, массив (n_seeds, n_releases, 2)); частицы
+        упорядочены по времени выпуска, последняя находится в затравке.
+        """
+        seeds = np.asarray(seeds, dtype=float).reshape(-1, 2)
+        n_seeds = len(seeds)
+        n_steps = RungeKuttaSolver.get_num_steps(t0, t_end, dt)
+        release_times = np.linspace(t0, t_end, n_steps)
+
+        # Частицы хранятся по поколениям выпуска: активна всегда начальная часть массива
+        particles = np.tile(seeds, (n_steps, 1))
+        k = np.empty((self.rk_solver.stages,) + particles.shape)
+
+        for i in range(n_steps - 1):
+            active = (i + 1) * n_seeds
+            t = release_times[i]
+            self.rk_solver.step(self.velocity_field, t, particles[:active], release_times[i + 1] - t,
+                                out=particles[:active], k=k[:, :active])
+
+        lines = np.ascontiguousarray(particles.reshape(n_steps, n_seeds, 2).transpose(1, 0, 2))
+        # Линия обрывается от затравки: маска идет от последней выпущенной частицы
+        self._mask_outside(lines[:, ::-1], bounds)
+        return release_times, lines
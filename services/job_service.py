@@ -0,0 +1,655 @@
+import asyncio
+import getpass
+import hmac
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import stat
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable
+
+import numpy as np
+
+from services.result_cache import make_cache_key
+from services.solver_stats import SolverStats
+from services.trajectory_calculator import TrajectoryCalculator
+from services.velocity_field import get_field_class
+
+
+# События, после которых задание завершено
+FINAL_EVENTS = ('done', 'cancelled', 'error')
+
+# Предел длины строки запроса: спецификация может содержать массивы (output_times)
+LINE_LIMIT = 2 ** 24
+
+
+def _encode(event: dict, payload: np.ndarray = None) -> bytes:
+    """
+    Строка JSON события; массив payload передается сразу за ней сырыми байтами.
+
+    Заголовок массива - поле payload: {"dtype", "shape", "nbytes"}. Без
+    base64 и JSON-кодирования чисел порция передается со скоростью копирования.
+    """
+    if payload is None:
+        return json.dumps(event, ensure_ascii=False).encode() + b'\n'
+    payload = np.ascontiguousarray(payload)
+    header = {**event, 'payload': {'dtype': payload.dtype.str, 'shape': list(payload.shape),
+                                   'nbytes': payload.nbytes}}
+    return json.dumps(header, ensure_ascii=False).encode() + b'\n' + payload.tobytes()
+
+
+def default_socket_path() -> str:
+    """Unix-сокет службы по умолчанию: в XDG_RUNTIME_DIR или во временном каталоге, свой у каждого пользователя"""
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'trajectories-{getpass.getuser()}.sock')
+
+
+# Состояние рабочего процесса: очередь событий и флаги отмены по слотам
+_events = None
+_cancel_flags = None
+
+
+class JobCancelled(Exception):
+    """Задание отменено: все клиенты отписались"""
+
+
+def _init_worker(events, cancel_flags):
+    global _events, _cancel_flags
+    _events = events
+    _cancel_flags = cancel_flags
+
+
+def _warm_up() -> int:
+    """Пустое задание: запускает процесс пула заранее (импорты уже выполнены)"""
+    return os.getpid()
+
+
+def _run_job(job_id: str, slot: int, spec: dict, chunk_size: int, progress_interval: int) -> str:
+    """
+    Выполняет расчет в рабочем процессе, передавая события через очередь.
+
+    Положения с постоянным шагом выдаются порциями прямо из решателя
+    (iter_solve), остальные режимы - порциями готового результата. Отмена
+    проверяется по флагу слота на каждом событии прогресса и порции.
+    """
+    def emit(kind: str, **payload):
+        _events.put((job_id, kind, payload))
+
+    def check_cancelled():
+        if _cancel_flags[slot]:
+            raise JobCancelled()
+
+    started = time.perf_counter()
+    try:
+        calculator = TrajectoryCalculator.from_spec(spec)
+        t0, span = calculator.t0, calculator.t_end - calculator.t0
+
+        def progress(t, y, stats):
+            check_cancelled()
+            emit('progress', t=float(t), fraction=float((t - t0) / span), steps=stats.accepted_steps)
+
+        calculator.stats = SolverStats(progress, progress_interval)
+        if calculator.method == 'batch' and not calculator.adaptive and not calculator.track_deformation:
+            y0 = calculator.body.get_coordinates()
+            emit('started', n_points=int(len(y0)), n_outputs=calculator.get_num_outputs())
+            for t_chunk, y_chunk in calculator.rk_solver.iter_solve(
+                    calculator.batch_velocity_func, y0, calculator.t0, calculator.t_end, calculator.dt,
+                    chunk_size, calculator.output_stride, calculator.output_times, calculator.output_dtype):
+                check_cancelled()
+                emit('chunk', t=t_chunk.copy(), positions=y_chunk.transpose(1, 0, 2).copy())
+        else:
+            calculator.calculate_trajectories()
+            trajectories = calculator.get_trajectory_array()
+            emit('started', n_points=int(trajectories.shape[0]), n_outputs=int(trajectories.shape[1]))
+            for start in range(0, trajectories.shape[1], chunk_size):
+                check_cancelled()
+                emit('chunk', t=calculator.t_points[start:start + chunk_size],
+                     positions=np.array(trajectories[:, start:start + chunk_size]))
+    except JobCancelled:
+        emit('cancelled')
+        return 'cancelled'
+    except Exception as error:
+        emit('error', message=f"{type(error).__name__}: {error}")
+        return 'error'
+    emit('done', elapsed=time.perf_counter() - started, stats=calculator.stats.to_dict())
+    return 'done'
+
+
+class Job:
+    """
+    Задание службы: спецификация, подписчики и история событий для подключившихся позже.
+
+    В истории хранятся служебные события, последнее событие прогресса и
+    порции, пока их объем не превысит history_bytes службы. После этого
+    порции из истории удаляются (replayable = False), и к заданию больше
+    нельзя присоединиться: такая же спецификация запускается заново.
+    """
+
+    __slots__ = ('id', 'key', 'spec', 'status', 'subscribers', 'history', 'history_bytes', 'progress',
+                 'replayable', 'task', 'finished', 'slot', 'created')
+
+    def __init__(self, job_id: str, key: str, spec: dict):
+        self.id = job_id
+        self.key = key
+        self.spec = spec
+        self.status = 'queued'
+        self.subscribers = set()
+        self.history = []
+        self.history_bytes = 0
+        self.progress = None
+        self.replayable = True
+        self.task = None
+        self.finished = asyncio.Event()
+        self.slot = None
+        self.created = time.time()
+
+    def replay(self) -> list:
+        """События для нового подписчика: история и последнее событие прогресса"""
+        lines = [line for _, line in self.history]
+        return lines if self.progress is None else lines + [self.progress]
+
+    def to_dict(self) -> dict:
+        return {'job': self.id, 'status': self.status, 'subscribers': len(self.subscribers),
+                'created': self.created}
+
+
+class _Connection:
+    """
+    Подключение клиента: исходящие строки пишет отдельная задача, медленный клиент не тормозит остальных.
+
+    Очередь ограничена max_buffer байтами: клиент, не успевающий читать,
+    отключается, а его задания отписываются (и отменяются без других подписчиков).
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_buffer: int):
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.buffered = 0
+        self.dropped = False
+        self.jobs = set()
+        self.outgoing = asyncio.Queue()
+        self.task = asyncio.create_task(self._write())
+
+    def send(self, line: bytes):
+        if self.dropped:
+            return
+        if self.buffered + len(line) > self.max_buffer:
+            # Чтение входящих запросов завершится, и обработчик подключения отпишет задания
+            self.dropped = True
+            self.writer.transport.abort()
+            return
+        self.buffered += len(line)
+        self.outgoing.put_nowait(line)
+
+    async def _write(self):
+        try:
+            while True:
+                line = await self.outgoing.get()
+                if line is None or self.dropped:
+                    break
+                self.buffered -= len(line)
+                self.writer.write(line)
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+
+    async def close(self):
+        self.outgoing.put_nowait(None)
+        await self.task
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class JobService:
+    """
+    Локальная служба расчетов на asyncio с общим прогретым пулом процессов.
+
+    Протокол - JSON Lines через Unix-сокет или localhost. Запросы:
+    {"op": "submit", "request": n, "spec": {...}} - спецификация
+    TrajectoryCalculator.from_spec; ответ {"event": "accepted", "request": n,
+    "job": id, "deduplicated": bool}, затем события задания: started,
+    progress, chunk (t и положения формы (n_points, k, 2) сырыми байтами
+    после строки события, см. _encode), done, cancelled или error.
+    {"op": "cancel", "job": id} - отписка; задание
+    отменяется, когда подписчиков не осталось. {"op": "status", "request": n}
+    - список заданий.
+
+    Спецификации недоверенные: поля, исполняющие код (executes_code,
+    например expression), отклоняются без allow_expressions. Unix-сокет
+    создается с правами 0600; TCP требует token - его должен содержать
+    каждый запрос. Строка, не являющаяся JSON-объектом, или неверный
+    token закрывают соединение.
+
+    Одинаковые спецификации (по make_cache_key), находящиеся в работе,
+    считаются один раз: новый клиент получает уже выданные события и
+    дальнейшие, пока история порций задания не превысила history_bytes.
+    Одновременно выполняется не больше max_workers заданий, остальные ждут
+    в очереди. Клиент, у которого скопилось больше client_buffer байт
+    неотправленных событий, отключается.
+    """
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 50, progress_interval: int = 100,
+                 history_bytes: int = 16 * 1024 ** 2, client_buffer: int = 64 * 1024 ** 2,
+                 allow_expressions: bool = False, token: str = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.progress_interval = progress_interval
+        # Пределы памяти: история порций одного задания и очередь одного клиента
+        self.history_bytes = history_bytes
+        self.client_buffer = client_buffer
+        self.allow_expressions = allow_expressions
+        self.token = token
+        self.jobs = {}
+        self._inflight = {}
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._events = None
+        self._cancel_flags = None
+        self._slots = None
+        self._pump_task = None
+        self._servers = []
+
+    async def start(self):
+        """Запускает и прогревает пул процессов"""
+        context = multiprocessing.get_context()
+        self._events = context.Queue()
+        self._cancel_flags = context.Array('b', self.max_workers, lock=False)
+        self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self._events, self._cancel_flags))
+        self._slots = asyncio.Queue()
+        for slot in range(self.max_workers):
+            self._slots.put_nowait(slot)
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.max_workers)))
+        self._pump_task = asyncio.create_task(self._pump())
+        return self
+
+    @staticmethod
+    def _bind_unix(path: str) -> socket.socket:
+        """Unix-сокет с правами 0600 с момента создания (umask на время bind)"""
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            sock.bind(path)
+        except BaseException:
+            sock.close()
+            raise
+        finally:
+            os.umask(umask)
+        return sock
+
+    async def serve(self, path: str = None, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        """
+        Открывает Unix-сокет path (права 0600) или TCP host:port.
+
+        TCP доступен любому локальному пользователю и странице браузера,
+        поэтому открывается только при заданном token; port 0 - случайный.
+        """
+        if path is None and self.token is None:
+            raise ValueError("Служба на TCP требует token")
+        if self._executor is None:
+            await self.start()
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle_connection, sock=self._bind_unix(path),
+                                                     limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port, limit=LINE_LIMIT)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+        """Отменяет задания, закрывает серверы и пул"""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        for job in list(self.jobs.values()):
+            self._cancel_job(job)
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pump_task is not None:
+            self._events.put(None)
+            await self._pump_task
+            self._pump_task = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    async def submit(self, spec: dict, subscriber=None) -> tuple:
+        """
+        Ставит спецификацию в очередь или присоединяет к такому же заданию в работе.
+
+        Возвращает (job, deduplicated). subscriber - объект с методом
+        send(line: bytes); ему передаются уже выданные и новые события.
+        Ключ дедупликации (построение тела и хеш конфигурации) считается в
+        потоке, чтобы большое тело не останавливало цикл событий.
+        """
+        self._check_spec(spec)
+        key = await asyncio.get_running_loop().run_in_executor(None, self._spec_key, spec)
+        job = self._inflight.get(key)
+        if job is not None and not job.replayable:
+            job = None
+        deduplicated = job is not None
+        if job is None:
+            job = Job(str(next(self._ids)), key, spec)
+            self.jobs[job.id] = job
+            self._inflight[key] = job
+            job.task = asyncio.create_task(self._run(job))
+        if subscriber is not None:
+            for line in job.replay():
+                subscriber.send(line)
+            job.subscribers.add(subscriber)
+        return job, deduplicated
+
+    @staticmethod
+    def _spec_key(spec: dict) -> str:
+        return make_cache_key(TrajectoryCalculator.from_spec(spec))
+
+    def _check_spec(self, spec: dict):
+        """Отклоняет спецификации, которые исполнили бы переданный код в рабочих процессах"""
+        if not isinstance(spec, dict):
+            raise ValueError("Спецификация должна быть объектом JSON")
+        field = spec.get('field', {'name': 'log_linear'})
+        if not isinstance(field, dict):
+            raise ValueError("Поле скоростей должно быть объектом JSON")
+        if get_field_class(field.get('name')).executes_code and not self.allow_expressions:
+            raise PermissionError(f"Поле '{field.get('name')}' исполняет код: служба запущена без allow_expressions")
+
+    def unsubscribe(self, job: Job, subscriber):
+        """Отписывает клиента; задание без подписчиков отменяется"""
+        job.subscribers.discard(subscriber)
+        if not job.subscribers and job.status in ('queued', 'running'):
+            self._cancel_job(job)
+
+    def _cancel_job(self, job: Job):
+        # Отменяемое задание сразу перестает быть целью дедупликации: такая же
+        # спецификация, отправленная до прихода события cancelled, запускается заново
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        if job.status == 'queued' and job.task is not None:
+            # Задача могла еще ни разу не выполниться: тогда ее корутина не
+            # увидит CancelledError, поэтому задание завершается здесь же
+            job.task.cancel()
+            self._broadcast(job, {'event': 'cancelled'})
+            self._finish(job, 'cancelled')
+        elif job.status == 'running':
+            job.status = 'cancelling'
+            self._cancel_flags[job.slot] = 1
+
+    def _remember(self, job: Job, kind: str, line: bytes):
+        """Добавляет событие в ограниченную историю задания"""
+        if kind == 'progress':
+            job.progress = line
+        elif kind != 'chunk':
+            job.history.append((kind, line))
+        elif job.replayable and job.history_bytes + len(line) <= self.history_bytes:
+            job.history.append((kind, line))
+            job.history_bytes += len(line)
+        elif job.replayable:
+            # Окно истории исчерпано: порции больше не хранятся, присоединение закрыто
+            job.replayable = False
+            job.history = [(kind, line) for kind, line in job.history if kind != 'chunk']
+            job.history_bytes = 0
+
+    def _broadcast(self, job: Job, event: dict, payload: np.ndarray = None):
+        line = _encode({'job': job.id, **event}, payload)
+        self._remember(job, event['event'], line)
+        for subscriber in list(job.subscribers):
+            subscriber.send(line)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        # Новые такие же спецификации запускаются заново; история освобождается с заданием
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        self.jobs.pop(job.id, None)
+        job.finished.set()
+
+    async def _run(self, job: Job):
+        try:
+            slot = await self._slots.get()
+        except asyncio.CancelledError:
+            # Задание в очереди уже завершено в _cancel_job
+            return
+        try:
+            self._cancel_flags[slot] = 0
+            job.slot = slot
+            job.status = 'running'
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._executor, _run_job, job.id, slot, job.spec,
+                                           self.chunk_size, self.progress_interval)
+            except Exception as error:
+                # Сбой процесса пула: событие завершения из него уже не придет
+                self._broadcast(job, {'event': 'error', 'message': f"{type(error).__name__}: {error}"})
+                self._finish(job, 'error')
+            else:
+                # Завершение фиксируется по последнему событию из очереди, после всех порций
+                await job.finished.wait()
+        finally:
+            self._slots.put_nowait(slot)
+
+    async def _pump(self):
+        """Переносит события рабочих процессов из очереди в задания"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._events.get)
+            if message is None:
+                break
+            job_id, kind, payload = message
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            if kind == 'chunk':
+                self._broadcast(job, {'event': kind, 't': payload['t'].tolist()}, payload['positions'])
+            else:
+                self._broadcast(job, {'event': kind, **payload})
+            if kind in FINAL_EVENTS:
+                self._finish(job, kind)
+
+    async def _handle_request(self, connection: _Connection, request: dict):
+        op = request.get('op')
+        tag = request.get('request')
+        if op == 'submit':
+            try:
+                job, deduplicated = await self.submit(request['spec'])
+            except Exception as error:
+                connection.send(_encode({'event': 'error', 'request': tag,
+                                         'message': f"{type(error).__name__}: {error}"}))
+                return
+            connection.send(_encode({'event': 'accepted', 'request': tag, 'job': job.id,
+                                     'deduplicated': deduplicated}))
+            for line in job.replay():
+                connection.send(line)
+            job.subscribers.add(connection)
+            connection.jobs.add(job)
+        elif op == 'cancel':
+            job = self.jobs.get(str(request.get('job')))
+            if job is not None and connection in job.subscribers:
+                connection.jobs.discard(job)
+                self.unsubscribe(job, connection)
+                connection.send(_encode({'event': 'cancelled', 'job': job.id}))
+        elif op == 'status':
+            connection.send(_encode({'event': 'status', 'request': tag,
+                                     'jobs': [job.to_dict() for job in self.jobs.values()]}))
+        else:
+            connection.send(_encode({'event': 'error', 'request': tag, 'message': f"Неизвестная операция {op!r}"}))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = _Connection(writer, self.client_buffer)
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("ожидался объект")
+                except ValueError as error:
+                    # Не JSON Lines (например, HTTP-запрос): соединение закрывается сразу
+                    connection.send(_encode({'event': 'error', 'message': f"Некорректный запрос: {error}"}))
+                    break
+                if self.token is not None and not hmac.compare_digest(str(request.get('token')),
+                                                                      self.token):
+                    connection.send(_encode({'event': 'error', 'request': request.get('request'),
+                                             'message': "Неверный token"}))
+                    break
+                await self._handle_request(connection, request)
+        except (ConnectionError, ValueError):
+            # Обрыв соединения или слишком длинная строка
+            pass
+        finally:
+            # Задания отключившегося клиента без других подписчиков отменяются
+            for job in list(connection.jobs):
+                self.unsubscribe(job, connection)
+            await connection.close()
+
+
+class JobClient:
+    """
+    Асинхронный клиент службы расчетов (для ноутбуков и панелей).
+
+        client = await JobClient.connect()   # Unix-сокет default_socket_path()
+        t_points, trajectories = await client.run(spec)
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, token: str = None):
+        self.reader = reader
+        self.writer = writer
+        self.token = token
+        self._requests = itertools.count(1)
+        self._pending = {}
+        self._queues = {}
+        self._reader_task = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, path: str = None, host: str = '127.0.0.1', port: int = None, token: str = None):
+        """Подключение к Unix-сокету path (по умолчанию default_socket_path) или к TCP с token"""
+        if port is None:
+            reader, writer = await asyncio.open_unix_connection(path or default_socket_path(), limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer, token)
+
+    def _send(self, request: dict):
+        if self.token is not None:
+            request = {**request, 'token': self.token}
+        self.writer.write(_encode(request))
+
+    async def _read_event(self) -> dict:
+        """Следующее событие; массив, переданный после строки события, - в поле positions"""
+        line = await self.reader.readline()
+        if not line:
+            return None
+        event = json.loads(line)
+        header = event.pop('payload', None)
+        if header is not None:
+            data = await self.reader.readexactly(header['nbytes'])
+            event['t'] = np.asarray(event['t'])
+            event['positions'] = np.frombuffer(data, dtype=header['dtype']).reshape(header['shape'])
+        return event
+
+    def _dispatch(self, event: dict):
+        future = self._pending.pop(event.get('request'), None) if 'request' in event else None
+        if future is not None:
+            if event['event'] == 'accepted':
+                # Очередь создается до прихода событий задания
+                self._queues.setdefault(event['job'], asyncio.Queue())
+            future.set_result(event)
+        elif 'job' in event and event['job'] in self._queues:
+            self._queues[event['job']].put_nowait(event)
+
+    async def _read(self):
+        try:
+            while True:
+                event = await self._read_event()
+                if event is None:
+                    break
+                self._dispatch(event)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        for future in self._pending.values():
+            future.set_exception(ConnectionError("Соединение со службой закрыто"))
+        # Незавершенные задания: служба закрыла соединение (например, клиент не успевал читать)
+        for job, queue in self._queues.items():
+            queue.put_nowait({'event': 'error', 'job': job, 'message': "Соединение со службой закрыто"})
+
+    async def _request(self, request: dict) -> dict:
+        tag = next(self._requests)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tag] = future
+        self._send({**request, 'request': tag})
+        await self.writer.drain()
+        response = await future
+        if response['event'] == 'error':
+            raise RuntimeError(response['message'])
+        return response
+
+    async def submit(self, spec: dict) -> str:
+        """Отправляет спецификацию; возвращает номер задания"""
+        response = await self._request({'op': 'submit', 'spec': spec})
+        return response['job']
+
+    async def events(self, job: str) -> AsyncIterator[dict]:
+        """События задания до завершающего; порции - с массивами numpy"""
+        queue = self._queues[job]
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event['event'] in FINAL_EVENTS:
+                    break
+        finally:
+            self._queues.pop(job, None)
+
+    async def cancel(self, job: str):
+        self._send({'op': 'cancel', 'job': job})
+        await self.writer.drain()
+
+    async def status(self) -> list:
+        return (await self._request({'op': 'status'}))['jobs']
+
+    async def run(self, spec: dict, on_event: Callable = None) -> tuple:
+        """
+        Выполняет расчет и собирает порции: (t_points, trajectories формы (n_points, n_outputs, 2)).
+
+        on_event(event) вызывается для каждого события (прогресс, порции).
+        """
+        job = await self.submit(spec)
+        times, chunks = [], []
+        async for event in self.events(job):
+            if on_event is not None:
+                on_event(event)
+            if event['event'] == 'chunk':
+                times.append(event['t'])
+                chunks.append(event['positions'])
+            elif event['event'] in ('cancelled', 'error'):
+                raise RuntimeError(f"Задание {job}: {event['event']} {event.get('message', '')}".rstrip())
+        if not chunks:
+            return np.empty(0), np.empty((0, 0, 2))
+        return np.concatenate(times), np.concatenate(chunks, axis=1)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._reader_task, return_exceptions=True)
@@ -0,0 +1,196 @@
+import copy
+import inspect
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Iterator, List
+
+import numpy as np
+
+from models.body_factory import BODY_TYPES, create_body
+from services.runge_kutta import RungeKuttaSolver
+from services.trajectory_calculator import TrajectoryCalculator
+
+
+def set_spec_value(spec: dict, path: str, value):
+    """Записывает значение в спецификацию по пути с точками, например 'body.radius'"""
+    keys = path.split('.')
+    target = spec
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def _run_case(spec: dict, block_name: str, shape: tuple, dtype: str) -> tuple:
+    """Выполняет один расчет в рабочем процессе, записывая траектории в разделяемую память"""
+    started = time.perf_counter()
+    # Рабочие процессы пула используют resource_tracker родителя: блок удалит владелец
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        calculator = TrajectoryCalculator.from_spec(spec)
+        calculator.calculate_trajectories(out=out)
+        t_points = calculator.t_points
+        del out, calculator
+    finally:
+        block.close()
+    return t_points, time.perf_counter() - started
+
+
+class SweepResult:
+    """
+    Результат одного расчета перебора.
+
+    trajectories - представление разделяемой памяти, действительное до
+    запроса следующего результата; затем блок освобождается, а атрибут
+    сбрасывается в None (нужные дольше траектории копируются).
+    """
+
+    __slots__ = ('index', 'spec', 't_points', 'trajectories', 'elapsed')
+
+    def __init__(self, index: int, spec: dict, t_points: np.ndarray, trajectories: np.ndarray,
+                 elapsed: float):
+        self.index = index
+        self.spec = spec
+        self.t_points = t_points
+        self.trajectories = trajectories
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        shape = None if self.trajectories is None else self.trajectories.shape
+        return f"SweepResult(index={self.index}, shape={shape}, elapsed={self.elapsed:.3f}s)"
+
+
+class ParameterSweep:
+    """
+    Перебор параметров расчета на пуле процессов.
+
+    Каждый случай - спецификация TrajectoryCalculator.from_spec. Под
+    траектории случая родитель выделяет свой блок разделяемой памяти;
+    рабочие процессы пишут в него напрямую, поэтому массивы траекторий не
+    сериализуются. Результаты выдаются в порядке завершения, блок случая
+    освобождается, когда потребитель запрашивает следующий результат.
+    Одновременно занято не больше window блоков, по умолчанию два на
+    рабочий процесс. Формы результатов считаются по спецификациям: тело
+    строится только для подсчета точек, калькуляторы не создаются.
+
+    Поддерживается только постоянный шаг: размер результата должен быть
+    известен заранее.
+    """
+
+    # Значения по умолчанию для ключей спецификации, от которых зависит форма результата
+    _DEFAULTS = {name: parameter.default
+                 for name, parameter in inspect.signature(TrajectoryCalculator.__init__).parameters.items()}
+
+    def __init__(self, cases: List[dict], max_workers: int = None, window: int = None):
+        self.cases = [copy.deepcopy(case) for case in cases]
+        self.max_workers = max_workers
+        self.window = window
+        self._blocks = {}
+        self._num_points = {}
+        self.shapes = {}
+        self.dtypes = {}
+
+    @classmethod
+    def from_grid(cls, base_spec: dict, axes: dict, max_workers: int = None, window: int = None):
+        """
+        Декартово произведение значений параметров.
+
+        axes - словарь {путь: список значений}, например
+        {'body.radius': [1, 2, 3], 't_end': [1.0, 2.0], 'dt': [0.01, 0.005]}.
+        """
+        paths = list(axes)
+        cases = []
+        for values in itertools.product(*(axes[path] for path in paths)):
+            case = copy.deepcopy(base_spec)
+            for path, value in zip(paths, values):
+                set_spec_value(case, path, value)
+            cases.append(case)
+        return cls(cases, max_workers, window)
+
+    def _count_points(self, body_spec: dict) -> int:
+        """Число точек тела; окружность не строится, прочие тела - один раз на различную спецификацию"""
+        if body_spec.get('kind') == 'circle':
+            default = inspect.signature(BODY_TYPES['circle']).parameters['num_points'].default
+            return int(body_spec.get('num_points', default))
+        key = json.dumps(body_spec, sort_keys=True, default=repr)
+        if key not in self._num_points:
+            params = dict(body_spec)
+            self._num_points[key] = create_body(params.pop('kind'), **params).get_num_points()
+        return self._num_points[key]
+
+    def get_case_shape(self, index: int) -> tuple:
+        """Форма и тип хранения траекторий случая по спецификации, без построения калькулятора"""
+        case = self.cases[index]
+        spec = {**self._DEFAULTS, **case}
+        if spec['output_times'] is not None:
+            n_outputs = len(spec['output_times'])
+        else:
+            n_steps = RungeKuttaSolver.get_num_steps(spec['t0'], spec['t_end'], spec['dt'])
+            n_outputs = len(RungeKuttaSolver.get_output_indices(n_steps, spec['output_stride']))
+        n_points = self._count_points(case.get('body', TrajectoryCalculator.DEFAULT_BODY_SPEC))
+        return (n_points, n_outputs, 2), np.dtype(spec['output_dtype']).str
+
+    def _allocate(self, index: int) -> shared_memory.SharedMemory:
+        shape, dtype = self.get_case_shape(index)
+        self.shapes[index] = shape
+        self.dtypes[index] = dtype
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks[index] = block
+        return block
+
+    def _release(self, index: int):
+        block = self._blocks.pop(index)
+        block.close()
+        block.unlink()
+
+    def get_result_array(self, index: int) -> np.ndarray:
+        """Представление траекторий случая index в разделяемой памяти (пока блок не освобожден)"""
+        return np.ndarray(self.shapes[index], dtype=self.dtypes[index], buffer=self._blocks[index].buf)
+
+    def run(self) -> Iterator[SweepResult]:
+        """Запускает все случаи и выдает результаты по мере завершения"""
+        self.close()
+        for case in self.cases:
+            if case.get('adaptive') or case.get('track_deformation'):
+                raise ValueError("Перебор поддерживает только расчет положений с постоянным шагом")
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            window = self.window or 2 * (self.max_workers or os.cpu_count() or 1)
+            pending = iter(range(len(self.cases)))
+            futures = {}
+
+            def submit_next():
+                index = next(pending, None)
+                if index is not None:
+                    block = self._allocate(index)
+                    futures[executor.submit(_run_case, self.cases[index], block.name,
+                                            self.shapes[index], self.dtypes[index])] = index
+
+            for _ in range(window):
+                submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures.pop(future)
+                    t_points, elapsed = future.result()
+                    result = SweepResult(index, self.cases[index], t_points,
+                                         self.get_result_array(index), elapsed)
+                    yield result
+                    result.trajectories = None
+                    self._release(index)
+                    submit_next()
+
+    def close(self):
+        """Освобождает разделяемую память (представления результатов становятся недействительны)"""
+        for index in list(self._blocks):
+            self._release(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
@@ -0,0 +1,281 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+import types
+import uuid
+
+import numpy as np
+
+
+# Версия формата записи: меняется при несовместимых изменениях расчета или хранения
+CACHE_FORMAT_VERSION = 2
+
+
+class UncacheableError(ValueError):
+    """Конфигурацию нельзя хешировать детерминированно: такой расчет не кешируется"""
+
+
+def _code_constant(value):
+    """Константа байткода: вложенный код - его хешем, множества - в сортированном виде"""
+    if isinstance(value, types.CodeType):
+        return _code_digest(value)
+    if isinstance(value, frozenset):
+        return sorted(repr(item) for item in value)
+    if isinstance(value, tuple):
+        return [_code_constant(item) for item in value]
+    return repr(value)
+
+
+def _code_digest(code: types.CodeType) -> str:
+    """Хеш байткода с именами и константами, включая вложенные функции"""
+    payload = json.dumps([code.co_code.hex(), code.co_names, code.co_varnames, code.co_freevars,
+                          [_code_constant(const) for const in code.co_consts]])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _global_names(code: types.CodeType) -> set:
+    """Имена, которые код и вложенные функции ищут в глобальном пространстве"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _qualified_name(value) -> str:
+    return f"{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', getattr(value, '__name__', None))}"
+
+
+def _canonical_callable(value, seen: frozenset):
+    """
+    Функция - байткодом, значениями по умолчанию, ячейками замыкания и
+    используемыми глобальными переменными: лямбды с np.sin и np.cos или
+    с разными захваченными коэффициентами получают разные ключи.
+    """
+    if isinstance(value, functools.partial):
+        return {'partial': _canonical(value.func, seen), 'args': _canonical(value.args, seen),
+                'keywords': _canonical(value.keywords, seen)}
+    if inspect.ismethod(value):
+        return {'method': _canonical(value.__func__, seen), 'self': _canonical(value.__self__, seen)}
+    if hasattr(value, 'get_parameters'):
+        # Поле скоростей, переданное как функция
+        return {'class': _qualified_name(type(value)), 'parameters': _canonical(value.get_parameters(), seen)}
+    code = getattr(value, '__code__', None)
+    if code is None:
+        # Встроенные функции, ufunc numpy и классы однозначно задаются именем
+        if isinstance(value, (type, np.ufunc, types.BuiltinFunctionType)):
+            return {'callable': _qualified_name(value)}
+        raise UncacheableError(f"Объект {value!r} нельзя хешировать для кеша")
+    if id(value) in seen:
+        return {'callable': _qualified_name(value), 'recursive': True}
+    seen = seen | {id(value)}
+
+    closure = []
+    for cell in value.__closure__ or ():
+        try:
+            closure.append(_canonical(cell.cell_contents, seen))
+        except ValueError:
+            # Пустая ячейка: переменная еще не присвоена
+            closure.append(None)
+    namespace = getattr(value, '__globals__', {})
+    return {'callable': _qualified_name(value), 'code': _code_digest(code),
+            'defaults': _canonical(value.__defaults__, seen),
+            'kwdefaults': _canonical(value.__kwdefaults__, seen),
+            'closure': closure,
+            'globals': {name: _canonical(namespace[name], seen)
+                        for name in sorted(_global_names(code)) if name in namespace}}
+
+
+def _canonical(value, seen: frozenset = frozenset()):
+    """
+    Приводит параметры к детерминированному JSON-совместимому виду для хеширования.
+
+    Значение без устойчивого представления (repr с адресом объекта)
+    вызывает UncacheableError: иначе ключ либо никогда не совпадет, либо
+    совпадет у разных расчетов.
+    """
+    if isinstance(value, dict):
+        return {str(key): _canonical(value[key], seen) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item, seen) for item in value]
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        if array.dtype.hasobject:
+            return {'object_array': [_canonical(item, seen) for item in array.ravel()],
+                    'shape': list(array.shape)}
+        return {'ndarray': hashlib.sha256(array.tobytes()).hexdigest(),
+                'dtype': str(array.dtype), 'shape': list(array.shape)}
+    if isinstance(value, (np.floating, np.integer, np.bool_)):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, types.ModuleType):
+        return {'module': value.__name__}
+    if callable(value):
+        return _canonical_callable(value, seen)
+    text = repr(value)
+    if ' at 0x' in text:
+        raise UncacheableError(f"Объект {text} нельзя хешировать для кеша")
+    return {'repr': text, 'class': _qualified_name(type(value))}
+
+
+def make_cache_key(calculator, include_t_end: bool = True) -> str:
+    """
+    Хеш полной конфигурации расчета: геометрия тела, поле скоростей и его
+    параметры, коэффициенты таблицы Бутчера, интервал времени и режим.
+
+    include_t_end=False - без конца интервала (для контрольных точек, которые
+    продолжение расчета сдвигает). UncacheableError - если параметры поля
+    нельзя хешировать детерминированно.
+    """
+    table = calculator.butcher_table
+    field = calculator.velocity_field
+    config = {
+        'version': CACHE_FORMAT_VERSION,
+        'body': np.asarray(calculator.body.get_coordinates()),
+        'field': {'class': f"{type(field).__module__}.{type(field).__qualname__}",
+                  'parameters': field.get_parameters()},
+        'table': {'a': table.a, 'b': table.b, 'c': table.c, 'b_embedded': table.b_embedded},
+        't0': calculator.t0,
+        't_end': calculator.t_end if include_t_end else None,
+        'dt': calculator.dt,
+        'adaptive': calculator.adaptive,
+        'rtol': calculator.rtol if calculator.adaptive else None,
+        'atol': calculator.atol if calculator.adaptive else None,
+        'method': calculator.method,
+        'track_deformation': calculator.track_deformation,
+        'output': {'stride': calculator.output_stride, 'times': calculator.output_times,
+                   'dtype': str(calculator.output_dtype)},
+    }
+    payload = json.dumps(_canonical(config), sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResultCache:
+    """
+    Кеш результатов расчета траекторий на диске с адресацией по содержимому.
+
+    Каждая запись - каталог <key>/ с массивами .npy (загружаются как memmap)
+    и meta.json. Запись атомарна: данные пишутся во временный каталог и
+    переименовываются. Вытеснение по LRU (время последнего обращения) при
+    превышении max_bytes или max_entries.
+    """
+
+    ARRAYS = ('t_points', 'trajectories', 'deformation_gradients', 'flow_matrices')
+
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024 ** 3, max_entries: int = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def contains(self, key: str) -> bool:
+        return os.path.isfile(os.path.join(self._entry_path(key), 'meta.json'))
+
+    def load(self, key: str) -> dict:
+        """Массивы записи как memory-mapped представления или None при промахе"""
+        path = self._entry_path(key)
+        if not self.contains(key):
+            return None
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                  for name in meta['arrays']}
+        # Обновляем время обращения для LRU
+        os.utime(os.path.join(path, 'meta.json'))
+        return arrays
+
+    def store(self, key: str, arrays: dict, meta: dict = None):
+        """Атомарно сохраняет массивы записи и запускает вытеснение"""
+        arrays = {name: value for name, value in arrays.items() if value is not None}
+        temporary = os.path.join(self.directory, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(temporary)
+        try:
+            for name, value in arrays.items():
+                np.save(os.path.join(temporary, f'{name}.npy'), np.ascontiguousarray(value))
+            with open(os.path.join(temporary, 'meta.json'), 'w', encoding='utf-8') as file:
+                json.dump({'arrays': list(arrays), 'created': time.time(), **(meta or {})}, file)
+            try:
+                os.rename(temporary, self._entry_path(key))
+            except OSError:
+                # Запись уже создана другим процессом с тем же ключом
+                if not self.contains(key):
+                    raise
+                shutil.rmtree(temporary, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+        self.evict()
+
+    def _entries(self) -> list:
+        """Записи кеша: (время обращения, размер, путь)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            meta = os.path.join(path, 'meta.json')
+            if name.startswith('.') or not os.path.isfile(meta):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(meta).st_mtime, size, path))
+        return sorted(entries)
+
+    def get_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Удаляет давно не использованные записи сверх ограничений"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and (total > self.max_bytes or
+                           (self.max_entries is not None and len(entries) > self.max_entries)):
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def calculate(self, calculator):
+        """
+        Загружает результат калькулятора из кеша или рассчитывает и сохраняет его.
+
+        Возвращает ключ записи; None, если конфигурацию нельзя хешировать
+        (UncacheableError) - тогда расчет выполняется без кеша.
+        """
+        try:
+            key = make_cache_key(calculator)
+        except UncacheableError:
+            self.uncacheable += 1
+            calculator.compute_trajectories()
+            return None
+        arrays = self.load(key)
+        if arrays is not None:
+            self.hits += 1
+            calculator.t_points = np.asarray(arrays['t_points'])
+            calculator.trajectories = arrays['trajectories']
+            calculator.deformation_gradients = arrays.get('deformation_gradients')
+            calculator.flow_matrices = arrays.get('flow_matrices')
+            next_dt = arrays.get('next_dt')
+            calculator.next_dt = None if next_dt is None or np.isnan(next_dt[0]) else float(next_dt[0])
+            if len(calculator.trajectories):
+                calculator.body.attach_trajectories(calculator.trajectories)
+            return key
+
+        self.misses += 1
+        calculator.compute_trajectories()
+        arrays = {name: getattr(calculator, name) for name in self.ARRAYS}
+        # Шаг адаптивного регулятора для продолжения расчета, как в контрольной точке
+        arrays['next_dt'] = np.array([np.nan if calculator.next_dt is None else calculator.next_dt])
+        self.store(key, arrays, meta={'method': calculator.method, 'table': calculator.butcher_table.name})
+        return key
@@ -0,0 +1,66 @@
+import json
+import os
+
+import numpy as np
+
+
+class ResultExporter:
+    """
+    Запись результатов расчета в CSV, NPZ или JSON.
+
+    Модуль не зависит от matplotlib: используется расчетными командами CLI
+    и рабочими процессами, где важна скорость запуска.
+    """
+
+    FORMATS = ('csv', 'npz', 'json')
+
+    @staticmethod
+    def get_format(path: str, fmt: str = None) -> str:
+        """Формат по явному указанию или по расширению файла"""
+        fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+        if fmt not in ResultExporter.FORMATS:
+            raise ValueError(f"Неизвестный формат '{fmt}', доступны: {', '.join(ResultExporter.FORMATS)}")
+        return fmt
+
+    @staticmethod
+    def to_csv(calculator, path: str):
+        """Длинная таблица: point, step, t, x, y - по строке на точку и шаг"""
+        trajectories = calculator.get_trajectory_array()
+        n_points, n_steps = trajectories.shape[:2]
+        point, step = np.divmod(np.arange(n_points * n_steps), n_steps)
+        table = np.column_stack([point, step, calculator.t_points[step], trajectories.reshape(-1, 2)])
+        np.savetxt(path, table, delimiter=',', header='point,step,t,x,y', comments='',
+                   fmt=['%d', '%d', '%.17g', '%.17g', '%.17g'])
+
+    @staticmethod
+    def to_npz(calculator, path: str, spec: dict = None):
+        arrays = {'t_points': calculator.t_points, 'trajectories': calculator.get_trajectory_array()}
+        if calculator.deformation_gradients is not None:
+            arrays['deformation_gradients'] = calculator.deformation_gradients
+        if spec is not None:
+            arrays['spec'] = np.array(json.dumps(spec, ensure_ascii=False))
+        np.savez(path, **arrays)
+
+    @staticmethod
+    def to_json(calculator, path: str, spec: dict = None):
+        result = {
+            'spec': spec,
+            't_points': calculator.t_points.tolist(),
+            'trajectories': calculator.get_trajectory_array().tolist(),
+        }
+        if calculator.deformation_gradients is not None:
+            result['deformation_gradients'] = calculator.deformation_gradients.tolist()
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(result, file, ensure_ascii=False)
+
+    @staticmethod
+    def export(calculator, path: str, fmt: str = None, spec: dict = None) -> str:
+        """Записывает результат в path; возвращает использованный формат"""
+        fmt = ResultExporter.get_format(path, fmt)
+        if fmt == 'csv':
+            ResultExporter.to_csv(calculator, path)
+        elif fmt == 'npz':
+            ResultExporter.to_npz(calculator, path, spec)
+        else:
+            ResultExporter.to_json(calculator, path, spec)
+        return fmt
@@ -1,54 +1,444 @@
+import time
+
 import numpy as np
-from typing import Callable
+from typing import Callable, Iterator
 
 class RungeKuttaSolver:
-    """Класс для численного интегрирования методом Рунге-Кутты"""
+    """Класс для численного интегрирования явными методами Рунге-Кутты"""
 
     def __init__(self, butcher_table):
         self.butcher_table = butcher_table
         self.a, self.b, self.c = butcher_table.get_coefficients()
         self.stages = butcher_table.get_stages()
+        self.b_embedded = butcher_table.b_embedded
+        self.fsal = butcher_table.fsal
+        self.dense = getattr(butcher_table, 'dense', None)
+
+        # Шаг, предложенный регулятором после последнего адаптивного расчета
+        self.last_dt = None
+
+        # Необязательная статистика расчета (SolverStats); None - без накладных расходов
+        self.stats = None
+
+    @staticmethod
+    def _evaluate(f: Callable, t: float, y: np.ndarray, out: np.ndarray):
+        """Вычисляет f(t, y) в out; поля с supports_out пишут в буфер без выделения памяти"""
+        if getattr(f, 'supports_out', False):
+            f(t, y, out=out)
+        else:
+            out[...] = f(t, y)
+
+    def _compute_stages(self, f: Callable, t: float, y: np.ndarray, dt: float,
+                        k: np.ndarray, y_temp: np.ndarray, first_stage_ready: bool = False):
+        """Вычисляет стадии k_i одного шага по таблице Бутчера"""
+        for s in range(self.stages):
+            if s == 0 and first_stage_ready:
+                continue
+            np.copyto(y_temp, y)
+            for j in range(s):
+                if self.a[s, j] != 0:
+                    y_temp += (dt * self.a[s, j]) * k[j]
+            self._evaluate(f, t + self.c[s] * dt, y_temp, k[s])
+
+    def _combine(self, y: np.ndarray, dt: float, weights: np.ndarray, k: np.ndarray,
+                 out: np.ndarray):
+        """Записывает в out значение y + dt * sum(w_i * k_i)"""
+        np.copyto(out, y)
+        for s in range(self.stages):
+            if weights[s] != 0:
+                out += (dt * weights[s]) * k[s]
+        return out
+
+    def step(self, f: Callable, t: float, y: np.ndarray, dt: float, out: np.ndarray = None,
+             k: np.ndarray = None) -> np.ndarray:
+        """
+        Один шаг метода из состояния y в момент t.
+
+        out может совпадать с y (шаг на месте); k - необязательный буфер
+        стадий формы (stages,) + y.shape для повторного использования.
+        """
+        stats = self.stats
+        if stats is not None:
+            f = stats.wrap_rhs(f)
+            started = time.perf_counter()
+        if k is None:
+            k = np.empty((self.stages,) + y.shape)
+        if out is None:
+            out = np.empty_like(y)
+        self._compute_stages(f, t, y, dt, k, np.empty_like(y))
+        self._combine(y, dt, self.b, k, out)
+        if stats is not None:
+            stats.add_time('solve', time.perf_counter() - started)
+            stats.record_step(t + dt, out)
+        return out
 
     def solve(self, f: Callable, y0: np.ndarray, t0: float, t_end: float, dt: float) -> tuple:
         """
-        Решает систему ОДУ dy/dt = f(t, y) методом Рунге-Кутты 4-го порядка
+        Решает систему ОДУ dy/dt = f(t, y) методом Рунге-Кутты с постоянным шагом
         """
-        # Количество шагов
-        n_steps = int((t_end - t0) / dt) + 1
+        return self.solve_batch(f, np.asarray(y0, dtype=float), t0, t_end, dt)
+
+    def solve_batch(self, f: Callable, y0: np.ndarray, t0: float, t_end: float, dt: float,
+                    out: np.ndarray = None) -> tuple:
+        """
+        Решает систему ОДУ dy/dt = f(t, y) сразу для всех точек.
 
-        # Инициализация массивов
+        y0 - массив формы (n_points, dim); f вызывается один раз на стадию
+        для всего массива состояний. Если передан out формы
+        (n_steps, n_points, dim), результат записывается в него.
+        """
+        y0 = np.asarray(y0, dtype=float)
+        stats = self.stats
+        if stats is not None:
+            f = stats.wrap_rhs(f)
+            started = time.perf_counter()
+
+        # Количество шагов
+        n_steps = self.get_num_steps(t0, t_end, dt)
         t_points = np.linspace(t0, t_end, n_steps)
-        y_points = np.zeros((n_steps, len(y0)))
+
+        if out is None:
+            y_points = np.empty((n_steps,) + y0.shape)
+        else:
+            if out.shape != (n_steps,) + y0.shape:
+                raise ValueError(f"Ожидался out формы {(n_steps,) + y0.shape}, получен {out.shape}")
+            y_points = out
         y_points[0] = y0
 
-        # Интегрирование методом Рунге-Кутты 4-го порядка
+        # Буферы стадий выделяются один раз на весь расчет
+        k = np.empty((self.stages,) + y0.shape)
+        y = y0.copy()
+        y_temp = np.empty_like(y)
+        first_stage_ready = False
+
         for i in range(n_steps - 1):
             t = t_points[i]
-            y = y_points[i]
+            # Фактический шаг сетки: linspace может немного отличаться от dt
+            h = t_points[i + 1] - t
+
+            self._compute_stages(f, t, y, h, k, y_temp, first_stage_ready)
+            self._combine(y, h, self.b, k, y)
+
+            # FSAL: последняя стадия равна f(t + dt, y_next)
+            if self.fsal:
+                k[0] = k[-1]
+                first_stage_ready = True
+
+            y_points[i + 1] = y
+            if stats is not None:
+                stats.record_step(t_points[i + 1], y)
+
+        if stats is not None:
+            stats.add_time('solve', time.perf_counter() - started)
+        return t_points, y_points
+
+    @staticmethod
+    def get_num_steps(t0: float, t_end: float, dt: float) -> int:
+        """
+        Число узлов сетки [t0, t_end] с шагом dt.
+
+        Допуск 1e-9 шага: (t_end - t0) / dt, равное целому n, из-за округления
+        может получиться чуть меньше n, и int() потерял бы шаг.
+        """
+        return int((t_end - t0) / dt + 1e-9) + 1
+
+    @staticmethod
+    def get_output_indices(n_steps: int, stride: int = 1) -> np.ndarray:
+        """Номера сохраняемых шагов: каждый stride-й и обязательно последний"""
+        if stride < 1:
+            raise ValueError("Шаг вывода должен быть не меньше 1")
+        return np.unique(np.r_[np.arange(0, n_steps, stride), n_steps - 1])
+
+    @staticmethod
+    def _check_output_times(t_eval, t0: float, t_end: float) -> np.ndarray:
+        """Запрошенные моменты вывода: неубывающие, внутри [t0, t_end]"""
+        t_eval = np.asarray(t_eval, dtype=float).ravel()
+        if np.any(np.diff(t_eval) < 0):
+            raise ValueError("Моменты вывода должны быть упорядочены по возрастанию")
+        if len(t_eval) and (t_eval[0] < t0 or t_eval[-1] > t_end):
+            raise ValueError(f"Моменты вывода должны лежать в [{t0}, {t_end}]")
+        return t_eval
+
+    def _dense_output(self, f: Callable, t: float, y_left: np.ndarray, h: float, s: float, k: np.ndarray,
+                      out: np.ndarray, buffers: tuple) -> np.ndarray:
+        """
+        Состояние в момент t + s·h внутри шага из y_left со стадиями k.
+
+        Таблица с плотным выводом (Дорман-Принс, Богацкий-Шампин) дает его по
+        уже вычисленным стадиям без обращений к f; иначе из y_left делается
+        отдельный шаг длины s·h, и точность совпадает с точностью метода.
+        buffers - (стадии, временный y) для отдельного шага.
+        """
+        if self.dense is not None:
+            return self._combine(y_left, h, self.butcher_table.dense_weights(s), k, out)
+        k_extra, y_temp = buffers
+        self._compute_stages(f, t, y_left, s * h, k_extra, y_temp)
+        return self._combine(y_left, s * h, self.b, k_extra, out)
+
+    def _iter_outputs(self, f: Callable, y0: np.ndarray, t0: float, t_end: float, dt: float,
+                      stride: int = 1, t_eval=None) -> Iterator[tuple]:
+        """
+        Интегрирует с постоянным шагом и выдает (t, y) только в моменты вывода.
+
+        Без t_eval выводится каждый stride-й шаг и последний. С t_eval
+        состояние в каждый запрошенный момент внутри шага дает плотный вывод
+        таблицы или отдельный шаг от левого конца (_dense_output).
+        Выдаваемый y - внутренний буфер: его нужно скопировать до следующей
+        итерации. f должна быть уже обернута статистикой.
+        """
+        stats = self.stats
+        n_steps = self.get_num_steps(t0, t_end, dt)
+        t_points = np.linspace(t0, t_end, n_steps)
+
+        k = np.empty((self.stages,) + y0.shape)
+        y = y0.copy()
+        y_temp = np.empty_like(y)
+        first_stage_ready = False
+
+        if t_eval is None:
+            is_output = np.zeros(n_steps, dtype=bool)
+            is_output[self.get_output_indices(n_steps, stride)] = True
+        else:
+            t_eval = self._check_output_times(t_eval, t0, t_end)
+            y_left = np.empty_like(y)
+            y_out = np.empty_like(y)
+            buffers = (np.empty_like(k), np.empty_like(y))
+        j = 0
+
+        for i in range(n_steps):
+            if i > 0:
+                t = t_points[i - 1]
+                h = t_points[i] - t
+                # Внутри шага есть запрошенный момент: нужен левый конец шага
+                interpolate = t_eval is not None and j < len(t_eval) and t_eval[j] < t_points[i]
+                if interpolate:
+                    np.copyto(y_left, y)
+                self._compute_stages(f, t, y, h, k, y_temp, first_stage_ready)
+                self._combine(y, h, self.b, k, y)
+                if stats is not None:
+                    stats.record_step(t_points[i], y)
+
+                # Стадии шага нужны плотному выводу до сдвига FSAL
+                while interpolate and j < len(t_eval) and t_eval[j] < t_points[i]:
+                    yield t_eval[j], self._dense_output(f, t, y_left, h, (t_eval[j] - t) / h, k, y_out, buffers)
+                    j += 1
+                if self.fsal:
+                    k[0] = k[-1]
+                first_stage_ready = self.fsal
+
+            if t_eval is None:
+                if is_output[i]:
+                    yield t_points[i], y
+            else:
+                while j < len(t_eval) and t_eval[j] == t_points[i]:
+                    yield t_eval[j], y
+                    j += 1
+
+    def solve_output(self, f: Callable, y0: np.ndarray, t0: float, t_end: float, dt: float,
+                     stride: int = 1, t_eval=None, dtype=np.float64, out: np.ndarray = None) -> tuple:
+        """
+        Решает систему с постоянным шагом, сохраняя только моменты вывода.
+
+        Шаг интегрирования dt и разрешение вывода независимы: сохраняется
+        каждый stride-й шаг или состояния в моменты t_eval (интерполяция
+        внутри шага). Интегрирование всегда в float64, результат хранится в
+        dtype (например, float32). out - необязательный буфер формы
+        (n_outputs,) + y0.shape.
+        """
+        y0 = np.asarray(y0, dtype=float)
+        stats = self.stats
+        if stats is not None:
+            f = stats.wrap_rhs(f)
+            started = time.perf_counter()
+
+        if t_eval is not None:
+            t_out = self._check_output_times(t_eval, t0, t_end)
+        else:
+            n_steps = self.get_num_steps(t0, t_end, dt)
+            t_out = np.linspace(t0, t_end, n_steps)[self.get_output_indices(n_steps, stride)]
+        shape = (len(t_out),) + y0.shape
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Ожидался out формы {shape}, получен {out.shape}")
+
+        outputs = self._iter_outputs(f, y0, t0, t_end, dt, stride, None if t_eval is None else t_out)
+        for index, (_, y) in enumerate(outputs):
+            out[index] = y
+
+        if stats is not None:
+            stats.add_time('solve', time.perf_counter() - started)
+        return t_out, out
+
+    def iter_solve(self, f: Callable, y0: np.ndarray, t0: float, t_end: float, dt: float,
+                   chunk_size: int = 100, stride: int = 1, t_eval=None, dtype=np.float64) -> Iterator[tuple]:
+        """
+        Решает систему ОДУ с постоянным шагом, выдавая решение порциями по времени.
+
+        Сохраняется каждый stride-й шаг (и последний) либо моменты t_eval;
+        порция содержит до chunk_size сохраненных состояний: (t_chunk, y_chunk)
+        формы (k,) и (k,) + y0.shape, y_chunk в типе dtype. Буфер порции
+        переиспользуется: данные нужно записать или скопировать до запроса
+        следующей порции. В памяти никогда не хранится вся история.
+        """
+        y0 = np.asarray(y0, dtype=float)
+        stats = self.stats
+        if stats is not None:
+            f = stats.wrap_rhs(f)
+            started = time.perf_counter()
+
+        chunk = np.empty((chunk_size,) + y0.shape, dtype=dtype)
+        chunk_times = np.empty(chunk_size)
+        filled = 0
+
+        for t, y in self._iter_outputs(f, y0, t0, t_end, dt, stride, t_eval):
+            chunk[filled] = y
+            chunk_times[filled] = t
+            filled += 1
+            if filled == chunk_size:
+                # Время потребителя порции не входит во время решателя
+                if stats is not None:
+                    stats.add_time('solve', time.perf_counter() - started)
+                yield chunk_times, chunk
+                if stats is not None:
+                    started = time.perf_counter()
+                filled = 0
+
+        if stats is not None:
+            stats.add_time('solve', time.perf_counter() - started)
+        if filled:
+            yield chunk_times[:filled], chunk[:filled]
+
+    def solve_adaptive(self, f: Callable, y0: np.ndarray, t0: float, t_end: float,
+                       rtol: float = 1e-6, atol: float = 1e-9, dt0: float = None,
+                       dt_min: float = 1e-12, dt_max: float = None,
+                       max_steps: int = 100000, stride: int = 1, t_eval=None,
+                       dtype=np.float64) -> tuple:
+        """
+        Решает систему ОДУ с адаптивным шагом по вложенной паре методов.
+
+        Шаг выбирается так, чтобы оценка локальной погрешности не превышала
+        atol + rtol * |y|. Возвращает узлы t_points переменной длины и
+        массив y_points формы (n_steps,) + y0.shape. Сохраняется каждый
+        stride-й принятый шаг (и последний) либо, при заданном t_eval,
+        состояния в запрошенные моменты (плотный вывод таблицы внутри шага);
+        результат хранится в dtype, интегрирование - в float64.
+        """
+        if self.b_embedded is None:
+            raise ValueError(f"Таблица '{self.butcher_table.name}' не содержит вложенного метода")
+
+        y0 = np.asarray(y0, dtype=float)
+        stats = self.stats
+        if stats is not None:
+            f = stats.wrap_rhs(f)
+            started = time.perf_counter()
+        span = t_end - t0
+        if dt_max is None:
+            dt_max = abs(span)
+
+        # Показатель регулятора по наименьшему порядку пары
+        orders = [self.butcher_table.order, self.butcher_table.embedded_order or 1]
+        exponent = 1.0 / (min(orders) + 1)
+        safety, factor_min, factor_max = 0.9, 0.2, 5.0
+
+        k = np.empty((self.stages,) + y0.shape)
+        y = y0.copy()
+        y_temp = np.empty_like(y)
+        y_next = np.empty_like(y)
+        y_err = np.empty_like(y)
+        db = self.b - self.b_embedded
+
+        t = t0
+        self._evaluate(f, t, y, k[0])
+        first_stage_ready = True
+
+        j = 0
+        if t_eval is not None:
+            t_eval = self._check_output_times(t_eval, t0, t_end)
+            y_out = np.empty_like(y)
+            buffers = (np.empty_like(k), np.empty_like(y))
+            t_points, y_points = [], []
+            while j < len(t_eval) and t_eval[j] == t0:
+                t_points.append(t0)
+                y_points.append(y0.astype(dtype))
+                j += 1
+        else:
+            if stride < 1:
+                raise ValueError("Шаг вывода должен быть не меньше 1")
+            t_points = [t0]
+            y_points = [y0.astype(dtype)]
+
+        if dt0 is None:
+            # Начальный шаг по оценке производной (Hairer, Nørsett, Wanner)
+            scale = atol + rtol * np.abs(y)
+            d0 = np.sqrt(np.mean((y / scale) ** 2))
+            d1 = np.sqrt(np.mean((k[0] / scale) ** 2))
+            dt0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+        dt = min(max(dt0, dt_min), dt_max)
 
-            # Вычисление k_i на каждой стадии
-            k = np.zeros((self.stages, len(y0)))
+        steps = accepted = 0
+        while t < t_end:
+            if steps >= max_steps:
+                raise RuntimeError(f"Превышено максимальное число шагов ({max_steps})")
+            steps += 1
 
-            # Стадия 1
-            k[0] = f(t, y)
+            dt = min(dt, t_end - t)
+            self._compute_stages(f, t, y, dt, k, y_temp, first_stage_ready)
+            self._combine(y, dt, self.b, k, y_next)
 
-            # Стадия 2
-            y_temp = y + dt * self.a[1, 0] * k[0]
-            k[1] = f(t + self.c[1] * dt, y_temp)
+            # Оценка локальной погрешности как разность двух решений пары
+            np.copyto(y_err, 0.0)
+            self._combine(y_err, dt, db, k, y_err)
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_next))
+            err_norm = np.sqrt(np.mean((y_err / scale) ** 2))
 
-            # Стадия 3
-            y_temp = y + dt * (self.a[2, 0] * k[0] + self.a[2, 1] * k[1])
-            k[2] = f(t + self.c[2] * dt, y_temp)
+            if err_norm <= 1.0:
+                t_left = t
+                t = t + dt
+                accepted += 1
+                if t_eval is not None:
+                    # Запрошенные моменты внутри шага - плотным выводом по стадиям шага (до сдвига FSAL)
+                    while j < len(t_eval) and t_eval[j] <= t:
+                        if t_eval[j] == t:
+                            y_points.append(y_next.astype(dtype))
+                        else:
+                            s = (t_eval[j] - t_left) / dt
+                            y_points.append(self._dense_output(f, t_left, y, dt, s, k, y_out, buffers).astype(dtype))
+                        t_points.append(t_eval[j])
+                        j += 1
+                elif accepted % stride == 0 or t >= t_end:
+                    t_points.append(t)
+                    y_points.append(y_next.astype(dtype))
+                if self.fsal:
+                    k[0] = k[-1]
+                else:
+                    self._evaluate(f, t, y_next, k[0])
+                first_stage_ready = True
+                np.copyto(y, y_next)
 
-            # Стадия 4
-            y_temp = y + dt * (self.a[3, 0] * k[0] + self.a[3, 1] * k[1] + self.a[3, 2] * k[2])
-            k[3] = f(t + self.c[3] * dt, y_temp)
+                factor = factor_max if err_norm == 0 else min(factor_max, safety * err_norm ** -exponent)
+                if stats is not None:
+                    stats.record_step(t, y)
+            else:
+                # Шаг отклонен: первая стадия остается прежней
+                factor = max(factor_min, safety * err_norm ** -exponent)
+                if stats is not None:
+                    stats.record_step(t, y, accepted=False)
+                if dt <= dt_min:
+                    raise RuntimeError(f"Шаг стал меньше минимального ({dt_min}) при t={t}")
 
-            # Вычисление следующего значения y
-            y_next = y.copy()
-            for s in range(self.stages):
-                y_next += dt * self.b[s] * k[s]
+            dt = min(max(dt * factor, dt_min), dt_max)
 
-            y_points[i + 1] = y_next
+        if t_eval is not None:
+            # Моменты, отличающиеся от t_end на ошибку округления последнего шага
+            for t_extra in t_eval[j:]:
+                t_points.append(t_extra)
+                y_points.append(y.astype(dtype))
 
-        return t_points, y_points
\ No newline at end of file
+        # Предложенный регулятором следующий шаг - для продолжения расчета
+        self.last_dt = dt
+        if stats is not None:
+            stats.add_time('solve', time.perf_counter() - started)
+        if not y_points:
+            return np.empty(0), np.empty((0,) + y0.shape, dtype=dtype)
+        return np.array(t_points), np.stack(y_points)
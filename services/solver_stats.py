@@ -0,0 +1,93 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+
+class SolverStats:
+    """
+    Счетчики и таймеры расчета.
+
+    Подключается явно (RungeKuttaSolver.stats, TrajectoryCalculator(stats=...)).
+    Без него решатель проверяет только `stats is not None` раз за шаг, а
+    функция правых частей не оборачивается.
+
+    callback(t, y, stats) вызывается после каждого callback_interval-го
+    принятого шага - для прогресса и мониторинга; y нельзя изменять.
+    """
+
+    def __init__(self, callback: Callable = None, callback_interval: int = 1):
+        self.callback = callback
+        self.callback_interval = callback_interval
+        self.reset()
+
+    def reset(self):
+        self.rhs_evaluations = 0
+        self.rhs_points = 0
+        self.accepted_steps = 0
+        self.rejected_steps = 0
+        self.timers = {}
+        self.last_t = None
+
+    def add_time(self, phase: str, seconds: float):
+        self.timers[phase] = self.timers.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замер времени участка: with stats.phase('plot'): ..."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def wrap_rhs(self, f: Callable) -> Callable:
+        """Обертка правых частей, считающая вызовы, точки и время 'rhs'"""
+        supports_out = getattr(f, 'supports_out', False)
+        stats = self
+
+        def counted_rhs(t, y, out=None):
+            start = time.perf_counter()
+            result = f(t, y, out=out) if supports_out else f(t, y)
+            stats.add_time('rhs', time.perf_counter() - start)
+            stats.rhs_evaluations += 1
+            stats.rhs_points += y.size // y.shape[-1] if y.ndim else 1
+            return result
+
+        counted_rhs.supports_out = supports_out
+        return counted_rhs
+
+    def record_step(self, t: float, y, accepted: bool = True):
+        if not accepted:
+            self.rejected_steps += 1
+            return
+        self.accepted_steps += 1
+        self.last_t = float(t)
+        if self.callback is not None and self.accepted_steps % self.callback_interval == 0:
+            self.callback(t, y, self)
+
+    def to_dict(self) -> dict:
+        timers = dict(self.timers)
+        # Арифметика стадий: время решателя за вычетом правых частей
+        if 'solve' in timers and 'rhs' in timers:
+            timers['stage_arithmetic'] = max(timers['solve'] - timers['rhs'], 0.0)
+        return {
+            'rhs_evaluations': self.rhs_evaluations,
+            'rhs_points': self.rhs_points,
+            'accepted_steps': self.accepted_steps,
+            'rejected_steps': self.rejected_steps,
+            'last_t': self.last_t,
+            'timers': timers,
+        }
+
+    def to_json(self, path: str = None) -> str:
+        """JSON-представление; при указании path также записывается в файл"""
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return text
+
+    def __repr__(self):
+        return (f"SolverStats(rhs={self.rhs_evaluations}, accepted={self.accepted_steps}, "
+                f"rejected={self.rejected_steps})")
@@ -0,0 +1,319 @@
+import numpy as np
+
+from models.geometry import polygon_mask
+
+
+class _GridLevel:
+    """Один уровень сетки: размер ячейки, число ячеек и раскладка элементов (CSR)"""
+    __slots__ = ('cell_size', 'shape', 'order', 'cell_start')
+
+    def __init__(self, cell_size: float, shape: tuple, order: np.ndarray, cell_start: np.ndarray):
+        self.cell_size = cell_size
+        self.shape = shape
+        self.order = order
+        self.cell_start = cell_start
+
+
+class SpatialIndex:
+    """
+    Индекс на равномерной сетке для положений точек в одном снимке.
+
+    Точки раскладываются по ячейкам сортировкой номеров ячеек (формат CSR:
+    cell_start[c]:cell_start[c + 1] - диапазон в order). Над основной
+    сеткой строится пирамида с удвоением ячейки: поиск ближайшей точки
+    спускается по ней как по квадродереву и не перебирает пустые ячейки.
+    Все запросы пакетные: циклы идут по уровням и смещениям ячеек, а
+    запросы обрабатываются векторно. При передаче triangles
+    (MeshBody) строится такой же индекс треугольников для проверки
+    принадлежности телу и барицентрического обратного отображения.
+    """
+
+    def __init__(self, positions: np.ndarray, cell_size: float = None, triangles: np.ndarray = None):
+        self.positions = np.ascontiguousarray(positions, dtype=float).reshape(-1, 2)
+        if len(self.positions) == 0:
+            raise ValueError("Индекс строится по непустому набору точек")
+
+        self.lower = self.positions.min(axis=0)
+        self.extent = self.positions.max(axis=0) - self.lower
+        if cell_size is None:
+            # В среднем около одной точки на ячейку
+            area = self.extent[0] * self.extent[1]
+            cell_size = np.sqrt(area / len(self.positions)) if area > 0 else \
+                self.extent.max() / len(self.positions)
+            cell_size = cell_size if cell_size > 0 else 1.0
+
+        # Уровень 0 - основная сетка; уровень l объединяет блоки 2^l × 2^l ячеек
+        self.cell_size = float(cell_size)
+        self.shape = tuple(int(n) for n in np.floor(self.extent / self.cell_size).astype(np.int64) + 1)
+        base_cells = self._cells(self.positions)
+        np.clip(base_cells, 0, np.array(self.shape) - 1, out=base_cells)
+        self.levels = [self._build_level(base_cells, 0)]
+        while max(self.levels[-1].shape) > 2:
+            self.levels.append(self._build_level(base_cells, len(self.levels)))
+
+        self.triangles = None
+        if triangles is not None:
+            self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+            self._build_triangle_bins()
+
+    def _build_level(self, base_cells: np.ndarray, number: int) -> _GridLevel:
+        shape = tuple(int(n) for n in ((np.array(self.shape) - 1) >> number) + 1)
+        cells = base_cells >> number
+        order, cell_start = self._bin(cells[:, 1] * shape[0] + cells[:, 0], shape)
+        return _GridLevel(self.cell_size * 2 ** number, shape, order, cell_start)
+
+    def _cells(self, points: np.ndarray, cell_size: float = None) -> np.ndarray:
+        """Целочисленные координаты ячеек (n, 2), могут лежать вне сетки"""
+        cell_size = self.cell_size if cell_size is None else cell_size
+        return np.floor((points - self.lower) / cell_size).astype(np.int64)
+
+    @staticmethod
+    def _bin(cell_ids: np.ndarray, shape: tuple) -> tuple:
+        """Сортировка элементов по ячейкам: (order, cell_start)"""
+        order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=shape[0] * shape[1])
+        cell_start = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=cell_start[1:])
+        return order, cell_start
+
+    @staticmethod
+    def _gather(query_ids: np.ndarray, start: np.ndarray, end: np.ndarray, order: np.ndarray) -> tuple:
+        """Пары (запрос, элемент) для диапазонов ячеек start:end"""
+        counts = end - start
+        total = int(counts.sum())
+        query_rep = np.repeat(query_ids, counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return query_rep, order[np.repeat(start, counts) + local]
+
+    @staticmethod
+    def _shifted_cells(cells: np.ndarray, offset: tuple, shape: tuple) -> tuple:
+        """Номера ячеек cells + offset и маска тех, что лежат внутри сетки"""
+        cx = cells[:, 0] + offset[0]
+        cy = cells[:, 1] + offset[1]
+        valid = (cx >= 0) & (cx < shape[0]) & (cy >= 0) & (cy < shape[1])
+        return cy[valid] * shape[0] + cx[valid], valid
+
+    def _candidates(self, query_ids: np.ndarray, cells: np.ndarray, offset: tuple, shape: tuple,
+                    order: np.ndarray, cell_start: np.ndarray) -> tuple:
+        """Элементы ячейки cells + offset для каждого запроса (ячейки вне сетки пропускаются)"""
+        cell_ids, valid = self._shifted_cells(cells, offset, shape)
+        return self._gather(query_ids[valid], cell_start[cell_ids], cell_start[cell_ids + 1], order)
+
+    def _cell_gap(self, queries: np.ndarray, cells: np.ndarray, cell_size: float) -> np.ndarray:
+        """Квадрат наименьшего расстояния от запросов до прямоугольников ячеек"""
+        low = self.lower + cells * cell_size
+        gap = np.maximum(np.maximum(low - queries, queries - (low + cell_size)), 0.0)
+        return (gap ** 2).sum(axis=1)
+
+    def _start_levels(self, queries: np.ndarray) -> np.ndarray:
+        """Самый мелкий уровень, на котором в окрестности 3×3 ячейки запроса есть точки"""
+        assigned = np.full(len(queries), len(self.levels) - 1)
+        unresolved = np.arange(len(queries))
+        for number, level in enumerate(self.levels[:-1]):
+            cells = self._cells(queries[unresolved], level.cell_size)
+            count = np.zeros(len(unresolved), dtype=np.int64)
+            for offset in [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]:
+                cell_ids, valid = self._shifted_cells(cells, offset, level.shape)
+                count[valid] += level.cell_start[cell_ids + 1] - level.cell_start[cell_ids]
+            found = count > 0
+            assigned[unresolved[found]] = number
+            unresolved = unresolved[~found]
+            if len(unresolved) == 0:
+                break
+        return assigned
+
+    def _descend(self, queries: np.ndarray, query_ids: np.ndarray, start: int,
+                 best_d2: np.ndarray, best_index: np.ndarray):
+        """
+        Спуск по пирамиде от уровня start для группы запросов.
+
+        Начальный блок 7×7 ячеек вокруг запроса заведомо содержит ближайшую
+        точку (в окрестности 3×3 точки есть). Пары (запрос, ячейка)
+        отсекаются, если ячейка дальше лучшей найденной точки (первой точки
+        каждой непустой ячейки); оставшиеся делятся на четыре дочерние.
+        """
+        level = self.levels[start]
+        # Запросы вне сетки начинают с ее ближайших ячеек
+        cells = np.clip(self._cells(queries[query_ids], level.cell_size), 0, np.array(level.shape) - 1)
+        block = np.array([(dx, dy) for dx in range(-3, 4) for dy in range(-3, 4)])
+        cells = (cells[:, None] + block).reshape(-1, 2)
+        query_rep = np.repeat(query_ids, len(block))
+        if start == len(self.levels) - 1:
+            # На верхнем уровне (не больше 2×2 ячеек) просматриваются все ячейки
+            grid_x, grid_y = np.meshgrid(np.arange(level.shape[0]), np.arange(level.shape[1]))
+            top = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+            cells = np.tile(top, (len(query_ids), 1))
+            query_rep = np.repeat(query_ids, len(top))
+
+        for number in range(start, -1, -1):
+            level = self.levels[number]
+            inside = ((cells >= 0) & (cells < level.shape)).all(axis=1)
+            query_rep, cells = query_rep[inside], cells[inside]
+            cell_ids = cells[:, 1] * level.shape[0] + cells[:, 0]
+            first = level.cell_start[cell_ids]
+            occupied = level.cell_start[cell_ids + 1] > first
+            query_rep, cells, cell_ids, first = query_rep[occupied], cells[occupied], cell_ids[occupied], first[occupied]
+
+            # Верхняя оценка - расстояние до реальной точки каждой ячейки
+            representative = level.order[first]
+            d2 = ((self.positions[representative] - queries[query_rep]) ** 2).sum(axis=1)
+            np.minimum.at(best_d2, query_rep, d2)
+            keep = self._cell_gap(queries[query_rep], cells, level.cell_size) <= best_d2[query_rep]
+            query_rep, cells, cell_ids = query_rep[keep], cells[keep], cell_ids[keep]
+
+            if number > 0:
+                children = np.array([(0, 0), (1, 0), (0, 1), (1, 1)])
+                cells = (2 * cells[:, None] + children).reshape(-1, 2)
+                query_rep = np.repeat(query_rep, 4)
+
+        query_rep, point_rep = self._gather(query_rep, level.cell_start[cell_ids],
+                                            level.cell_start[cell_ids + 1], level.order)
+        d2 = ((self.positions[point_rep] - queries[query_rep]) ** 2).sum(axis=1)
+        np.minimum.at(best_d2, query_rep, d2)
+        hit = d2 == best_d2[query_rep]
+        best_index[query_rep[hit]] = point_rep[hit]
+
+    def nearest(self, queries: np.ndarray, chunk_size: int = 65536) -> tuple:
+        """
+        Ближайшая точка для каждого запроса: (индексы, расстояния).
+
+        Запросы группируются по начальному уровню пирамиды и обрабатываются
+        порциями по chunk_size, чтобы ограничить память под пары (запрос, ячейка).
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        best_d2 = np.full(len(queries), np.inf)
+        best_index = np.full(len(queries), -1, dtype=np.int64)
+
+        start_levels = self._start_levels(queries)
+        for number in np.unique(start_levels):
+            group = np.flatnonzero(start_levels == number)
+            for offset in range(0, len(group), chunk_size):
+                self._descend(queries, group[offset:offset + chunk_size], number, best_d2, best_index)
+        return best_index, np.sqrt(best_d2)
+
+    def query_radius(self, queries: np.ndarray, radius: float) -> tuple:
+        """
+        Точки в пределах radius от каждого запроса в формате CSR.
+
+        Возвращает (offsets, indices): соседи запроса i - indices[offsets[i]:offsets[i + 1]].
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        cells = self._cells(queries)
+        query_ids = np.arange(len(queries))
+        reach = int(np.ceil(radius / self.cell_size))
+
+        found_queries = []
+        found_points = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                query_rep, point_rep = self._candidates(query_ids, cells, (dx, dy), self.shape,
+                                                        self.levels[0].order, self.levels[0].cell_start)
+                d2 = ((self.positions[point_rep] - queries[query_rep]) ** 2).sum(axis=1)
+                inside = d2 <= radius * radius
+                found_queries.append(query_rep[inside])
+                found_points.append(point_rep[inside])
+
+        found_queries = np.concatenate(found_queries)
+        found_points = np.concatenate(found_points)
+        order = np.argsort(found_queries, kind='stable')
+        offsets = np.zeros(len(queries) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(found_queries, minlength=len(queries)), out=offsets[1:])
+        return offsets, found_points[order]
+
+    def _build_triangle_bins(self):
+        """Каждый треугольник заносится во все ячейки, пересекающие его габарит"""
+        corners = self.positions[self.triangles]
+        low = np.clip(self._cells(corners.min(axis=1)), 0, np.array(self.shape) - 1)
+        high = np.clip(self._cells(corners.max(axis=1)), 0, np.array(self.shape) - 1)
+        width = high[:, 0] - low[:, 0] + 1
+        counts = width * (high[:, 1] - low[:, 1] + 1)
+
+        triangle_rep = np.repeat(np.arange(len(self.triangles)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        width_rep = width[triangle_rep]
+        cx = low[triangle_rep, 0] + local % width_rep
+        cy = low[triangle_rep, 1] + local // width_rep
+        order, self.triangle_cell_start = self._bin(cy * self.shape[0] + cx, self.shape)
+        self.triangle_order = triangle_rep[order]
+
+    def _barycentric(self, triangle_ids: np.ndarray, points: np.ndarray) -> np.ndarray:
+        p0, p1, p2 = (self.positions[self.triangles[triangle_ids, i]] for i in range(3))
+        v1 = p1 - p0
+        v2 = p2 - p0
+        vp = points - p0
+        det = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+        det = np.where(det != 0, det, np.nan)
+        l1 = (vp[:, 0] * v2[:, 1] - vp[:, 1] * v2[:, 0]) / det
+        l2 = (v1[:, 0] * vp[:, 1] - v1[:, 1] * vp[:, 0]) / det
+        return np.column_stack([1 - l1 - l2, l1, l2])
+
+    def locate(self, queries: np.ndarray, tolerance: float = 1e-12) -> tuple:
+        """
+        Треугольник, содержащий каждый запрос, и барицентрические координаты.
+
+        Возвращает (triangle_ids, weights (n, 3)); вне тела - индекс -1 и NaN.
+        """
+        if self.triangles is None:
+            raise ValueError("Для поиска треугольников индекс строится с triangles")
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        triangle_ids = np.full(len(queries), -1, dtype=np.int64)
+        weights = np.full((len(queries), 3), np.nan)
+
+        query_rep, candidate = self._candidates(np.arange(len(queries)), self._cells(queries), (0, 0),
+                                                self.shape, self.triangle_order, self.triangle_cell_start)
+        bary = self._barycentric(candidate, queries[query_rep])
+        inside = (bary >= -tolerance).all(axis=1)
+        triangle_ids[query_rep[inside]] = candidate[inside]
+        weights[query_rep[inside]] = bary[inside]
+        return triangle_ids, weights
+
+    def contains(self, queries: np.ndarray, outline: np.ndarray = None) -> np.ndarray:
+        """
+        Маска запросов внутри тела.
+
+        Для сетки используются треугольники; иначе нужен контур outline
+        (n_vertices, 2) в текущей конфигурации.
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        if self.triangles is not None:
+            return self.locate(queries)[0] >= 0
+        if outline is None:
+            raise ValueError("Для тела без сетки нужен контур outline")
+        return polygon_mask(queries, outline)
+
+    def inverse_map(self, queries: np.ndarray, reference: np.ndarray, power: float = 2.0) -> np.ndarray:
+        """
+        Отсчетные координаты для текущих положений queries.
+
+        На сетке - барицентрическая интерполяция в содержащем треугольнике
+        (вне тела NaN). Без сетки - обратно-взвешенное по расстоянию среднее
+        отсчетных положений соседей в радиусе ячейки; без соседей берется
+        ближайшая точка.
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 2)
+        reference = np.asarray(reference, dtype=float).reshape(-1, 2)
+
+        if self.triangles is not None:
+            triangle_ids, weights = self.locate(queries)
+            result = np.full((len(queries), 2), np.nan)
+            inside = triangle_ids >= 0
+            vertices = reference[self.triangles[triangle_ids[inside]]]
+            result[inside] = np.einsum('nk,nkd->nd', weights[inside], vertices)
+            return result
+
+        offsets, neighbours = self.query_radius(queries, self.cell_size)
+        query_rep = np.repeat(np.arange(len(queries)), np.diff(offsets))
+        distance = np.sqrt(((self.positions[neighbours] - queries[query_rep]) ** 2).sum(axis=1))
+        weight = 1.0 / np.maximum(distance, 1e-9 * self.cell_size) ** power
+        total = np.bincount(query_rep, weight, minlength=len(queries))
+        result = np.column_stack([
+            np.bincount(query_rep, weight * reference[neighbours, axis], minlength=len(queries))
+            for axis in range(2)
+        ])
+
+        empty = total == 0
+        result[~empty] /= total[~empty, None]
+        if np.any(empty):
+            nearest, _ = self.nearest(queries[empty])
+            result[empty] = reference[nearest]
+        return result
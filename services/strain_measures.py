@@ -0,0 +1,41 @@
+import numpy as np
+
+
+class StrainMeasures:
+    """
+    Кинематические величины по градиенту деформации F.
+
+    Все методы работают с массивами формы (..., 2, 2), например
+    (n_points, n_steps, 2, 2), и возвращают результат той же ведущей формы.
+    """
+
+    @staticmethod
+    def jacobian(F: np.ndarray) -> np.ndarray:
+        """Относительное изменение площади J = det F"""
+        return F[..., 0, 0] * F[..., 1, 1] - F[..., 0, 1] * F[..., 1, 0]
+
+    @staticmethod
+    def right_cauchy_green(F: np.ndarray) -> np.ndarray:
+        """Правый тензор Коши-Грина C = Fᵀ·F"""
+        return np.matmul(np.swapaxes(F, -1, -2), F)
+
+    @staticmethod
+    def left_cauchy_green(F: np.ndarray) -> np.ndarray:
+        """Левый тензор Коши-Грина b = F·Fᵀ"""
+        return np.matmul(F, np.swapaxes(F, -1, -2))
+
+    @staticmethod
+    def green_lagrange(F: np.ndarray) -> np.ndarray:
+        """Тензор деформаций Грина-Лагранжа E = ½(C - I)"""
+        return 0.5 * (StrainMeasures.right_cauchy_green(F) - np.eye(2))
+
+    @staticmethod
+    def almansi(F: np.ndarray) -> np.ndarray:
+        """Тензор деформаций Альманси e = ½(I - b⁻¹)"""
+        return 0.5 * (np.eye(2) - np.linalg.inv(StrainMeasures.left_cauchy_green(F)))
+
+    @staticmethod
+    def principal_stretches(F: np.ndarray) -> np.ndarray:
+        """Главные удлинения λ₁ ≥ λ₂ - корни собственных значений C"""
+        eigenvalues = np.linalg.eigvalsh(StrainMeasures.right_cauchy_green(F))
+        return np.sqrt(np.maximum(eigenvalues, 0.0))[..., ::-1]
@@ -1,95 +1,671 @@
+import json
+import os
+
 import numpy as np
-from models.circle_body import CircleBody
+from models.body import Body
+from models.body_factory import create_body
+from models.scene import Scene
 from services.runge_kutta import RungeKuttaSolver
 from services.butcher_table import ButcherTable
-from services.velocity_field import VelocityField
+from services.velocity_field import VelocityField, BaseVelocityField, create_field
+from services.strain_measures import StrainMeasures
+from services.solver_stats import SolverStats
+from services.spatial_index import SpatialIndex
+from services.trajectory_io import TrajectoryWriter, TrajectoryReader
 
 
 class TrajectoryCalculator:
     """Класс для расчета траекторий движения тела в поле скоростей"""
 
-    def __init__(self, body: CircleBody, t0: float = 0.001, t_end: float = 2.0, dt: float = 0.01):
+    # batch - пакетное интегрирование всех точек, propagator - матрица потока для линейных полей
+    METHODS = ('batch', 'propagator')
+    # Тело спецификации без ключа body: окружность из main.py
+    DEFAULT_BODY_SPEC = {'kind': 'circle', 'center_x': 5.0, 'center_y': -5.0, 'radius': 3.0, 'num_points': 36}
+
+    def __init__(self, body: Body, t0: float = 0.001, t_end: float = 2.0, dt: float = 0.01,
+                 butcher_table: ButcherTable = None, adaptive: bool = False,
+                 rtol: float = 1e-6, atol: float = 1e-9, velocity_field: BaseVelocityField = None,
+                 method: str = 'batch', track_deformation: bool = False, cache=None,
+                 stats: SolverStats = None, output_stride: int = 1, output_times=None,
+                 output_dtype=np.float64):
+        if method not in self.METHODS:
+            raise ValueError(f"Неизвестный метод '{method}'. Доступны: {', '.join(self.METHODS)}")
         self.body = body
+        self.method = method
+        self.track_deformation = track_deformation
+
+        # Необязательный кеш результатов (ResultCache)
+        self.cache = cache
         self.t0 = t0
         self.t_end = t_end
         self.dt = dt
 
+        # Разрешение вывода не зависит от шага интегрирования: сохраняется каждый
+        # output_stride-й шаг или моменты output_times; хранение в output_dtype,
+        # интегрирование всегда в float64
+        if output_stride < 1:
+            raise ValueError("Шаг вывода должен быть не меньше 1")
+        self.output_stride = output_stride
+        self.output_times = None if output_times is None else np.asarray(output_times, dtype=float)
+        self.output_dtype = np.dtype(output_dtype)
+
+        # Адаптивный шаг требует вложенной пары; по умолчанию Дорман-Принс 5(4)
+        self.adaptive = adaptive
+        self.rtol = rtol
+        self.atol = atol
+        if butcher_table is None:
+            butcher_table = ButcherTable.dormand_prince() if adaptive else ButcherTable()
+        if adaptive and not butcher_table.is_embedded():
+            raise ValueError("Для адаптивного шага нужна таблица с вложенным методом")
+
         # Создаем решатель Рунге-Кутты
-        self.butcher_table = ButcherTable()
+        self.butcher_table = butcher_table
         self.rk_solver = RungeKuttaSolver(self.butcher_table)
+        self.stats = stats
 
-        # Функция скорости для метода РК
-        self.velocity_func = VelocityField.get_velocity_function()
+        # Поле скоростей: векторизованная функция правых частей для метода РК
+        self.velocity_field = velocity_field if velocity_field is not None else VelocityField.get_default_field()
+        self.velocity_func = self.velocity_field
+        self.batch_velocity_func = self.velocity_field
 
-    def calculate_trajectories_numerical(self):
-        """Рассчитывает траектории методом Рунге-Кутты"""
-        points = self.body.get_points()
+        # Хранилище траекторий (n_points, n_steps, 2) и узлы времени
+        self.trajectories = np.empty((0, 0, 2))
+        self.t_points = np.empty(0)
+
+        # Матрицы потока Φ(t) формы (n_steps, 2, 2) для режима пропагатора
+        self.flow_matrices = None
+
+        # Градиенты деформации F (n_points, n_steps, 2, 2) при track_deformation
+        self.deformation_gradients = None
 
-        for point in points:
-            # Начальные координаты
-            y0 = np.array([point.x, point.y])
+        # Состояние для продолжения расчета: следующий шаг адаптивного регулятора
+        # и буфер истории с запасом по времени, в который дописывает extend_to
+        self.next_dt = None
+        self._history = None
+        self._history_view = None
 
-            # Очищаем старую траекторию
-            point.trajectory = []
+    @property
+    def stats(self) -> SolverStats:
+        """Необязательная статистика расчета; общая с решателем"""
+        return self.rk_solver.stats
 
-            # Добавляем начальную точку
-            point.add_position_to_trajectory()
+    @stats.setter
+    def stats(self, stats: SolverStats):
+        self.rk_solver.stats = stats
+
+    def _attach_trajectories(self):
+        """Передает хранилище траекторий телу (фаза 'store' в статистике)"""
+        if self.stats is None:
+            self.body.attach_trajectories(self.trajectories)
+            return
+        with self.stats.phase('store'):
+            self.body.attach_trajectories(self.trajectories)
+
+    @classmethod
+    def from_spec(cls, spec: dict):
+        """
+        Создает калькулятор по словарю-спецификации расчета.
+
+        Ключи: body ({'kind': ..., параметры тела}), field ({'name': ...,
+        'params': {...}}), t0, t_end, dt, method, butcher_table (имя таблицы),
+        adaptive, rtol, atol, track_deformation, output_stride, output_times,
+        output_dtype (имя типа, например 'float32'). Отсутствующие ключи берутся
+        по умолчанию; спецификация сериализуема и передается в процессы.
+        """
+        body_spec = dict(spec.get('body', cls.DEFAULT_BODY_SPEC))
+        field_spec = spec.get('field', {'name': 'log_linear'})
+        options = {key: spec[key] for key in ('t0', 't_end', 'dt', 'adaptive', 'rtol', 'atol',
+                                               'method', 'track_deformation', 'output_stride',
+                                               'output_times', 'output_dtype') if key in spec}
+        butcher_table = spec.get('butcher_table')
+        return cls(
+            create_body(body_spec.pop('kind'), **body_spec),
+            butcher_table=ButcherTable.from_name(butcher_table) if butcher_table else None,
+            velocity_field=create_field(field_spec['name'], **field_spec.get('params', {})),
+            **options
+        )
+
+    def calculate_trajectories_numerical(self):
+        """Рассчитывает траектории методом Рунге-Кутты (по одной точке)"""
+        # Начальные координаты всех точек: (n_points, 2)
+        y0 = self.body.get_coordinates()
+        if len(y0) == 0:
+            return
 
+        n_steps = RungeKuttaSolver.get_num_steps(self.t0, self.t_end, self.dt)
+        self.trajectories = np.empty((len(y0), n_steps, 2))
+        self.deformation_gradients = None
+
+        for index, point_y0 in enumerate(y0):
             # Решаем систему ОДУ методом Рунге-Кутты
-            t_points, y_points = self.rk_solver.solve(
+            t_points, self.trajectories[index] = self.rk_solver.solve(
                 self.velocity_func,  # функция правых частей: [vx, vy]
-                y0,  # начальные условия: [x0, y0]
+                point_y0,  # начальные условия: [x0, y0]
                 self.t0,  # начальное время
                 self.t_end,  # конечное время
                 self.dt  # шаг интегрирования
             )
+            self.t_points = t_points
+
+        self._attach_trajectories()
+
+    def _deformation_rhs(self):
+        """
+        Правая часть расширенной системы для состояния [x, y, F11, F12, F21, F22].
+
+        Вместе с положениями интегрируются уравнения в вариациях dF/dt = ∇v·F.
+        """
+        field = self.velocity_field
+
+        def deformation_rhs(t, state, out=None):
+            if out is None:
+                out = np.empty_like(state)
+            positions = state[..., :2]
+            F = state[..., 2:].reshape(state.shape[:-1] + (2, 2))
+            field.evaluate(t, positions, out=out[..., :2])
+            np.matmul(field.get_gradient(t, positions), F, out=out[..., 2:].reshape(F.shape))
+            return out
+
+        deformation_rhs.supports_out = True
+        return deformation_rhs
+
+    def get_num_steps(self) -> int:
+        """Число узлов сетки времени при постоянном шаге"""
+        if self.adaptive:
+            raise ValueError("При адаптивном шаге число узлов заранее неизвестно")
+        return RungeKuttaSolver.get_num_steps(self.t0, self.t_end, self.dt)
+
+    def has_full_output(self) -> bool:
+        """Сохраняется каждый шаг в float64 (вывод совпадает с сеткой интегрирования)"""
+        return self.output_stride == 1 and self.output_times is None and self.output_dtype == np.float64
+
+    def _output_options(self) -> dict:
+        return {'stride': self.output_stride, 't_eval': self.output_times, 'dtype': self.output_dtype}
+
+    def get_num_outputs(self) -> int:
+        """Число сохраняемых моментов при постоянном шаге"""
+        if self.output_times is not None:
+            return len(self.output_times)
+        return len(RungeKuttaSolver.get_output_indices(self.get_num_steps(), self.output_stride))
+
+    @staticmethod
+    def _allocate_states(shape: tuple, out: np.ndarray = None, dtype=np.float64) -> np.ndarray:
+        """Хранилище состояний заданной формы: новый массив или переданный буфер out"""
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+        if out.shape != shape:
+            raise ValueError(f"Ожидался буфер формы {shape}, получен {out.shape}")
+        return out
+
+    def calculate_trajectories_batch(self, out: np.ndarray = None):
+        """
+        Рассчитывает траектории всех точек за один проход метода Рунге-Кутты.
+
+        out - необязательный буфер (n_points, n_steps, dim) для результата,
+        например массив в разделяемой памяти.
+        """
+        # Начальные координаты всех точек: (n_points, 2)
+        y0 = self.body.get_coordinates()
+        if len(y0) == 0:
+            return
+        rhs = self.batch_velocity_func
+        if self.track_deformation:
+            # Расширенное состояние: положения и F(t0) = I
+            y0 = np.hstack([y0, np.tile(np.eye(2).ravel(), (len(y0), 1))])
+            rhs = self._deformation_rhs()
+
+        if self.adaptive:
+            t_points, y_points = self.rk_solver.solve_adaptive(
+                rhs,
+                y0,
+                self.t0,
+                self.t_end,
+                rtol=self.rtol,
+                atol=self.atol,
+                **self._output_options()
+            )
+            # Число шагов заранее неизвестно: одна перекладка в хранилище
+            states = self._allocate_states((len(y0), len(t_points), y0.shape[1]), out, self.output_dtype)
+            states[...] = y_points.transpose(1, 0, 2)
+        elif not self.has_full_output():
+            # Сохраняются только моменты вывода; решатель пишет в хранилище напрямую
+            states = self._allocate_states((len(y0), self.get_num_outputs(), y0.shape[1]), out,
+                                           self.output_dtype)
+            t_points, _ = self.rk_solver.solve_output(rhs, y0, self.t0, self.t_end, self.dt,
+                                                      out=states.transpose(1, 0, 2), **self._output_options())
+        else:
+            # Хранилище (n_points, n_steps, dim); решатель пишет в него напрямую
+            states = self._allocate_states((len(y0), self.get_num_steps(), y0.shape[1]), out)
+            t_points, _ = self.rk_solver.solve_batch(
+                rhs,
+                y0,
+                self.t0,
+                self.t_end,
+                self.dt,
+                out=states.transpose(1, 0, 2)
+            )
+        self.t_points = t_points
+        self.next_dt = self.rk_solver.last_dt if self.adaptive else self.dt
+
+        if self.track_deformation:
+            # Положения и F - представления одного расширенного хранилища
+            self.trajectories = states[..., :2]
+            self.deformation_gradients = states[..., 2:].reshape(states.shape[:2] + (2, 2))
+        else:
+            self.trajectories = states
+            self.deformation_gradients = None
+        self._attach_trajectories()
+
+    def _solve_flow_matrix(self, t_start: float = None, t_stop: float = None, phi0: np.ndarray = None,
+                           output: bool = False):
+        """
+        Интегрирует матричное уравнение dΦ/dt = A(t)·Φ, Φ(t0) = I.
+
+        Возвращает узлы времени и матрицы потока формы (n_steps, 2, 2);
+        при output - только в моменты вывода (матрицы всегда в float64).
+        """
+        field = self.velocity_field
+
+        def matrix_rhs(t, phi):
+            return field.get_matrix(t) @ phi
+
+        t_start = self.t0 if t_start is None else t_start
+        t_stop = self.t_end if t_stop is None else t_stop
+        phi0 = np.eye(2) if phi0 is None else phi0
+        return self._solve_segment(matrix_rhs, phi0, t_start, t_stop, output=output)
+
+    def _solve_segment(self, rhs, y0: np.ndarray, t_start: float, t_stop: float, out: np.ndarray = None,
+                       output: bool = False):
+        """
+        Интегрирует отрезок [t_start, t_stop] текущим методом (постоянный или адаптивный шаг).
+
+        output - сохранять только моменты вывода (output_stride, output_times) в float64.
+        """
+        options = {'stride': self.output_stride, 't_eval': self.output_times} if output else {}
+        if self.adaptive:
+            return self.rk_solver.solve_adaptive(rhs, y0, t_start, t_stop, rtol=self.rtol, atol=self.atol,
+                                                 dt0=self.next_dt if t_start != self.t0 else None, **options)
+        if output and not self.has_full_output():
+            return self.rk_solver.solve_output(rhs, y0, t_start, t_stop, self.dt, out=out, **options)
+        return self.rk_solver.solve_batch(rhs, y0, t_start, t_stop, self.dt, out=out)
+
+    def calculate_trajectories_propagator(self, out: np.ndarray = None):
+        """
+        Рассчитывает траектории линейного поля v = A(t)·x через матрицу потока.
+
+        Матрица Φ(t) не зависит от точки, поэтому интегрируется один раз,
+        а положения всех точек во все моменты получаются одним матричным
+        умножением x(t) = Φ(t)·x(t0).
+        """
+        if not self.velocity_field.linear:
+            raise ValueError(f"Режим пропагатора требует линейного поля, получено {self.velocity_field!r}")
+
+        y0 = self.body.get_coordinates()
+        if len(y0) == 0:
+            return
+
+        t_points, flow_matrices = self._solve_flow_matrix(output=True)
+        self.t_points = t_points
+        self.next_dt = self.rk_solver.last_dt if self.adaptive else self.dt
+        self.flow_matrices = flow_matrices
+
+        # positions[s, n] = Φ[s] · y0[n]; запись сразу в хранилище (n_points, n_steps, 2)
+        self.trajectories = self._allocate_states((len(y0), len(t_points), 2), out, self.output_dtype)
+        np.matmul(y0, flow_matrices.transpose(0, 2, 1), out=self.trajectories.transpose(1, 0, 2))
+
+        # Для линейного поля F(t) = Φ(t) одинаков для всех точек
+        self.deformation_gradients = None
+        if self.track_deformation:
+            self.deformation_gradients = np.broadcast_to(flow_matrices, (len(y0),) + flow_matrices.shape)
+        self._attach_trajectories()
 
-            # Записываем траекторию (пропускаем первую точку, т.к. она уже добавлена)
-            for i in range(1, len(t_points)):
-                point.x = y_points[i, 0]
-                point.y = y_points[i, 1]
-                point.add_position_to_trajectory()
+    def calculate_trajectories_streaming(self, path: str, chunk_size: int = 100, stride: int = None):
+        """
+        Рассчитывает траектории с потоковой записью на диск.
+
+        Решатель выдает состояния порциями по chunk_size сохраненных шагов
+        (каждый stride-й шаг, по умолчанию output_stride, либо моменты
+        output_times) в типе output_dtype, порции дописываются в каталог path. После
+        расчета траектории доступны через memory-mapped представления, вся
+        история в памяти не хранится.
+        """
+        if self.adaptive or self.track_deformation:
+            raise ValueError("Потоковый режим поддерживает только положения с постоянным шагом")
+
+        y0 = self.body.get_coordinates()
+        stride = self.output_stride if stride is None else stride
+        if self.output_times is not None:
+            n_outputs = len(self.output_times)
+        else:
+            n_outputs = len(RungeKuttaSolver.get_output_indices(self.get_num_steps(), stride))
+        meta = {'t0': self.t0, 't_end': self.t_end, 'dt': self.dt, 'stride': stride,
+                'method': self.butcher_table.name}
+
+        with TrajectoryWriter(path, len(y0), n_outputs, dtype=self.output_dtype, meta=meta) as writer:
+            for t_chunk, y_chunk in self.rk_solver.iter_solve(self.batch_velocity_func, y0, self.t0,
+                                                              self.t_end, self.dt, chunk_size, stride,
+                                                              self.output_times, self.output_dtype):
+                writer.append(t_chunk, y_chunk)
+
+        reader = TrajectoryReader(path)
+        self.t_points = np.asarray(reader.times)
+        self.trajectories = reader.get_trajectory_array()
+        self.deformation_gradients = None
+        if len(y0):
+            self._attach_trajectories()
+        return reader
+
+    def _get_state_history(self) -> np.ndarray:
+        """История полного состояния (n_points, n_steps, dim): положения и, при наличии, F"""
+        if self.deformation_gradients is None or self.method == 'propagator':
+            return self.trajectories
+        n_points, n_steps = self.trajectories.shape[:2]
+        return np.concatenate([self.trajectories,
+                               self.deformation_gradients.reshape(n_points, n_steps, 4)], axis=2)
+
+    def _reserve_history(self, extra_steps: int) -> np.ndarray:
+        """
+        Буфер истории с местом для extra_steps новых шагов.
+
+        Буфер растет с удвоением емкости, поэтому серия продолжений копирует
+        прошлую историю за амортизированно постоянное время на шаг.
+        """
+        n_steps = len(self.t_points)
+        needed = n_steps + extra_steps
+        if self._history is None or self._history_view is not self.trajectories \
+                or self._history.shape[1] < needed:
+            history = self._get_state_history()
+            capacity = max(needed, 2 * n_steps)
+            buffer = np.empty((history.shape[0], capacity, history.shape[2]))
+            buffer[:, :n_steps] = history
+            self._history = buffer
+        return self._history
+
+    def _publish_history(self, n_steps: int):
+        """Делает траектории и F представлениями первых n_steps шагов буфера истории"""
+        states = self._history[:, :n_steps]
+        if self.method == 'propagator':
+            self.trajectories = states
+            if self.track_deformation:
+                self.deformation_gradients = np.broadcast_to(
+                    self.flow_matrices, (len(states),) + self.flow_matrices.shape
+                )
+        elif self.track_deformation:
+            self.trajectories = states[..., :2]
+            self.deformation_gradients = states[..., 2:].reshape(states.shape[:2] + (2, 2))
+        else:
+            self.trajectories = states
+        self._history_view = self.trajectories
+        self._attach_trajectories()
+
+    def extend_to(self, t_new: float, checkpoint_path: str = None, checkpoint_interval: float = None):
+        """
+        Продолжает расчет от последнего сохраненного состояния до t_new.
+
+        Прошлая история не пересчитывается: новые шаги дописываются в конец.
+        При заданных checkpoint_path и checkpoint_interval расчет идет
+        отрезками длиной checkpoint_interval с сохранением контрольной точки
+        после каждого, так что прерванный расчет можно восстановить. При
+        постоянном шаге границы отрезков округляются до узлов t0 + k·dt.
+        """
+        if len(self.t_points) == 0:
+            raise RuntimeError("Нет рассчитанной истории: сначала вызовите calculate_trajectories")
+        if t_new <= self.t_points[-1]:
+            raise ValueError(f"t_new={t_new} должно быть больше последнего момента {self.t_points[-1]}")
+        if not self.has_full_output():
+            # Продолжение стартует с последнего сохраненного состояния: нужен каждый шаг в float64
+            raise ValueError("Продолжение расчета требует вывода каждого шага в float64")
+
+        targets = [t_new]
+        if checkpoint_path is not None and checkpoint_interval:
+            t_last = self.t_points[-1]
+            boundaries = np.arange(t_last + checkpoint_interval, t_new, checkpoint_interval)
+            if not self.adaptive:
+                # Границы отрезков - узлы сетки t0 + k·dt: иначе отрезок, не кратный dt,
+                # заканчивается растянутым шагом и сетка расходится с расчетом за один проход
+                boundaries = self.t0 + self.dt * np.unique(np.round((boundaries - self.t0) / self.dt))
+                boundaries = boundaries[(boundaries > t_last + self.dt / 2) & (boundaries < t_new - self.dt / 2)]
+            targets = list(boundaries) + [t_new]
+
+        for target in targets:
+            self._extend_segment(target)
+            if checkpoint_path is not None:
+                self.save_checkpoint(checkpoint_path)
+
+    def _extend_segment(self, t_new: float):
+        t_last = self.t_points[-1]
+        n_steps = len(self.t_points)
+
+        if self.method == 'propagator':
+            t_ext, phi_ext = self._solve_flow_matrix(t_last, t_new, self.flow_matrices[-1])
+            extra = len(t_ext) - 1
+            history = self._reserve_history(extra)
+            y0 = self.body.get_coordinates()
+            np.matmul(y0, phi_ext[1:].transpose(0, 2, 1),
+                      out=history[:, n_steps:n_steps + extra].transpose(1, 0, 2))
+            self.flow_matrices = np.concatenate([self.flow_matrices, phi_ext[1:]])
+        else:
+            state = self._get_state_history()[:, -1].copy()
+            rhs = self._deformation_rhs() if self.track_deformation else self.batch_velocity_func
+            if self.adaptive:
+                t_ext, y_ext = self._solve_segment(rhs, state, t_last, t_new)
+                extra = len(t_ext) - 1
+                history = self._reserve_history(extra)
+                history[:, n_steps:n_steps + extra] = y_ext[1:].transpose(1, 0, 2)
+            else:
+                extra = RungeKuttaSolver.get_num_steps(t_last, t_new, self.dt) - 1
+                history = self._reserve_history(extra)
+                # Решатель пишет прямо в буфер истории, начиная с последнего известного шага
+                t_ext, _ = self._solve_segment(rhs, state, t_last, t_new,
+                                               out=history[:, n_steps - 1:n_steps + extra].transpose(1, 0, 2))
+
+        if self.adaptive:
+            self.next_dt = self.rk_solver.last_dt
+        self.t_points = np.concatenate([self.t_points, t_ext[1:]])
+        self.t_end = t_new
+        self._publish_history(len(self.t_points))
+
+    def save_checkpoint(self, path: str):
+        """
+        Сохраняет полное состояние расчета в файл .npz (атомарно).
+
+        В файл входят узлы времени, история положений (и F), матрицы потока,
+        текущий шаг и состояние адаптивного регулятора.
+        """
+        if len(self.t_points) == 0:
+            raise RuntimeError("Нет рассчитанной истории для сохранения")
+        arrays = {
+            't_points': self.t_points,
+            'states': self._get_state_history(),
+            'config': np.array(json.dumps(self._checkpoint_config())),
+            'next_dt': np.array(np.nan if self.next_dt is None else self.next_dt),
+        }
+        if self.flow_matrices is not None:
+            arrays['flow_matrices'] = self.flow_matrices
+
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, path)
+
+    def _checkpoint_config(self) -> dict:
+        """
+        Конфигурация, для которой годится контрольная точка: хеш make_cache_key
+        (тело, поле и его параметры, коэффициенты таблицы, допуски, режим) без
+        t_end и, для сообщения об ошибке, основные поля. Поле с параметрами,
+        которые нельзя хешировать, сравнивается только по основным полям.
+        """
+        from services.result_cache import UncacheableError, make_cache_key
 
-    def calculate_trajectories(self):
-        """Рассчитывает траектории (используем численный метод Рунге-Кутты)"""
-        self.calculate_trajectories_numerical()
+        try:
+            key = make_cache_key(self, include_t_end=False)
+        except UncacheableError:
+            key = None
+        return {'key': key, 't0': self.t0, 'dt': self.dt, 'adaptive': self.adaptive, 'method': self.method,
+                'track_deformation': self.track_deformation, 'table': self.butcher_table.name,
+                'n_points': int(len(self.body.get_coordinates())), 'output_stride': self.output_stride,
+                'output_times': None if self.output_times is None else self.output_times.tolist(),
+                'output_dtype': str(self.output_dtype)}
+
+    def restore_checkpoint(self, path: str):
+        """Восстанавливает состояние из контрольной точки; конфигурация калькулятора должна совпадать"""
+        with np.load(path) as data:
+            config = json.loads(str(data['config']))
+            expected = self._checkpoint_config()
+            if config != expected:
+                raise ValueError(f"Контрольная точка создана для другой конфигурации: {config} != {expected}")
+            self.t_points = data['t_points']
+            states = data['states']
+            self.flow_matrices = data['flow_matrices'] if 'flow_matrices' in data else None
+            next_dt = float(data['next_dt'])
+        self.next_dt = None if np.isnan(next_dt) else next_dt
+        self.t_end = float(self.t_points[-1])
+        self._history = np.ascontiguousarray(states)
+        self.trajectories = None
+        self._publish_history(len(self.t_points))
+
+    def calculate_trajectories(self, out: np.ndarray = None):
+        """
+        Рассчитывает траектории выбранным методом (по умолчанию пакетный метод Рунге-Кутты).
+
+        Если задан кеш, результат неизменной конфигурации загружается с диска.
+        """
+        if self.stats is not None:
+            with self.stats.phase('calculate'):
+                self._calculate_trajectories(out)
+        else:
+            self._calculate_trajectories(out)
+
+    def _calculate_trajectories(self, out: np.ndarray = None):
+        if self.cache is not None and out is None:
+            self.cache.calculate(self)
+        else:
+            self.compute_trajectories(out)
+
+    def compute_trajectories(self, out: np.ndarray = None):
+        """Выполняет расчет выбранным методом без обращения к кешу"""
+        if self.method == 'propagator':
+            self.calculate_trajectories_propagator(out)
+        else:
+            self.calculate_trajectories_batch(out)
+
+    def get_trajectory_array(self):
+        """Возвращает хранилище траекторий формы (n_points, n_steps, 2)"""
+        return self.trajectories
 
     def get_body_trajectories(self):
-        """Возвращает траектории всех точек тела"""
-        trajectories = []
-        for point in self.body.get_points():
-            x_coords = [p.x for p in point.trajectory]
-            y_coords = [p.y for p in point.trajectory]
-            trajectories.append((x_coords, y_coords))
-        return trajectories
+        """Возвращает траектории всех точек тела (представления хранилища без копирования)"""
+        return [(trajectory[:, 0], trajectory[:, 1]) for trajectory in self.trajectories]
+
+    def get_deformation_gradients(self) -> np.ndarray:
+        """Градиенты деформации F формы (n_points, n_steps, 2, 2)"""
+        if self.deformation_gradients is None:
+            raise RuntimeError("Градиенты деформации не рассчитаны: нужен track_deformation=True")
+        return self.deformation_gradients
+
+    def get_jacobians(self) -> np.ndarray:
+        """J = det F формы (n_points, n_steps)"""
+        return StrainMeasures.jacobian(self.get_deformation_gradients())
+
+    def get_green_lagrange_strains(self) -> np.ndarray:
+        """Тензоры Грина-Лагранжа формы (n_points, n_steps, 2, 2)"""
+        return StrainMeasures.green_lagrange(self.get_deformation_gradients())
+
+    def get_almansi_strains(self) -> np.ndarray:
+        """Тензоры Альманси формы (n_points, n_steps, 2, 2)"""
+        return StrainMeasures.almansi(self.get_deformation_gradients())
+
+    def get_principal_stretches(self) -> np.ndarray:
+        """Главные удлинения λ₁ ≥ λ₂ формы (n_points, n_steps, 2)"""
+        return StrainMeasures.principal_stretches(self.get_deformation_gradients())
 
     def get_initial_circle(self):
-        """Возвращает координаты начальной окружности"""
-        return self.body.get_circle_coordinates()
+        """Возвращает координаты начальной формы (контура) тела"""
+        return self.body.get_outline()
+
+    def _integrate_positions(self, y: np.ndarray, t_start: float, t: float) -> np.ndarray:
+        """Положения в момент t интегрированием от состояния y в момент t_start текущим методом"""
+        y = np.array(y, dtype=float)
+        if t == t_start:
+            return y
+        if self.adaptive:
+            _, y_points = self.rk_solver.solve_adaptive(self.batch_velocity_func, y, t_start, t, rtol=self.rtol,
+                                                        atol=self.atol, t_eval=[t])
+            return y_points[-1]
+        # Целое число шагов не длиннее dt, даже если отрезок короче одного шага
+        n_steps = max(1, int(np.ceil(abs(t - t_start) / self.dt - 1e-9)))
+        h = (t - t_start) / n_steps
+        k = np.empty((self.rk_solver.stages,) + y.shape)
+        for step in range(n_steps):
+            self.rk_solver.step(self.batch_velocity_func, t_start + step * h, y, h, out=y, k=k)
+        return y
+
+    def get_positions_at_time(self, t: float) -> np.ndarray:
+        """
+        Возвращает положения всех точек в момент t массивом (n_points, 2).
+
+        Если сохранен каждый шаг интегрирования и t лежит внутри рассчитанной
+        истории, узел находится бинарным поиском, а положение - кубической
+        интерполяцией Эрмита по сохраненным положениям и скоростям в соседних
+        узлах (плотный вывод 3-го порядка). При разреженном выводе
+        (output_stride, output_times) узлы слишком далеки для интерполяции:
+        выполняется интегрирование от ближайшего предшествующего узла (от t0,
+        если хранение в пониженной точности). Вне истории - интегрирование от t0.
+        """
+        t_points = self.t_points
+        if len(t_points) == 0 or not (t_points[0] <= t <= t_points[-1]):
+            return self._integrate_positions(self.body.get_coordinates(), self.t0, t)
+
+        i = int(np.searchsorted(t_points, t, side='right')) - 1
+        if i >= len(t_points) - 1 or t == t_points[i]:
+            return self.trajectories[:, min(i, len(t_points) - 1)].astype(float)
+
+        if not self.has_full_output():
+            if self.output_dtype != np.float64:
+                return self._integrate_positions(self.body.get_coordinates(), self.t0, t)
+            return self._integrate_positions(self.trajectories[:, i], t_points[i], t)
+
+        t_left, t_right = t_points[i], t_points[i + 1]
+        # Хранилище может быть в пониженной точности; интерполяция - в float64
+        y_left = self.trajectories[:, i].astype(float)
+        y_right = self.trajectories[:, i + 1].astype(float)
+        h = t_right - t_left
+        s = (t - t_left) / h
+
+        # Базисные функции Эрмита
+        h00 = 2 * s ** 3 - 3 * s ** 2 + 1
+        h10 = s ** 3 - 2 * s ** 2 + s
+        h01 = -2 * s ** 3 + 3 * s ** 2
+        h11 = s ** 3 - s ** 2
+
+        v_left = self.batch_velocity_func(t_left, y_left)
+        v_right = self.batch_velocity_func(t_right, y_right)
+
+        return h00 * y_left + (h10 * h) * v_left + h01 * y_right + (h11 * h) * v_right
 
     def get_form_at_time(self, t):
         """
-        Возвращает форму окружности в момент времени t
+        Возвращает форму тела в момент времени t (массивы x и y)
         """
-        points = self.body.get_points()
-        result_x = []
-        result_y = []
+        positions = self.get_positions_at_time(t)
+        return positions[:, 0], positions[:, 1]
 
-        for point in points:
-            # Начальные координаты
-            y0 = np.array([point.trajectory[0].x, point.trajectory[0].y])
+    def get_spatial_index(self, t: float = None, cell_size: float = None) -> SpatialIndex:
+        """
+        Пространственный индекс положений точек в момент t (по умолчанию - последний рассчитанный).
 
-            # Решаем до времени t
-            t_points, y_points = self.rk_solver.solve(
-                self.velocity_func,
-                y0,
-                self.t0,
-                t,  # только до времени t
-                self.dt
-            )
+        Для тел с треугольной сеткой (MeshBody) индекс поддерживает проверку
+        принадлежности телу и барицентрическое обратное отображение. Индекс
+        строится заново при каждом вызове: для серии запросов его сохраняют.
+        """
+        positions = self.trajectories[:, -1] if t is None else self.get_positions_at_time(t)
+        return SpatialIndex(positions, cell_size, getattr(self.body, 'triangles', None))
 
-            # Берем последнюю точку
-            result_x.append(y_points[-1, 0])
-            result_y.append(y_points[-1, 1])
+    def get_reference_positions(self, points: np.ndarray, t: float = None) -> np.ndarray:
+        """Отсчетные положения для пространственных точек points (n, 2) в момент t"""
+        return self.get_spatial_index(t).inverse_map(points, self.body.get_coordinates())
 
-        return result_x, result_y
+    def get_positions_by_body(self, t: float) -> list:
+        """Положения в момент t по телам: для сцены - список массивов (n_i, 2), иначе список из одного"""
+        positions = self.get_positions_at_time(t)
+        return self.body.split(positions) if isinstance(self.body, Scene) else [positions]
@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+
+
+class TrajectoryWriter:
+    """
+    Потоковая запись траекторий на диск.
+
+    Каталог path содержит positions.npy формы (n_outputs, n_points, dim)
+    (порядок по времени, чтобы порции дописывались последовательно),
+    times.npy и meta.json. Файлы открываются как memmap, так что в памяти
+    держится только текущая порция.
+    """
+
+    def __init__(self, path: str, n_points: int, n_outputs: int, dim: int = 2,
+                 dtype=np.float64, meta: dict = None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.n_outputs = n_outputs
+        self.positions = np.lib.format.open_memmap(
+            os.path.join(path, 'positions.npy'), mode='w+', dtype=dtype, shape=(n_outputs, n_points, dim)
+        )
+        self.times = np.lib.format.open_memmap(
+            os.path.join(path, 'times.npy'), mode='w+', dtype=np.float64, shape=(n_outputs,)
+        )
+        self.written = 0
+        self.meta = dict(meta or {})
+
+    def append(self, times: np.ndarray, states: np.ndarray):
+        """Дописывает порцию: times (k,), states (k, n_points, dim)"""
+        count = len(times)
+        if self.written + count > self.n_outputs:
+            raise ValueError("Порция выходит за пределы заранее выделенного файла")
+        self.positions[self.written:self.written + count] = states
+        self.times[self.written:self.written + count] = times
+        self.written += count
+
+    def close(self):
+        """Сбрасывает данные на диск и записывает метаданные"""
+        if self.positions is None:
+            return
+        self.positions.flush()
+        self.times.flush()
+        self.meta.update({'n_outputs': self.written, 'shape': list(self.positions.shape),
+                          'dtype': str(self.positions.dtype), 'layout': 'time_major'})
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(self.meta, file, indent=2, ensure_ascii=False)
+        self.positions = None
+        self.times = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class TrajectoryReader:
+    """Чтение траекторий, записанных TrajectoryWriter, через memory-mapped представления"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as file:
+            self.meta = json.load(file)
+        n_outputs = self.meta['n_outputs']
+        self.positions = np.load(os.path.join(path, 'positions.npy'), mmap_mode='r')[:n_outputs]
+        self.times = np.load(os.path.join(path, 'times.npy'), mmap_mode='r')[:n_outputs]
+
+    def get_trajectory_array(self) -> np.ndarray:
+        """Траектории формы (n_points, n_steps, dim) - транспонированное представление без копирования"""
+        return self.positions.transpose(1, 0, 2)
+
+    def get_time_slice(self, start: int, stop: int) -> np.ndarray:
+        """Положения всех точек на шагах [start, stop) - последовательное чтение с диска"""
+        return self.positions[start:stop]
@@ -1,9 +1,302 @@
 import numpy as np
+from abc import ABC, abstractmethod
 from typing import Callable
 
 
+# Реестр полей скоростей: имя -> класс
+_FIELD_REGISTRY = {}
+
+
+def register_field(name: str):
+    """
+    Декоратор регистрации класса поля скоростей под именем name.
+
+    Позволяет подключать собственные поля без изменения этого модуля:
+
+        @register_field('vortex')
+        class VortexField(BaseVelocityField):
+            ...
+    """
+
+    def decorator(cls):
+        if name in _FIELD_REGISTRY and _FIELD_REGISTRY[name] is not cls:
+            raise ValueError(f"Поле '{name}' уже зарегистрировано")
+        cls.name = name
+        _FIELD_REGISTRY[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_field_class(name: str) -> type:
+    """Класс зарегистрированного поля скоростей по имени"""
+    if name not in _FIELD_REGISTRY:
+        raise KeyError(f"Неизвестное поле '{name}'. Доступны: {', '.join(sorted(_FIELD_REGISTRY))}")
+    return _FIELD_REGISTRY[name]
+
+
+def create_field(name: str, **params):
+    """Создает зарегистрированное поле скоростей по имени"""
+    return get_field_class(name)(**params)
+
+
+def available_fields():
+    """Возвращает имена зарегистрированных полей"""
+    return sorted(_FIELD_REGISTRY)
+
+
+class BaseVelocityField(ABC):
+    """
+    Абстрактное поле скоростей v(t, X).
+
+    evaluate принимает массив координат произвольной формы X[..., 2] и
+    возвращает скорости той же формы за один векторизованный вызов.
+    Если передан out, результат записывается в него без выделения памяти.
+    """
+
+    name = None
+
+    # Решатель может передавать буфер стадии через out
+    supports_out = True
+
+    # Линейные поля v = A(t)·x реализуют get_matrix и допускают расчет через пропагатор
+    linear = False
+
+    # Параметры поля исполняются как код (выражения, функции): такие поля
+    # нельзя принимать из недоверенных спецификаций (служба расчетов)
+    executes_code = False
+
+    @abstractmethod
+    def evaluate(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        pass
+
+    def __call__(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        return self.evaluate(t, positions, out)
+
+    def get_velocity(self, t: float, x, y) -> tuple:
+        """Компоненты скорости для скаляров или массивов x, y"""
+        velocity = self.evaluate(t, np.stack(np.broadcast_arrays(x, y), axis=-1))
+        return velocity[..., 0], velocity[..., 1]
+
+    def get_matrix(self, t: float) -> np.ndarray:
+        """Матрица A(t) линейного поля v = A(t)·x"""
+        raise NotImplementedError(f"Поле {type(self).__name__} не является линейным")
+
+    def exact_solution(self, t0: float, positions: np.ndarray, t: float) -> np.ndarray:
+        """Точные положения в момент t точек, находившихся в positions в момент t0"""
+        raise NotImplementedError(f"Для поля {type(self).__name__} точное решение неизвестно")
+
+    def get_gradient(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Градиент скорости L[..., i, j] = ∂v_i/∂x_j формы X.shape[:-1] + (2, 2).
+
+        Для линейных полей это A(t); в общем случае используются центральные
+        разности, наследники могут переопределить метод аналитическим градиентом.
+        """
+        positions = np.asarray(positions, dtype=float)
+        if out is None:
+            out = np.empty(positions.shape[:-1] + (2, 2))
+
+        if self.linear:
+            out[...] = self.get_matrix(t)
+            return out
+
+        step = 1e-6 * np.maximum(1.0, np.abs(positions))
+        shifted = positions.copy()
+        for j in range(2):
+            shifted[..., j] = positions[..., j] + step[..., j]
+            forward = self.evaluate(t, shifted)
+            shifted[..., j] = positions[..., j] - step[..., j]
+            backward = self.evaluate(t, shifted)
+            shifted[..., j] = positions[..., j]
+            out[..., :, j] = (forward - backward) / (2 * step[..., j, None])
+        return out
+
+    def get_parameters(self) -> dict:
+        """Параметры поля (для описания и воспроизведения расчета)"""
+        return {}
+
+    @staticmethod
+    def _prepare_output(positions: np.ndarray, out: np.ndarray) -> tuple:
+        positions = np.asarray(positions, dtype=float)
+        if out is None:
+            out = np.empty_like(positions)
+        return positions, out
+
+    def __repr__(self):
+        params = ', '.join(f"{key}={value!r}" for key, value in self.get_parameters().items())
+        return f"{type(self).__name__}({params})"
+
+
+@register_field('log_linear')
+class LogLinearField(BaseVelocityField):
+    """Поле из задания: v₁ = -ln(t)·x₁, v₂ = t·x₂"""
+
+    linear = True
+
+    def get_matrix(self, t: float) -> np.ndarray:
+        if t <= 0:
+            return np.zeros((2, 2))
+        return np.diag([-np.log(t), t])
+
+    def evaluate(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        positions, out = self._prepare_output(positions, out)
+
+        # Обработка особых случаев
+        if t <= 0:
+            out.fill(0.0)
+            return out
+
+        np.multiply(positions[..., 0], -np.log(t), out=out[..., 0])
+        np.multiply(positions[..., 1], t, out=out[..., 1])
+        return out
+
+    @staticmethod
+    def _primitives(t: float) -> np.ndarray:
+        """Первообразные коэффициентов от 0: ∫-ln(s)ds = t - t·ln(t), ∫s ds = t²/2 (при t ≤ 0 поле нулевое)"""
+        if t <= 0:
+            return np.zeros(2)
+        return np.array([t - t * np.log(t), t * t / 2])
+
+    def exact_solution(self, t0: float, positions: np.ndarray, t: float) -> np.ndarray:
+        """x₁(t) = x₁(t0)·exp(∫-ln(s)ds), x₂(t) = x₂(t0)·exp(∫s ds) по отрезку [t0, t]"""
+        scale = np.exp(self._primitives(t) - self._primitives(t0))
+        return np.asarray(positions, dtype=float) * scale
+
+
+@register_field('linear')
+class LinearField(BaseVelocityField):
+    """Линейное поле v = A(t)·x; matrix - постоянная матрица 2×2 или функция t -> 2×2"""
+
+    linear = True
+
+    def __init__(self, matrix):
+        self.matrix = matrix if callable(matrix) else np.asarray(matrix, dtype=float)
+        if not callable(self.matrix) and self.matrix.shape != (2, 2):
+            raise ValueError("Матрица линейного поля должна иметь форму (2, 2)")
+
+    def get_matrix(self, t: float) -> np.ndarray:
+        """Матрица A(t)"""
+        if callable(self.matrix):
+            return np.asarray(self.matrix(t), dtype=float)
+        return self.matrix
+
+    def evaluate(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        positions, out = self._prepare_output(positions, out)
+        np.matmul(positions, self.get_matrix(t).T, out=out)
+        return out
+
+    def get_parameters(self) -> dict:
+        return {'matrix': self.matrix if callable(self.matrix) else self.matrix.tolist()}
+
+
+@register_field('expression')
+class ExpressionField(BaseVelocityField):
+    """
+    Поле, заданное выражениями для компонент скорости.
+
+    vx, vy - функции (t, x, y), работающие с массивами numpy, или строки
+    вида '-log(t) * x' с переменными t, x, y и функциями numpy.
+    """
+
+    executes_code = True
+
+    _namespace = {name: getattr(np, name) for name in (
+        'sin', 'cos', 'tan', 'exp', 'log', 'sqrt', 'abs', 'arctan2', 'sinh', 'cosh', 'tanh',
+        'pi', 'e', 'where', 'minimum', 'maximum'
+    )}
+
+    def __init__(self, vx, vy):
+        self.vx = vx
+        self.vy = vy
+        self._vx = self._compile(vx)
+        self._vy = self._compile(vy)
+
+    def _compile(self, expression) -> Callable:
+        if callable(expression):
+            return expression
+        code = compile(str(expression), '<velocity expression>', 'eval')
+        namespace = {'__builtins__': {}, **self._namespace}
+
+        def component(t, x, y):
+            return eval(code, namespace, {'t': t, 'x': x, 'y': y})
+
+        return component
+
+    def evaluate(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        positions, out = self._prepare_output(positions, out)
+        x = positions[..., 0]
+        y = positions[..., 1]
+        out[..., 0] = self._vx(t, x, y)
+        out[..., 1] = self._vy(t, x, y)
+        return out
+
+    def get_parameters(self) -> dict:
+        return {'vx': self.vx, 'vy': self.vy}
+
+    def __getstate__(self):
+        # Скомпилированные замыкания не сериализуются: пересоздаются при загрузке
+        return {'vx': self.vx, 'vy': self.vy}
+
+    def __setstate__(self, state):
+        self.__init__(state['vx'], state['vy'])
+
+
+@register_field('tabulated')
+class TabulatedField(BaseVelocityField):
+    """
+    Поле, заданное таблицей значений на сетке.
+
+    times, x, y - возрастающие узлы по времени и координатам, values - массив
+    скоростей формы (n_t, n_y, n_x, 2). Между узлами используется
+    трилинейная интерполяция, за пределами сетки - значения на границе.
+    """
+
+    def __init__(self, times, x, y, values):
+        self.times = np.asarray(times, dtype=float)
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        expected = (len(self.times), len(self.y), len(self.x), 2)
+        if self.values.shape != expected:
+            raise ValueError(f"Ожидалась таблица формы {expected}, получена {self.values.shape}")
+
+    @staticmethod
+    def _locate(nodes: np.ndarray, query):
+        """Индекс левого узла и вес правого узла для линейной интерполяции"""
+        if len(nodes) == 1:
+            zeros = np.zeros(np.shape(query), dtype=int)
+            return zeros, zeros, np.zeros(np.shape(query))
+        query = np.clip(query, nodes[0], nodes[-1])
+        index = np.clip(np.searchsorted(nodes, query, side='right') - 1, 0, len(nodes) - 2)
+        weight = (query - nodes[index]) / (nodes[index + 1] - nodes[index])
+        return index, index + 1, weight
+
+    def evaluate(self, t: float, positions: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        positions, out = self._prepare_output(positions, out)
+        it0, it1, wt = self._locate(self.times, float(t))
+        ix0, ix1, wx = self._locate(self.x, positions[..., 0])
+        iy0, iy1, wy = self._locate(self.y, positions[..., 1])
+
+        # Интерполяция по времени, затем билинейная по пространству
+        frame = (1 - wt) * self.values[it0] + wt * self.values[it1]
+        wx = wx[..., None]
+        wy = wy[..., None]
+        out[...] = ((1 - wy) * ((1 - wx) * frame[iy0, ix0] + wx * frame[iy0, ix1])
+                    + wy * ((1 - wx) * frame[iy1, ix0] + wx * frame[iy1, ix1]))
+        return out
+
+    def get_parameters(self) -> dict:
+        return {'times': self.times, 'x': self.x, 'y': self.y, 'values': self.values}
+
+
 class VelocityField:
-    """Класс для представления поля скоростей"""
+    """Класс для представления поля скоростей задания (v₁ = -ln(t)·x₁, v₂ = t·x₂)"""
+
+    @staticmethod
+    def get_default_field() -> BaseVelocityField:
+        """Возвращает поле скоростей по умолчанию"""
+        return LogLinearField()
 
     @staticmethod
     def get_velocity(t: float, x: float, y: float) -> tuple:
@@ -24,10 +317,11 @@ class VelocityField:
         """
         Возвращает функцию скорости, совместимую с методом Рунге-Кутты
         """
+        return VelocityField.get_default_field()
 
-        def velocity_func(t: float, state: np.ndarray) -> np.ndarray:
-            x, y = state
-            vx, vy = VelocityField.get_velocity(t, x, y)
-            return np.array([vx, vy])
-
-        return velocity_func
+    @staticmethod
+    def get_batch_velocity_function() -> Callable:
+        """
+        Возвращает векторизованную функцию скорости для массива состояний (n_points, 2)
+        """
+        return VelocityField.get_default_field()
@@ -1,68 +1,205 @@
+import itertools
+import os
+import subprocess
+
 import numpy as np
 import matplotlib.pyplot as plt
-from services.velocity_field import VelocityField
+from matplotlib.animation import FuncAnimation, FFMpegWriter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+from matplotlib.collections import LineCollection
+from models.circle_body import CircleBody
+from services.runge_kutta import RungeKuttaSolver
+from services.field_sampler import FieldSampler, GridSpec
+from services.flow_tracer import FlowTracer
 
 
 class Visualization:
-    """Класс для визуализации результатов"""
+    """
+    Класс для визуализации результатов.
 
-    @staticmethod
-    def plot_trajectories_with_forms(trajectory_calculator):
-        trajectories = trajectory_calculator.get_body_trajectories()
+    Методы draw_* рисуют на переданных осях и не зависят от pyplot, поэтому
+    используются и в интерактивных plot_*, и в пакетной отрисовке в файлы
+    (BatchRenderer). Методы plot_* создают фигуру и показывают ее.
+    """
 
-        plt.figure(figsize=(10, 8))
+    # Область отображения поля скоростей
+    FIELD_RANGE = ((-10, 10), (-10, 10))
 
+    @staticmethod
+    def draw_trajectories_with_forms(ax, trajectories, initial_outline, t_end):
+        """trajectories - массив (n_points, n_steps, 2), initial_outline - пара (x, y)"""
         # 1. Начальная форма
-        init_circle_x, init_circle_y = trajectory_calculator.get_initial_circle()
-        plt.plot(init_circle_x, init_circle_y, 'g-', linewidth=2,
-                 label='Начальная форма (t≈0)')
+        init_circle_x, init_circle_y = initial_outline
+        ax.plot(init_circle_x, init_circle_y, 'g-', linewidth=2,
+                label='Начальная форма (t≈0)')
 
-        # 2. Рисуем траектории
-        for traj_x, traj_y in trajectories:
-            plt.plot(traj_x, traj_y, 'b-', alpha=0.15, linewidth=0.7)
+        # 2. Рисуем траектории (все столбцы одним вызовом)
+        ax.plot(trajectories[:, :, 0].T, trajectories[:, :, 1].T, 'b-', alpha=0.15, linewidth=0.7)
 
         # 3. Отмечаем начальные точки
-        init_x = [traj_x[0] for traj_x, _ in trajectories]
-        init_y = [traj_y[0] for _, traj_y in trajectories]
-        plt.scatter(init_x, init_y, c='green', s=10, alpha=0.6, zorder=5)
+        ax.scatter(trajectories[:, 0, 0], trajectories[:, 0, 1], c='green', s=10, alpha=0.6, zorder=5)
 
         # 4. Отмечаем конечные точки
-        final_x = [traj_x[-1] for traj_x, _ in trajectories]
-        final_y = [traj_y[-1] for _, traj_y in trajectories]
-        plt.scatter(final_x, final_y, c='red', s=10, alpha=0.6, zorder=5,
-                    label=f'Конечные точки (t={trajectory_calculator.t_end:.1f})')
-
-        plt.xlabel('x', fontsize=12)
-        plt.ylabel('y', fontsize=12)
-        plt.title('Траектории движения окружности (метод Рунге-Кутты)', fontsize=14, fontweight='bold')
-        plt.legend(loc='best')
-        plt.grid(True, alpha=0.3)
-        plt.axis('equal')
+        ax.scatter(trajectories[:, -1, 0], trajectories[:, -1, 1], c='red', s=10, alpha=0.6, zorder=5,
+                   label=f'Конечные точки (t={t_end:.1f})')
+
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title('Траектории движения окружности (метод Рунге-Кутты)', fontsize=14, fontweight='bold')
+        ax.legend(loc='best')
+        ax.grid(True, alpha=0.3)
+        ax.axis('equal')
+
+    @staticmethod
+    def draw_initial_form(ax, initial_outline, initial_points):
+        """initial_points - массив начальных положений (n_points, 2)"""
+        # Начальная окружность
+        init_circle_x, init_circle_y = initial_outline
+        ax.plot(init_circle_x, init_circle_y, 'g-', linewidth=3,
+                label='Начальная форма (t≈0)')
+
+        # Начальные зеленые точки
+        ax.scatter(initial_points[:, 0], initial_points[:, 1], c='green', s=30, alpha=0.8,
+                   label='Материальные точки')
+
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title('Начальная форма окружности', fontsize=14, fontweight='bold')
+        ax.legend(loc='upper left')
+        ax.grid(True, alpha=0.3)
+        ax.axis('equal')
+
+    @staticmethod
+    def draw_deformed_form(ax, current_x, current_y, t):
+        # Рисуем деформированную форму
+        ax.plot(np.append(current_x, current_x[0]), np.append(current_y, current_y[0]),
+                'r-', linewidth=3, label=f'Деформированная форма (t={t:.1f})')
+
+        # Точки материальных точек
+        ax.scatter(current_x, current_y, c='red', s=30, alpha=0.8,
+                   label='Материальные точки')
+
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title('Деформированная форма окружности', fontsize=14, fontweight='bold')
+        ax.legend(loc='best')
+        ax.grid(True, alpha=0.3)
+        ax.axis('equal')
+
+    @staticmethod
+    def draw_scene(ax, scene, positions, t):
+        """
+        Снимок сцены: отсчетные контуры всех тел и текущие положения точек.
+
+        positions - массив (n_points, 2) всей сцены. Точки всех тел рисуются
+        одним scatter с цветом по номеру тела; текущие контуры окружностей -
+        одной линией с разрывами NaN.
+        """
+        body_ids = np.repeat(np.arange(scene.get_num_bodies()), np.diff(scene.offsets))
+        outline_x, outline_y = scene.get_outline()
+        ax.plot(outline_x, outline_y, 'g--', linewidth=1, alpha=0.6, label='Начальные формы')
+
+        closed = [np.vstack([part, part[:1], [(np.nan, np.nan)]])
+                  for body, part in zip(scene.bodies, scene.split(positions))
+                  if isinstance(body, CircleBody) and len(part)]
+        if closed:
+            closed = np.concatenate(closed)
+            ax.plot(closed[:, 0], closed[:, 1], 'r-', linewidth=1.5, label=f'Формы при t={t:.2f}')
+
+        ax.scatter(positions[:, 0], positions[:, 1], c=body_ids % 10, cmap='tab10', vmin=0, vmax=9,
+                   s=8, zorder=5)
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title(f'Сцена из {scene.get_num_bodies()} тел при t={t:.2f}', fontsize=14, fontweight='bold')
+        ax.legend(loc='best')
+        ax.grid(True, alpha=0.3)
+        ax.axis('equal')
+
+    @staticmethod
+    def sample_velocity_grid(t, n, velocity_field=None):
+        """Скорости на сетке n×n в области FIELD_RANGE (векторизованно, с общим кешем)"""
+        x_range, y_range = Visualization.FIELD_RANGE
+        return FieldSampler.get_default().sample(t, GridSpec.square(x_range, y_range, n), velocity_field)
+
+    @staticmethod
+    def _finish_field_axes(ax, title):
+        x_range, y_range = Visualization.FIELD_RANGE
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.2)
+        ax.set_xlim(x_range)
+        ax.set_ylim(y_range)
+        ax.set_aspect('equal', adjustable='box')
+
+    @staticmethod
+    def draw_velocity_field(ax, t, velocity_field=None):
+        x_grid, y_grid, vx_grid, vy_grid = Visualization.sample_velocity_grid(t, 20, velocity_field)
+
+        # Модуль скорости
+        speed = np.sqrt(vx_grid ** 2 + vy_grid ** 2)
+
+        # Рисуем
+        quiver = ax.quiver(x_grid, y_grid, vx_grid, vy_grid, speed,
+                           cmap='viridis', alpha=0.8, scale=30, width=0.004)
+
+        ax.figure.colorbar(quiver, ax=ax, label='Модуль скорости', shrink=0.9)
+        Visualization._finish_field_axes(ax, f'Поле скоростей при t={t:.2f}')
+
+    @staticmethod
+    def draw_streamlines(ax, t, velocity_field=None, n_seeds=20, length=3.0):
+        """Линии тока замороженного поля из затравок на сетке n_seeds×n_seeds"""
+        tracer = FlowTracer(velocity_field)
+        seeds = FlowTracer.grid_seeds(*Visualization.FIELD_RANGE, n_seeds)
+        lines = tracer.streamlines(seeds, t, length=length, ds=length / 40,
+                                   bounds=Visualization.FIELD_RANGE)
+
+        # Все линии одной коллекцией; NaN за границей области разрывают линию
+        ax.add_collection(LineCollection(lines, colors='blue', linewidths=1.0, alpha=0.7))
+        Visualization._draw_flow_arrows(ax, lines, arrow_length=length / 8)
+        Visualization._finish_field_axes(ax, f'Линии тока при t={t:.2f}')
+
+    @staticmethod
+    def _draw_flow_arrows(ax, lines, arrow_length):
+        """
+        Стрелки направления течения в серединах линий тока одним quiver.
+
+        Точки линий FlowTracer упорядочены по течению, поэтому направление -
+        разность соседних точек; если линия за серединой обрывается (NaN),
+        берется отрезок перед серединой. Линии из точек покоя пропускаются.
+        """
+        middle = lines.shape[1] // 2
+        position = lines[:, middle]
+        direction = lines[:, min(middle + 1, lines.shape[1] - 1)] - position
+        broken = np.isnan(direction).any(axis=1)
+        if middle > 0:
+            direction[broken] = position[broken] - lines[broken, middle - 1]
+        norm = np.hypot(direction[:, 0], direction[:, 1])
+        valid = np.isfinite(norm) & (norm > 0) & np.isfinite(position).all(axis=1)
+        if not valid.any():
+            return
+        direction = direction[valid] / norm[valid, None] * arrow_length
+        ax.quiver(position[valid, 0], position[valid, 1], direction[:, 0], direction[:, 1],
+                  color='blue', alpha=0.7, angles='xy', scale_units='xy', scale=1, pivot='mid',
+                  width=0.003, headwidth=5, headlength=6, headaxislength=5)
+
+    @staticmethod
+    def plot_trajectories_with_forms(trajectory_calculator):
+        plt.figure(figsize=(10, 8))
+        Visualization.draw_trajectories_with_forms(plt.gca(),
+                                                   trajectory_calculator.get_trajectory_array(),
+                                                   trajectory_calculator.get_initial_circle(),
+                                                   trajectory_calculator.t_end)
         plt.tight_layout()
         plt.show()
 
     @staticmethod
     def plot_initial_form_only(trajectory_calculator):
         plt.figure(figsize=(8, 8))
-
-        # Начальная окружность
-        init_circle_x, init_circle_y = trajectory_calculator.get_initial_circle()
-        plt.plot(init_circle_x, init_circle_y, 'g-', linewidth=3,
-                 label='Начальная форма (t≈0)')
-
-        # Начальные зеленые точки
-        trajectories = trajectory_calculator.get_body_trajectories()
-        init_x = [traj_x[0] for traj_x, _ in trajectories]
-        init_y = [traj_y[0] for _, traj_y in trajectories]
-        plt.scatter(init_x, init_y, c='green', s=30, alpha=0.8,
-                    label='Материальные точки')
-
-        plt.xlabel('x', fontsize=12)
-        plt.ylabel('y', fontsize=12)
-        plt.title('Начальная форма окружности', fontsize=14, fontweight='bold')
-        plt.legend(loc='upper left')
-        plt.grid(True, alpha=0.3)
-        plt.axis('equal')
+        Visualization.draw_initial_form(plt.gca(), trajectory_calculator.get_initial_circle(),
+                                        trajectory_calculator.body.get_coordinates())
         plt.tight_layout()
         plt.show()
 
@@ -72,108 +209,242 @@ class Visualization:
 
         # Получаем форму при t=2.0
         current_x, current_y = trajectory_calculator.get_form_at_time(2.0)
+        Visualization.draw_deformed_form(plt.gca(), current_x, current_y, 2.0)
+        plt.tight_layout()
+        plt.show()
 
-        # Рисуем деформированную форму
-        plt.plot(current_x + [current_x[0]], current_y + [current_y[0]],
-                 'r-', linewidth=3, label='Деформированная форма (t=2.0)')
+    @staticmethod
+    def plot_scene_at_time(trajectory_calculator, t):
+        plt.figure(figsize=(10, 8))
+        Visualization.draw_scene(plt.gca(), trajectory_calculator.body,
+                                 trajectory_calculator.get_positions_at_time(t), t)
+        plt.tight_layout()
+        plt.show()
 
-        # Точки материальных точек
-        plt.scatter(current_x, current_y, c='red', s=30, alpha=0.8,
-                    label='Материальные точки')
-
-        plt.xlabel('x', fontsize=12)
-        plt.ylabel('y', fontsize=12)
-        plt.title('Деформированная форма окружности', fontsize=14, fontweight='bold')
-        plt.legend(loc='best')
-        plt.grid(True, alpha=0.3)
-        plt.axis('equal')
+    @staticmethod
+    def plot_velocity_field_only(t, velocity_field=None):
+        plt.figure(figsize=(10, 8))
+        Visualization.draw_velocity_field(plt.gca(), t, velocity_field)
         plt.tight_layout()
         plt.show()
 
     @staticmethod
-    def plot_velocity_field_only(t):
+    def plot_streamlines_only(t, velocity_field=None):
         plt.figure(figsize=(10, 8))
+        Visualization.draw_streamlines(plt.gca(), t, velocity_field)
+        plt.tight_layout()
+        plt.show()
 
-        # Область
-        x_range = (-10, 10)
-        y_range = (-10, 10)
+    @staticmethod
+    def _build_animation(fig, trajectory_calculator, stride: int, trail: int, show_field: bool,
+                         n_field: int):
+        """
+        Создает артисты анимации на фигуре один раз.
+
+        Возвращает (update, n_frames, artists): update(i) только обновляет
+        данные артистов для кадра i. Поле для всех кадров считается одним
+        вызовом FieldSampler.sample_times.
+        """
+        trajectories = trajectory_calculator.get_trajectory_array()
+        t_points = trajectory_calculator.t_points
+        frames = RungeKuttaSolver.get_output_indices(len(t_points), stride)
+
+        ax = fig.gca()
+
+        # Границы фиксированы по всей анимации: охватывают все траектории
+        margin = 0.05
+        low = np.nanmin(trajectories, axis=(0, 1))
+        high = np.nanmax(trajectories, axis=(0, 1))
+        pad = margin * np.maximum(high - low, 1e-9)
+        x_range = (low[0] - pad[0], high[0] + pad[0])
+        y_range = (low[1] - pad[1], high[1] + pad[1])
+
+        init_x, init_y = trajectory_calculator.get_initial_circle()
+        ax.plot(init_x, init_y, 'g-', linewidth=2, label='Начальная форма')
+
+        quiver = None
+        if show_field:
+            spec = GridSpec(x_range, y_range, n_field, n_field)
+            x_grid, y_grid = FieldSampler.get_default().get_grid(spec)
+            velocities = FieldSampler.get_default().sample_times(
+                t_points[frames], spec, trajectory_calculator.velocity_field)
+            speeds = np.hypot(velocities[..., 0], velocities[..., 1])
+            # Общий масштаб стрелок для всех кадров: самая быстрая стрелка длиной в ячейку сетки
+            cell = min(x_range[1] - x_range[0], y_range[1] - y_range[0]) / (n_field - 1)
+            quiver = ax.quiver(x_grid, y_grid, velocities[0, ..., 0], velocities[0, ..., 1], speeds[0],
+                               cmap='viridis', alpha=0.5, angles='xy', scale_units='xy',
+                               scale=max(speeds.max(), 1e-12) / cell, animated=True)
+            quiver.set_clim(speeds.min(), speeds.max())
+
+        connect = isinstance(trajectory_calculator.body, CircleBody)
+        trail_line, = ax.plot([], [], 'b-', alpha=0.3, linewidth=0.7, animated=True)
+        outline_line, = ax.plot([], [], 'r-', linewidth=2, animated=True,
+                                label='Текущая форма' if connect else None)
+        points = ax.scatter(trajectories[:, 0, 0], trajectories[:, 0, 1], c='red', s=12, zorder=5,
+                            animated=True)
+        label = ax.text(0.02, 0.96, '', transform=ax.transAxes, fontsize=12, va='top', animated=True)
+
+        ax.set_xlim(x_range)
+        ax.set_ylim(y_range)
+        ax.set_aspect('equal', adjustable='box')
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12)
+        ax.set_title('Деформация тела', fontsize=14, fontweight='bold')
+        ax.legend(loc='upper right')
+        ax.grid(True, alpha=0.3)
+
+        # Буфер хвостов: (n_points, trail + 2, 2), последний столбец NaN разделяет линии
+        tails = np.full((len(trajectories), trail + 2, 2), np.nan)
+        artists = [artist for artist in (quiver, trail_line, outline_line, points, label) if artist is not None]
+
+        def update(frame_number):
+            step = frames[frame_number]
+            current = trajectories[:, step]
+            start = max(0, step - trail)
+            length = step - start + 1
+            tails[:, :length] = trajectories[:, start:step + 1]
+            tails[:, length:-1] = current[:, None]
+            trail_line.set_data(tails[..., 0].ravel(), tails[..., 1].ravel())
+            points.set_offsets(current)
+            if connect:
+                outline_line.set_data(np.append(current[:, 0], current[0, 0]),
+                                      np.append(current[:, 1], current[0, 1]))
+            if quiver is not None:
+                quiver.set_UVC(velocities[frame_number, ..., 0], velocities[frame_number, ..., 1],
+                               speeds[frame_number])
+            label.set_text(f't = {t_points[step]:.3f}')
+            return artists
+
+        return update, len(frames), artists
 
-        # Сетка
-        x = np.linspace(x_range[0], x_range[1], 20)
-        y = np.linspace(y_range[0], y_range[1], 20)
-        x_grid, y_grid = np.meshgrid(x, y)
+    @staticmethod
+    def create_animation(trajectory_calculator, stride: int = 1, trail: int = 20, show_field: bool = True,
+                         n_field: int = 20, interval: int = 50, figure=None):
+        """
+        Интерактивная анимация деформации тела по сохраненному массиву траекторий.
+
+        Артисты создаются один раз и на каждом кадре только получают новые
+        данные; используется blitting. Возвращает FuncAnimation.
+        """
+        fig = figure if figure is not None else plt.figure(figsize=(10, 8))
+        update, n_frames, _ = Visualization._build_animation(fig, trajectory_calculator, stride, trail,
+                                                             show_field, n_field)
+        return FuncAnimation(fig, update, frames=n_frames, interval=interval, blit=True)
 
-        # Скорости
-        vx_grid = np.zeros_like(x_grid)
-        vy_grid = np.zeros_like(y_grid)
+    @staticmethod
+    def iter_animation_frames(trajectory_calculator, stride: int = 1, trail: int = 20,
+                              show_field: bool = True, n_field: int = 20, dpi: int = 100):
+        """
+        Кадры анимации массивами RGBA (height, width, 4) без показа окна.
+
+        Статичная часть фигуры рисуется один раз; на каждом кадре
+        восстанавливается фон и перерисовываются только изменяемые артисты.
+        Массив кадра переиспользуется: его нужно записать до следующего кадра.
+        """
+        fig = Figure(figsize=(10, 8), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        update, n_frames, artists = Visualization._build_animation(fig, trajectory_calculator, stride, trail,
+                                                                   show_field, n_field)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        for frame_number in range(n_frames):
+            update(frame_number)
+            canvas.restore_region(background)
+            for artist in artists:
+                fig.draw_artist(artist)
+            yield np.asarray(canvas.buffer_rgba())
 
-        for i in range(x_grid.shape[0]):
-            for j in range(x_grid.shape[1]):
-                vx, vy = VelocityField.get_velocity(t, x_grid[i, j], y_grid[i, j])
-                vx_grid[i, j] = vx
-                vy_grid[i, j] = vy
+    @staticmethod
+    def save_animation(trajectory_calculator, path, fps: int = 20, dpi: int = 100, stride: int = 1,
+                       trail: int = 20, show_field: bool = True):
+        """
+        Сохраняет анимацию в GIF (Pillow) или MP4 (ffmpeg) по расширению файла.
+
+        Кадры берутся из iter_animation_frames, фигура не перестраивается.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in ('.gif', '.mp4'):
+            raise ValueError(f"Неподдерживаемый формат анимации '{extension}', ожидались .gif или .mp4")
+        if extension == '.mp4' and not FFMpegWriter.isAvailable():
+            raise RuntimeError("Для записи MP4 требуется ffmpeg")
+
+        frames = Visualization.iter_animation_frames(trajectory_calculator, stride=stride, trail=trail,
+                                                     show_field=show_field, dpi=dpi)
+        first = next(frames, None)
+        if first is None:
+            raise ValueError("Нет кадров для анимации")
+        if extension == '.gif':
+            Visualization._write_gif(path, first, frames, fps)
+            return path
+
+        height, width = first.shape[:2]
+        command = [FFMpegWriter.bin_path(), '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+                   '-i', 'pipe:', '-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2',
+                   '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', path]
+        # Без буфера stdin: после обрыва канала закрытие не пытается дописать остаток
+        with subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0) as process:
+            broken = False
+            try:
+                process.stdin.write(first.tobytes())
+                for frame in frames:
+                    process.stdin.write(frame.tobytes())
+                process.stdin.close()
+            except BrokenPipeError:
+                # ffmpeg завершился, не приняв все кадры: причина - в его stderr
+                broken = True
+            message = process.stderr.read().decode(errors='replace').strip()
+            process.wait()
+        if process.returncode or broken:
+            raise RuntimeError(f"ffmpeg завершился с кодом {process.returncode}: {message or 'нет сообщения'}")
+        return path
 
-        # Модуль скорости
-        speed = np.sqrt(vx_grid ** 2 + vy_grid ** 2)
+    @staticmethod
+    def _write_gif(path, first, frames, fps: int):
+        """
+        Пишет GIF по одному кадру: в памяти только текущий кадр.
+
+        Image.save(save_all=True) накапливает все кадры до записи, поэтому
+        заголовок и кадры пишутся через getheader/getdata. Каждый кадр
+        квантуется отдельно и хранит свою локальную палитру.
+        """
+        duration = 1000 / fps
+        with open(path, 'wb') as file:
+            for number, frame in enumerate(itertools.chain([first], frames)):
+                image = Image.fromarray(frame[..., :3]).quantize(256)
+                if number == 0:
+                    header, _ = GifImagePlugin.getheader(image, info={'loop': 0, 'duration': duration,
+                                                                      'optimize': False})
+                    file.writelines(header)
+                file.writelines(GifImagePlugin.getdata(image, duration=duration, include_color_table=True))
+            file.write(b';')
 
-        # Рисуем
-        quiver = plt.quiver(x_grid, y_grid, vx_grid, vy_grid, speed,
-                            cmap='viridis', alpha=0.8, scale=30, width=0.004)
-
-        plt.colorbar(quiver, label='Модуль скорости', shrink=0.9)
-        plt.xlabel('x', fontsize=12)
-        plt.ylabel('y', fontsize=12)
-        plt.title(f'Поле скоростей при t={t:.2f}', fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.2)
-        plt.xlim(x_range)
-        plt.ylim(y_range)
-        plt.gca().set_aspect('equal')
-        plt.tight_layout()
+    @staticmethod
+    def animate_deformation(trajectory_calculator, path=None, fps: int = 20, stride: int = 1,
+                            trail: int = 20, show_field: bool = True, dpi: int = 100):
+        """Показывает анимацию деформации или, если указан path, сохраняет ее в файл"""
+        if path is not None:
+            return Visualization.save_animation(trajectory_calculator, path, fps=fps, dpi=dpi, stride=stride,
+                                                trail=trail, show_field=show_field)
+        animation = Visualization.create_animation(trajectory_calculator, stride=stride, trail=trail,
+                                                   show_field=show_field, interval=1000 // fps)
         plt.show()
+        return animation
 
     @staticmethod
-    def plot_streamlines_only(t):
-        plt.figure(figsize=(10, 8))
-
-        # Область
-        x_range = (-10, 10)
-        y_range = (-10, 10)
-
-        # Плотная сетка
-        x = np.linspace(x_range[0], x_range[1], 30)
-        y = np.linspace(y_range[0], y_range[1], 30)
-        x_grid, y_grid = np.meshgrid(x, y)
-
-        # Скорости
-        vx_grid = np.zeros_like(x_grid)
-        vy_grid = np.zeros_like(y_grid)
-
-        for i in range(x_grid.shape[0]):
-            for j in range(x_grid.shape[1]):
-                vx, vy = VelocityField.get_velocity(t, x_grid[i, j], y_grid[i, j])
-                vx_grid[i, j] = vx
-                vy_grid[i, j] = vy
-
-        # Линии тока
-        try:
-            plt.streamplot(x_grid, y_grid, vx_grid, vy_grid,
-                           color='blue', linewidth=1.5, density=1.5, arrowsize=1.0)
-            plot_type = "Линии тока"
-        except:
-            plt.quiver(x_grid[::2, ::2], y_grid[::2, ::2],
-                       vx_grid[::2, ::2], vy_grid[::2, ::2],
-                       color='blue', alpha=0.7, scale=25, width=0.003)
-            plot_type = "Векторное поле"
-
-        plt.xlabel('x', fontsize=12)
-        plt.ylabel('y', fontsize=12)
-        plt.title(f'{plot_type} при t={t:.2f}', fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.2)
-        plt.xlim(x_range)
-        plt.ylim(y_range)
-        plt.gca().set_aspect('equal')
-        plt.tight_layout()
-        plt.show()
+    def save_minimal_graphs(trajectory_calculator, output_dir, formats=('png',), workers: int = 1,
+                            dpi: int = 100):
+        """
+        Сохраняет те же графики, что и show_minimal_graphs, в файлы без окон.
+
+        Использует backend Agg; при workers > 1 фигуры рисуются параллельно.
+        Возвращает список путей к файлам.
+        """
+        from services.batch_renderer import BatchRenderer
+
+        renderer = BatchRenderer(output_dir, formats=formats, workers=workers, dpi=dpi)
+        renderer.add_calculator_report(trajectory_calculator)
+        return renderer.render()
 
     @staticmethod
     def show_minimal_graphs(trajectory_calculator):
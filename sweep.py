@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+
+# Добавляем пути
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from services.parameter_sweep import ParameterSweep
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Перебор параметров движения окружности в поле скоростей')
+    parser.add_argument('--radius', type=float, nargs='+', default=[3.0])
+    parser.add_argument('--center-x', type=float, nargs='+', default=[5.0])
+    parser.add_argument('--center-y', type=float, nargs='+', default=[-5.0])
+    parser.add_argument('--num-points', type=int, nargs='+', default=[36])
+    parser.add_argument('--t0', type=float, default=0.001)
+    parser.add_argument('--t-end', type=float, nargs='+', default=[2.0])
+    parser.add_argument('--dt', type=float, nargs='+', default=[0.01])
+    parser.add_argument('--field', default='log_linear', help='имя зарегистрированного поля скоростей')
+    parser.add_argument('--field-params', type=json.loads, nargs='+', default=[{}],
+                        help='параметры поля в JSON, по одному набору на вариант')
+    parser.add_argument('--method', choices=['batch', 'propagator'], default='batch')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help='файл JSON Lines со сводкой по каждому случаю')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    base_spec = {
+        'body': {'kind': 'circle'},
+        'field': {'name': args.field},
+        't0': args.t0,
+        'method': args.method,
+    }
+    axes = {
+        'body.radius': args.radius,
+        'body.center_x': args.center_x,
+        'body.center_y': args.center_y,
+        'body.num_points': args.num_points,
+        'field.params': args.field_params,
+        't_end': args.t_end,
+        'dt': args.dt,
+    }
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        with ParameterSweep.from_grid(base_spec, axes, max_workers=args.workers) as sweep:
+            print(f"Случаев: {len(sweep.cases)}")
+            for done, result in enumerate(sweep.run(), start=1):
+                # Потоковая агрегация: сводка по случаю сразу после его завершения
+                final = result.trajectories[:, -1]
+                summary = {
+                    'index': result.index,
+                    'spec': result.spec,
+                    'elapsed': result.elapsed,
+                    'n_points': int(final.shape[0]),
+                    'final_centroid': final.mean(axis=0).tolist() if len(final) else None,
+                    'max_displacement': float(
+                        abs(result.trajectories[:, -1] - result.trajectories[:, 0]).max()
+                    ) if len(final) else 0.0,
+                }
+                print(f"[{done}/{len(sweep.cases)}] случай {result.index}: {result.elapsed:.3f} с")
+                if output:
+                    output.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from services.trajectory_calculator import TrajectoryCalculator
+
+
+# Окружность из main.py на интервале без особенности -ln(t) у t0 = 0.001
+BASE_SPEC = {'body': {'kind': 'circle', 'center_x': 5.0, 'center_y': -5.0, 'radius': 3.0, 'num_points': 36},
+             't0': 0.1, 't_end': 1.5, 'dt': 0.01}
+
+
+@pytest.fixture
+def reference_coordinates():
+    """Отсчетные координаты калькуляторов make_calculator, снятые до расчета"""
+    return {}
+
+
+@pytest.fixture
+def make_calculator(reference_coordinates):
+    """Калькулятор базовой задачи с переопределенными ключами спецификации"""
+    def make(**options):
+        calculator = TrajectoryCalculator.from_spec({**BASE_SPEC, **options})
+        reference_coordinates[id(calculator)] = np.array(calculator.body.get_coordinates())
+        return calculator
+    return make
+
+
+@pytest.fixture
+def exact_history(reference_coordinates):
+    """
+    Точные положения (n_points, n_times, 2) поля LogLinearField в моменты times (по умолчанию t_points).
+
+    Начальные положения берутся снятыми до расчета, а не из тела после него.
+    """
+    def history(calculator, times=None):
+        times = calculator.t_points if times is None else times
+        y0 = reference_coordinates[id(calculator)]
+        return np.stack([calculator.velocity_field.exact_solution(calculator.t0, y0, t) for t in times], axis=1)
+    return history
@@ -0,0 +1,48 @@
+import matplotlib
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.batch_renderer import BatchRenderer
+
+
+def read_image(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def test_pooled_figures_match_fresh_ones(tmp_path, monkeypatch):
+    # В вызывающем процессе backend не переключается
+    monkeypatch.setattr(matplotlib, 'use', lambda *args, **kwargs: pytest.fail("matplotlib.use"))
+    renderer = BatchRenderer(str(tmp_path), dpi=40)
+    for name in ('first', 'second', 'third'):
+        renderer.add(name, 'velocity_field', t=0.5)
+        renderer.add(f'{name}_streamlines', 'streamlines', t=0.5)
+    renderer.render()
+
+    # Цветовая шкала прошлого графика не сужает оси следующего
+    first = read_image(tmp_path / 'first.png')
+    np.testing.assert_array_equal(read_image(tmp_path / 'second.png'), first)
+    np.testing.assert_array_equal(read_image(tmp_path / 'third.png'), first)
+
+
+def test_calculator_report_in_workers(make_calculator, tmp_path):
+    calculator = make_calculator(t_end=0.5, dt=0.05)
+    calculator.calculate_trajectories()
+    renderer = BatchRenderer(str(tmp_path), formats=('png', 'svg'), workers=2, dpi=30)
+    renderer.add_calculator_report(calculator, prefix='run_', field_times=(0.5,))
+    paths = renderer.render()
+
+    names = ['01_trajectories', '02_initial_form', '03_deformed_form', '04_velocity_field_t0.5',
+             '05_streamlines_t0.5']
+    expected = {str(tmp_path / f'run_{name}.{suffix}') for name in names for suffix in ('png', 'svg')}
+    assert set(paths) == expected
+    assert all((tmp_path / path).stat().st_size > 0 for path in paths)
+    assert renderer.jobs == []
+
+
+def test_unknown_kind_and_format_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        BatchRenderer(str(tmp_path), formats=('bmp',))
+    with pytest.raises(ValueError):
+        BatchRenderer(str(tmp_path)).add('plot', 'histogram')
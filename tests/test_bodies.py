@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from models.body_factory import create_body
+from models.disk_body import DiskBody
+from models.geometry import polygon_mask, quadrant_mask
+from models.mesh_body import MeshBody
+from models.polygon_body import PolygonBody
+from services.spatial_index import SpatialIndex
+
+
+@pytest.mark.parametrize('layout', ['grid', 'hex', 'jittered'])
+def test_disk_points_fill_the_disk(layout):
+    body = DiskBody(1.0, -2.0, 3.0, num_points=5000, layout=layout, seed=0)
+    coordinates = body.get_coordinates()
+    assert np.all(np.hypot(coordinates[:, 0] - 1.0, coordinates[:, 1] + 2.0) <= 3.0)
+    # Число точек - около запрошенного, покрытие без дыр: каждая точка круга рядом с узлом
+    assert 0.8 * 5000 < len(coordinates) < 1.2 * 5000
+    rng = np.random.default_rng(1)
+    angles, radii = rng.uniform(0, 2 * np.pi, 1000), 3.0 * np.sqrt(rng.uniform(0, 0.9, 1000))
+    probes = np.column_stack([1.0 + radii * np.cos(angles), -2.0 + radii * np.sin(angles)])
+    _, distance = SpatialIndex(coordinates).nearest(probes)
+    assert distance.max() < body.spacing
+
+
+def test_jittered_layout_keeps_minimum_distance():
+    body = DiskBody(0.0, 0.0, 1.0, spacing=0.05, layout='jittered', seed=3)
+    coordinates = body.get_coordinates()
+    difference = coordinates[:, None, :] - coordinates[None, :, :]
+    distance = np.hypot(difference[..., 0], difference[..., 1]) + np.eye(len(coordinates)) * body.spacing
+    assert distance.min() >= 0.5 * body.spacing
+
+
+def test_polygon_points_lie_inside():
+    vertices = [[0, 0], [4, 0], [4, 1], [1, 1], [1, 3], [0, 3]]
+    body = PolygonBody(vertices, spacing=0.1)
+    coordinates = body.get_coordinates()
+    assert len(coordinates) > 500
+    assert polygon_mask(coordinates, np.array(vertices, dtype=float)).all()
+    with pytest.raises(ValueError):
+        PolygonBody([[0, 0], [1, 1]])
+
+
+def test_mesh_connectivity():
+    body = MeshBody.from_disk(0.0, 0.0, 1.0, 0.1)
+    assert body.triangles.min() == 0 and body.triangles.max() == body.get_num_points() - 1
+    areas = body.get_triangle_areas()
+    assert np.all(areas > 0)
+    assert areas.sum() == pytest.approx(np.pi, rel=0.05)
+    # Каждое внутреннее ребро - у двух треугольников, граница замкнута
+    boundary = body.get_boundary_edges()
+    assert np.all(np.bincount(boundary.ravel()) % 2 == 0)
+
+
+def test_quadrant_mask_is_a_separate_step():
+    body = create_body('mesh_disk', center_x=0.0, center_y=0.0, radius=1.0, spacing=0.1)
+    mask = quadrant_mask(body.get_coordinates(), 4)
+    kept = body.get_coordinates()[mask]
+    body.apply_mask(mask)
+    np.testing.assert_array_equal(body.get_coordinates(), kept)
+    assert body.triangles.max() < body.get_num_points()
+    assert np.all(body.get_coordinates()[:, 0] > 0) and np.all(body.get_coordinates()[:, 1] < 0)
+    with pytest.raises(ValueError):
+        quadrant_mask(kept, 5)
+
+
+def test_points_are_array_views():
+    body = DiskBody(0.0, 0.0, 1.0, spacing=0.2)
+    points = body.get_points()
+    assert len(points) == body.get_num_points()
+    assert (points[3].x, points[3].y) == tuple(body.get_coordinates()[3])
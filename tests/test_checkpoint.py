@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from tests.conftest import BASE_SPEC
+
+
+def test_extend_matches_single_run(make_calculator):
+    single = make_calculator(t_end=1.5)
+    single.calculate_trajectories()
+    extended = make_calculator(t_end=0.8)
+    extended.calculate_trajectories()
+    extended.extend_to(1.5)
+
+    np.testing.assert_allclose(extended.t_points, single.t_points)
+    np.testing.assert_allclose(extended.get_trajectory_array(), single.get_trajectory_array(), atol=1e-12)
+
+
+def test_extend_with_deformation(make_calculator):
+    single = make_calculator(track_deformation=True)
+    single.calculate_trajectories()
+    extended = make_calculator(track_deformation=True, t_end=0.6)
+    extended.calculate_trajectories()
+    extended.extend_to(1.0)
+    extended.extend_to(1.5)
+
+    np.testing.assert_allclose(extended.get_deformation_gradients(), single.get_deformation_gradients(), atol=1e-12)
+
+
+def test_checkpoint_round_trip(make_calculator, tmp_path):
+    path = str(tmp_path / 'state.npz')
+    original = make_calculator(adaptive=True, t_end=0.8)
+    original.calculate_trajectories()
+    original.save_checkpoint(path)
+
+    restored = make_calculator(adaptive=True, t_end=0.8)
+    restored.restore_checkpoint(path)
+    np.testing.assert_array_equal(restored.t_points, original.t_points)
+    np.testing.assert_array_equal(restored.get_trajectory_array(), original.get_trajectory_array())
+    assert restored.next_dt == original.next_dt
+
+    # Продолжение после восстановления совпадает с продолжением исходного расчета
+    original.extend_to(1.5)
+    restored.extend_to(1.5)
+    np.testing.assert_array_equal(restored.get_trajectory_array(), original.get_trajectory_array())
+
+
+@pytest.mark.parametrize('options', [
+    {'dt': 0.02},
+    {'rtol': 1e-4},
+    {'field': {'name': 'linear', 'params': {'matrix': [[0.0, 1.0], [-1.0, 0.0]]}}},
+    {'body': {**BASE_SPEC['body'], 'center_x': 4.0}},
+])
+def test_checkpoint_rejects_other_configuration(make_calculator, tmp_path, options):
+    path = str(tmp_path / 'state.npz')
+    adaptive = 'rtol' in options
+    calculator = make_calculator(adaptive=adaptive)
+    calculator.calculate_trajectories()
+    calculator.save_checkpoint(path)
+    with pytest.raises(ValueError):
+        make_calculator(adaptive=adaptive, **options).restore_checkpoint(path)
+
+
+def test_checkpoint_ignores_t_end(make_calculator, tmp_path):
+    path = str(tmp_path / 'state.npz')
+    calculator = make_calculator(t_end=0.8)
+    calculator.calculate_trajectories()
+    calculator.save_checkpoint(path)
+    restored = make_calculator()
+    restored.restore_checkpoint(path)
+    assert restored.t_end == 0.8
+
+
+def test_extend_with_checkpoints(make_calculator, tmp_path):
+    path = str(tmp_path / 'state.npz')
+    single = make_calculator()
+    single.calculate_trajectories()
+    extended = make_calculator(t_end=0.5)
+    extended.calculate_trajectories()
+    extended.extend_to(1.5, checkpoint_path=path, checkpoint_interval=0.25)
+
+    restored = make_calculator()
+    restored.restore_checkpoint(path)
+    np.testing.assert_allclose(restored.get_trajectory_array(), single.get_trajectory_array(), atol=1e-12)
+
+
+@pytest.mark.parametrize('interval', [0.255, 0.013])
+def test_checkpoint_interval_not_multiple_of_dt(make_calculator, tmp_path, interval):
+    path = str(tmp_path / 'state.npz')
+    single = make_calculator()
+    single.calculate_trajectories()
+    extended = make_calculator(t_end=0.5)
+    extended.calculate_trajectories()
+    extended.extend_to(1.5, checkpoint_path=path, checkpoint_interval=interval)
+
+    np.testing.assert_allclose(np.diff(extended.t_points), single.dt, rtol=1e-9)
+    np.testing.assert_allclose(extended.t_points, single.t_points, atol=1e-12)
+    np.testing.assert_allclose(extended.get_trajectory_array(), single.get_trajectory_array(), atol=1e-12)
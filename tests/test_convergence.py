@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from services.convergence import ConvergenceStudy
+
+
+@pytest.mark.parametrize('table', ['rk4', 'bogacki_shampine'])
+def test_observed_order_matches_nominal(make_calculator, table):
+    calculator = make_calculator(butcher_table=table, dt=0.05)
+    result = ConvergenceStudy(calculator, levels=4).run()
+    # На [0.1, 1.5] поле гладкое: наблюдаемый порядок стремится к номинальному
+    np.testing.assert_allclose(result.orders, result.nominal_order, atol=0.15)
+    assert abs(result.orders[-1] - result.nominal_order) < abs(result.orders[0] - result.nominal_order)
+    assert result.exact_errors is not None
+    assert np.all(np.diff(result.errors) < 0)
+
+
+def test_recommended_step_meets_tolerance(make_calculator):
+    calculator = make_calculator(dt=0.1)
+    tolerance = 1e-8
+    result = ConvergenceStudy(calculator, levels=3).run(tolerance=tolerance)
+    assert result.converged is True
+    assert result.recommended_error <= tolerance
+    # Шаг - целая доля интервала
+    n_intervals = (calculator.t_end - calculator.t0) / result.recommended_dt
+    assert n_intervals == pytest.approx(round(n_intervals))
+    assert result.to_dict()['converged'] is True
+
+
+def test_unreached_tolerance_is_flagged(make_calculator, monkeypatch):
+    calculator = make_calculator(dt=0.1)
+    tolerance = 1e-8
+    monkeypatch.setattr(ConvergenceStudy, '_measure_error', lambda self, dt, order, exact: 2 * tolerance)
+    result = ConvergenceStudy(calculator, levels=3).run(tolerance=tolerance)
+    assert result.converged is False
+    assert result.recommended_error > tolerance
+
+
+def test_unverified_recommendation(make_calculator):
+    result = ConvergenceStudy(make_calculator(dt=0.1), levels=3).run(tolerance=1e-8, verify=False)
+    assert result.converged is None
+    assert result.recommended_dt is not None
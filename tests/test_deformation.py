@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from models.array_body import ArrayBody
+from services.strain_measures import StrainMeasures
+from services.trajectory_calculator import TrajectoryCalculator
+from services.velocity_field import create_field
+
+
+def test_deformation_gradient_batch(make_calculator):
+    calculator = make_calculator(track_deformation=True)
+    calculator.calculate_trajectories()
+    scale = calculator.velocity_field.exact_solution(calculator.t0, np.ones(2), calculator.t_end)
+    expected = np.broadcast_to(np.diag(scale), (36, 2, 2))
+    np.testing.assert_allclose(calculator.get_deformation_gradients()[:, -1], expected, atol=1e-7)
+
+
+def test_deformation_gradient_of_nonlinear_field_matches_finite_differences():
+    field = create_field('expression', vx='sin(y) + 0.1 * x', vy='-x * y / 4')
+    base = np.array([[0.3, -0.2], [1.0, 0.5], [-0.7, 1.2]])
+    eps = 1e-6
+    # Для каждой точки - она сама и две смещенные вдоль осей
+    points = np.concatenate([base, base + [eps, 0.0], base + [0.0, eps]])
+    calculator = TrajectoryCalculator(ArrayBody(points), t0=0.0, t_end=1.0, dt=0.01, velocity_field=field,
+                                      track_deformation=True)
+    calculator.calculate_trajectories()
+
+    final = calculator.get_trajectory_array()[:, -1]
+    n = len(base)
+    expected = np.stack([(final[n:2 * n] - final[:n]) / eps, (final[2 * n:] - final[:n]) / eps], axis=-1)
+    np.testing.assert_allclose(calculator.get_deformation_gradients()[:n, -1], expected, atol=1e-5)
+
+
+def test_strain_measures_of_simple_shear():
+    gamma = 0.5
+    F = np.array([[1.0, gamma], [0.0, 1.0]])
+    assert StrainMeasures.jacobian(F) == pytest.approx(1.0)
+    np.testing.assert_allclose(StrainMeasures.green_lagrange(F), [[0.0, gamma / 2], [gamma / 2, gamma ** 2 / 2]])
+    stretches = StrainMeasures.principal_stretches(F)
+    assert stretches[0] >= stretches[1]
+    assert np.prod(stretches) == pytest.approx(1.0)
+    # e = F⁻ᵀ·E·F⁻¹
+    inverse = np.linalg.inv(F)
+    np.testing.assert_allclose(StrainMeasures.almansi(F), inverse.T @ StrainMeasures.green_lagrange(F) @ inverse)
+
+
+def test_strains_require_tracking(make_calculator):
+    calculator = make_calculator()
+    calculator.calculate_trajectories()
+    with pytest.raises(RuntimeError):
+        calculator.get_jacobians()
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('butcher_table, tolerance', [
+    ('rk4', 1e-7),
+    ('bogacki_shampine', 1e-4),
+    ('dormand_prince', 1e-8),
+])
+def test_batch_fixed_step(make_calculator, exact_history, butcher_table, tolerance):
+    calculator = make_calculator(butcher_table=butcher_table)
+    calculator.calculate_trajectories()
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator), atol=tolerance)
+
+
+def test_numerical_point_by_point(make_calculator, exact_history):
+    calculator = make_calculator()
+    calculator.calculate_trajectories_numerical()
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator), atol=1e-7)
+
+
+def test_adaptive(make_calculator, exact_history):
+    calculator = make_calculator(adaptive=True, rtol=1e-9, atol=1e-12)
+    calculator.calculate_trajectories()
+    assert calculator.t_points[-1] == pytest.approx(calculator.t_end)
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator), atol=1e-6)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from services.field_sampler import FieldSampler, GridSpec
+
+
+def test_cache_hit_returns_same_arrays():
+    sampler = FieldSampler()
+    spec = GridSpec.square((-1, 1), (-1, 1), 8)
+    first = sampler.sample(0.5, spec)
+    second = sampler.sample(0.5, spec)
+    assert (sampler.hits, sampler.misses) == (1, 1)
+    assert all(a is b for a, b in zip(first, second))
+    assert not first[2].flags.writeable
+
+
+def test_cache_is_bounded_by_bytes():
+    n = 50
+    sample_bytes = n * n * 2 * 8
+    sampler = FieldSampler(maxsize=1000, max_bytes=3 * sample_bytes)
+    spec = GridSpec.square((-1, 1), (-1, 1), n)
+    for t in np.linspace(0.1, 1.0, 10):
+        sampler.sample(t, spec)
+    assert len(sampler._samples) == 3
+    assert sampler._samples.nbytes <= sampler.max_bytes
+
+    # Самые свежие моменты остались в кеше, старые вытеснены
+    sampler.sample(1.0, spec)
+    sampler.sample(0.1, spec)
+    assert (sampler.hits, sampler.misses) == (1, 11)
+
+
+def test_entry_larger_than_limit_is_not_cached():
+    sampler = FieldSampler(max_bytes=1000)
+    spec = GridSpec.square((-1, 1), (-1, 1), 40)
+    sampler.sample(0.5, spec)
+    sampler.sample(0.5, spec)
+    assert sampler.misses == 2
+    assert len(sampler._samples) == 0 and len(sampler._grids) == 0
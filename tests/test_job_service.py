@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+
+from services.job_service import JobClient, JobService
+from tests.conftest import BASE_SPEC
+
+
+# Достаточно долгий расчет, чтобы успеть отменить его до завершения
+LONG_SPEC = {**BASE_SPEC, 'dt': 5e-5}
+
+
+def run_with_service(scenario, tmp_path, **options):
+    """Запускает службу на Unix-сокете и выполняет scenario(service, connect)"""
+    async def main():
+        path = str(tmp_path / 'jobs.sock')
+        async with JobService(max_workers=1, progress_interval=50, **options) as service:
+            await service.serve(path)
+            clients = []
+
+            async def connect():
+                client = await JobClient.connect(path=path)
+                clients.append(client)
+                return client
+
+            try:
+                return await asyncio.wait_for(scenario(service, connect), 60)
+            finally:
+                for client in clients:
+                    await client.close()
+    return asyncio.run(main())
+
+
+async def collect(client, job):
+    return [event async for event in client.events(job)]
+
+
+def test_run_matches_local_calculation(tmp_path, make_calculator):
+    async def scenario(service, connect):
+        client = await connect()
+        return await client.run(BASE_SPEC)
+
+    t_points, trajectories = run_with_service(scenario, tmp_path)
+    local = make_calculator()
+    local.calculate_trajectories()
+    np.testing.assert_array_equal(t_points, local.t_points)
+    np.testing.assert_array_equal(trajectories, local.get_trajectory_array())
+
+
+def test_identical_inflight_specs_are_deduplicated(tmp_path):
+    async def scenario(service, connect):
+        first, second = await connect(), await connect()
+        job_first = await first.submit(LONG_SPEC)
+        job_second = await second.submit(LONG_SPEC)
+        events = await asyncio.gather(collect(first, job_first), collect(second, job_second))
+        return job_first, job_second, events
+
+    job_first, job_second, (events_first, events_second) = run_with_service(scenario, tmp_path)
+    assert job_first == job_second
+    chunks = [[event['positions'] for event in events if event['event'] == 'chunk']
+              for events in (events_first, events_second)]
+    assert events_first[-1]['event'] == events_second[-1]['event'] == 'done'
+    np.testing.assert_array_equal(np.concatenate(chunks[0], axis=1), np.concatenate(chunks[1], axis=1))
+
+
+def test_cancel_then_resubmit_starts_new_job(tmp_path):
+    async def scenario(service, connect):
+        first, second = await connect(), await connect()
+        job_first = await first.submit(LONG_SPEC)
+        async for event in first.events(job_first):
+            if event['event'] == 'progress':
+                await first.cancel(job_first)
+                break
+        # Отмена еще не подтверждена рабочим процессом: такая же спецификация не должна к ней присоединиться
+        job_second = await second.submit(LONG_SPEC)
+        return job_first, job_second, await collect(second, job_second)
+
+    job_first, job_second, events = run_with_service(scenario, tmp_path)
+    assert job_first != job_second
+    assert events[-1]['event'] == 'done'
+
+
+def test_disconnect_cancels_orphaned_job(tmp_path):
+    async def scenario(service, connect):
+        client = await connect()
+        job = await client.submit(LONG_SPEC)
+        await client.close()
+        for _ in range(100):
+            if job not in service.jobs:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    assert run_with_service(scenario, tmp_path)
+
+
+def test_cancel_before_first_run_finishes_job(tmp_path):
+    async def scenario(service, connect):
+        job, _ = await service.submit(LONG_SPEC)
+        # Задача задания создана, но еще ни разу не выполнялась
+        service._cancel_job(job)
+        await asyncio.wait_for(job.finished.wait(), 5)
+        again, deduplicated = await service.submit(LONG_SPEC)
+        service._cancel_job(again)
+        return job.status, job.id in service.jobs, again.id != job.id, deduplicated
+
+    assert run_with_service(scenario, tmp_path) == ('cancelled', False, True, False)
+
+
+def test_invalid_spec_is_rejected(tmp_path):
+    async def scenario(service, connect):
+        client = await connect()
+        with pytest.raises(RuntimeError):
+            await client.submit({'body': {'kind': 'unknown'}})
+        return True
+
+    assert run_with_service(scenario, tmp_path)
+
+
+def test_late_subscriber_after_history_window_gets_new_job(tmp_path):
+    async def scenario(service, connect):
+        first, second = await connect(), await connect()
+        job_first = await first.submit(LONG_SPEC)
+        async for event in first.events(job_first):
+            if event['event'] == 'chunk':
+                break
+        # Порции уже вытеснены из истории: присоединение дало бы неполный результат
+        job_second = await second.submit(LONG_SPEC)
+        history_bytes = service.jobs[job_first].history_bytes
+        await first.cancel(job_first)
+        return job_first, job_second, history_bytes, await collect(second, job_second)
+
+    job_first, job_second, history_bytes, events = run_with_service(scenario, tmp_path, history_bytes=1000)
+    assert job_first != job_second
+    assert history_bytes == 0
+    assert events[-1]['event'] == 'done'
+
+
+def test_slow_client_is_dropped(tmp_path):
+    async def scenario(service, connect):
+        client = await connect()
+        with pytest.raises(RuntimeError):
+            # Первая же порция больше буфера клиента
+            await client.run(LONG_SPEC)
+        for _ in range(100):
+            if not service.jobs:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    assert run_with_service(scenario, tmp_path, client_buffer=10000)
+
+
+EXPRESSION_SPEC = {**BASE_SPEC, 'field': {'name': 'expression', 'params': {'vx': '-log(t) * x', 'vy': 't * y'}}}
+
+
+def test_expression_fields_are_rejected_by_default(tmp_path):
+    async def scenario(service, connect):
+        client = await connect()
+        with pytest.raises(RuntimeError, match='allow_expressions'):
+            await client.submit(EXPRESSION_SPEC)
+        return True
+
+    assert run_with_service(scenario, tmp_path)
+
+
+def test_expression_fields_with_allow_expressions(tmp_path, make_calculator):
+    async def scenario(service, connect):
+        client = await connect()
+        return await client.run(EXPRESSION_SPEC)
+
+    _, trajectories = run_with_service(scenario, tmp_path, allow_expressions=True)
+    local = make_calculator()
+    local.calculate_trajectories()
+    np.testing.assert_allclose(trajectories, local.get_trajectory_array(), rtol=1e-12)
+
+
+def test_unix_socket_is_private(tmp_path):
+    async def scenario(service, connect):
+        return os.stat(tmp_path / 'jobs.sock').st_mode & 0o777
+
+    assert run_with_service(scenario, tmp_path) == 0o600
+
+
+def test_invalid_line_closes_connection(tmp_path):
+    async def scenario(service, connect):
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / 'jobs.sock'))
+        # HTTP-запрос с телом submit: первая же строка не JSON
+        body = json.dumps({'op': 'submit', 'request': 1, 'spec': BASE_SPEC})
+        writer.write(f"POST / HTTP/1.1\r\nContent-Type: text/plain\r\n\r\n{body}\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response, service.jobs
+
+    response, jobs = run_with_service(scenario, tmp_path)
+    events = [json.loads(line) for line in response.splitlines()]
+    assert [event['event'] for event in events] == ['error']
+    assert not jobs
+
+
+def test_tcp_requires_token():
+    async def main():
+        with pytest.raises(ValueError):
+            await JobService(max_workers=1).serve(port=0)
+
+        async with JobService(max_workers=1, token='secret') as service:
+            server = await service.serve(port=0)
+            port = server.sockets[0].getsockname()[1]
+            intruder = await JobClient.connect(port=port)
+            with pytest.raises(RuntimeError, match='token'):
+                await intruder.status()
+            await intruder.close()
+            client = await JobClient.connect(port=port, token='secret')
+            jobs = await client.status()
+            await client.close()
+            return jobs
+
+    assert asyncio.run(main()) == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from services.runge_kutta import RungeKuttaSolver
+
+
+def test_output_stride_and_dtype(make_calculator, exact_history):
+    full = make_calculator()
+    full.calculate_trajectories()
+    calculator = make_calculator(output_stride=7, output_dtype='float32')
+    calculator.calculate_trajectories()
+
+    indices = RungeKuttaSolver.get_output_indices(len(full.t_points), 7)
+    assert calculator.get_trajectory_array().dtype == np.float32
+    np.testing.assert_array_equal(calculator.t_points, full.t_points[indices])
+    np.testing.assert_allclose(calculator.get_trajectory_array(), full.get_trajectory_array()[:, indices], rtol=1e-6)
+
+
+@pytest.mark.parametrize('options', [{}, {'butcher_table': 'dormand_prince'}, {'adaptive': True, 'rtol': 1e-9},
+                                     {'adaptive': True, 'rtol': 1e-9, 'butcher_table': 'bogacki_shampine'}])
+def test_output_times(make_calculator, exact_history, options):
+    times = np.array([0.1, 0.123, 0.5, 0.77, 1.0, 1.5])
+    calculator = make_calculator(output_times=times.tolist(), **options)
+    calculator.calculate_trajectories()
+    np.testing.assert_array_equal(calculator.t_points, times)
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator, times), rtol=1e-8)
+
+
+@pytest.mark.parametrize('options', [{}, {'output_dtype': 'float32'}, {'adaptive': True, 'rtol': 1e-9},
+                                     {'method': 'propagator'}])
+def test_output_times_without_t0_keep_reference(make_calculator, exact_history, options):
+    calculator = make_calculator(output_times=[0.2, 0.9], **options)
+    reference = np.array(calculator.body.get_coordinates())
+    outline = calculator.get_initial_circle()
+    calculator.calculate_trajectories()
+
+    # Первая сохраненная точка траектории (t = 0.2) не становится отсчетной конфигурацией
+    np.testing.assert_array_equal(calculator.body.get_coordinates(), reference)
+    np.testing.assert_array_equal(calculator.get_initial_circle(), outline)
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator, [0.2, 0.9]),
+                               rtol=1e-5, atol=1e-5)
+    for t in (0.15, 0.5, 1.2):
+        np.testing.assert_allclose(calculator.get_positions_at_time(t), exact_history(calculator, [t])[:, 0],
+                                   atol=1e-6)
+
+    # Повторный расчет стартует из отсчетной конфигурации
+    first = np.array(calculator.get_trajectory_array())
+    calculator.calculate_trajectories()
+    np.testing.assert_array_equal(calculator.get_trajectory_array(), first)
+
+
+def test_get_output_indices():
+    np.testing.assert_array_equal(RungeKuttaSolver.get_output_indices(10, 3), [0, 3, 6, 9])
+    # Последний шаг сохраняется всегда
+    np.testing.assert_array_equal(RungeKuttaSolver.get_output_indices(11, 3), [0, 3, 6, 9, 10])
+    np.testing.assert_array_equal(RungeKuttaSolver.get_output_indices(5, 1), np.arange(5))
+
+
+@pytest.mark.parametrize('options', [{'output_times': [0.05, 1.0]}, {'output_times': [1.0, 0.5]},
+                                     {'output_stride': 0}])
+def test_invalid_output_options(make_calculator, options):
+    with pytest.raises(ValueError):
+        make_calculator(**options).calculate_trajectories()
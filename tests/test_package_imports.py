@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import services
+
+
+def test_heavy_services_are_imported_lazily():
+    code = ("import sys, services; "
+            "print(all(f'services.{name}' not in sys.modules "
+            "for name in ('job_service', 'convergence', 'result_cache', 'flow_tracer', 'field_sampler')))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert output.strip() == 'True'
+
+
+def test_lazy_names_resolve():
+    from services.job_service import JobService
+    assert services.JobService is JobService
+    assert set(services.__all__) <= set(dir(services))
+    for name in services.__all__:
+        assert getattr(services, name) is not None
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from services.parameter_sweep import ParameterSweep
+from services.trajectory_calculator import TrajectoryCalculator
+from tests.conftest import BASE_SPEC
+
+
+SHORT_SPEC = {**BASE_SPEC, 't_end': 0.5}
+
+
+def test_results_match_local_calculation():
+    axes = {'body.radius': [1.0, 2.0], 'dt': [0.01, 0.02], 'output_dtype': ['float32', 'float64']}
+    with ParameterSweep.from_grid(SHORT_SPEC, axes, max_workers=2, window=3) as sweep:
+        seen = []
+        for result in sweep.run():
+            # Одновременно заняты не больше window блоков
+            assert len(sweep._blocks) <= 3
+            local = TrajectoryCalculator.from_spec(result.spec)
+            local.calculate_trajectories()
+            np.testing.assert_array_equal(result.t_points, local.t_points)
+            np.testing.assert_array_equal(result.trajectories, local.get_trajectory_array())
+            seen.append(result)
+    assert sorted(result.index for result in seen) == list(range(8))
+    # Блоки полученных результатов освобождены
+    assert all(result.trajectories is None for result in seen)
+    assert not sweep._blocks
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'output_stride': 7},
+    {'output_times': [0.1, 0.3, 0.45]},
+    {'body': {'kind': 'disk', 'center_x': 1.0, 'center_y': 2.0, 'radius': 1.5, 'num_points': 200}},
+    {'body': {'kind': 'polygon', 'vertices': [[0, 0], [2, 0], [1, 2]], 'spacing': 0.2}},
+])
+def test_case_shape_from_spec(options):
+    sweep = ParameterSweep([{**SHORT_SPEC, **options}])
+    calculator = TrajectoryCalculator.from_spec(sweep.cases[0])
+    expected = (calculator.body.get_num_points(), calculator.get_num_outputs(), 2)
+    assert sweep.get_case_shape(0) == (expected, calculator.output_dtype.str)
+
+
+def test_adaptive_cases_are_rejected():
+    with ParameterSweep([{**SHORT_SPEC, 'adaptive': True}]) as sweep:
+        with pytest.raises(ValueError):
+            next(sweep.run())
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from models.point_cloud import MaterialPointCloud, PointCloud
+
+
+def test_view_writes_do_not_touch_trajectory_history():
+    reference = np.zeros((3, 2))
+    trajectories = np.arange(3 * 4 * 2, dtype=float).reshape(3, 4, 2)
+    history = trajectories.copy()
+    cloud = MaterialPointCloud(reference, trajectories)
+
+    np.testing.assert_array_equal(cloud.to_array(), trajectories[:, -1])
+    cloud[1].x = -1.0
+    cloud[2].y = -2.0
+    np.testing.assert_array_equal(trajectories, history)
+    assert (cloud[1].x, cloud[2].y) == (-1.0, -2.0)
+
+
+def test_read_only_trajectories():
+    trajectories = np.ones((2, 3, 2))
+    trajectories.flags.writeable = False
+    cloud = MaterialPointCloud(np.zeros((2, 2)), trajectories)
+    cloud[0].x = 5.0
+    assert cloud[0].x == 5.0
+    np.testing.assert_array_equal(trajectories, 1.0)
+
+
+def test_points_have_no_instance_dict():
+    from models.material_point import MaterialPoint
+    from models.spatial_point import SpatialPoint
+
+    cloud = MaterialPointCloud(np.zeros((2, 2)))
+    for point in (SpatialPoint(1.0, 2.0), MaterialPoint(1.0, 2.0), cloud[0]):
+        assert not hasattr(point, '__dict__')
+        with pytest.raises(AttributeError):
+            point.label = 'a'
+
+
+def test_views_share_cloud_arrays():
+    reference = np.array([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+    cloud = PointCloud(reference)
+    cloud[-1].x = 9.0
+    assert reference[2, 0] == 9.0
+    np.testing.assert_array_equal(cloud[1].to_array(), [2.0, 3.0])
+    assert [point.y for point in cloud] == [1.0, 3.0, 5.0]
+    with pytest.raises(IndexError):
+        cloud[3]
+
+    shifted = cloud - cloud[0] + [1.0, 1.0]
+    np.testing.assert_array_equal(shifted.to_array(), reference - reference[0] + 1.0)
+    moved = 2 * cloud[1] - cloud[0]
+    assert (moved.x, moved.y) == (4.0, 5.0)
+
+
+def test_material_views_expose_trajectories_and_masses():
+    trajectories = np.arange(2 * 3 * 2, dtype=float).reshape(2, 3, 2)
+    cloud = MaterialPointCloud(np.zeros((2, 2)), trajectories, mass=np.array([1.0, 2.5]))
+    trajectory = cloud[1].get_trajectory().as_array()
+    assert np.shares_memory(trajectory, trajectories)
+    np.testing.assert_array_equal(trajectory, trajectories[1])
+    assert [point.mass for point in cloud] == [1.0, 2.5]
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+
+def test_propagator(make_calculator, exact_history):
+    calculator = make_calculator(method='propagator', track_deformation=True)
+    calculator.calculate_trajectories()
+    np.testing.assert_allclose(calculator.get_trajectory_array(), exact_history(calculator), atol=1e-7)
+    # Для линейного поля F = Φ: диагональ из множителей точного решения
+    F = calculator.get_deformation_gradients()[0, -1]
+    scale = calculator.velocity_field.exact_solution(calculator.t0, np.ones(2), calculator.t_end)
+    np.testing.assert_allclose(F, np.diag(scale), atol=1e-7)
+
+
+def test_propagator_matches_batch_for_linear_field(make_calculator):
+    field = {'name': 'linear', 'params': {'matrix': [[0.1, 1.0], [-1.0, -0.2]]}}
+    batch = make_calculator(field=field)
+    batch.calculate_trajectories()
+    propagator = make_calculator(field=field, method='propagator')
+    propagator.calculate_trajectories()
+    np.testing.assert_array_equal(propagator.t_points, batch.t_points)
+    np.testing.assert_allclose(propagator.get_trajectory_array(), batch.get_trajectory_array(), atol=1e-10)
+    # Одна матрица потока на момент времени, общая для всех точек
+    assert propagator.flow_matrices.shape == (len(batch.t_points), 2, 2)
+
+
+def test_propagator_requires_linear_field(make_calculator):
+    field = {'name': 'expression', 'params': {'vx': 'x * y', 'vy': '-x'}}
+    with pytest.raises(ValueError):
+        make_calculator(field=field, method='propagator').calculate_trajectories()
@@ -0,0 +1,109 @@
+import functools
+
+import numpy as np
+import pytest
+
+from services.result_cache import ResultCache, UncacheableError, make_cache_key
+from services.velocity_field import ExpressionField, LinearField
+
+
+def test_hit_and_miss(make_calculator, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    first = make_calculator(cache=None)
+    first.cache = cache
+    first.calculate_trajectories()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    second = make_calculator()
+    second.cache = cache
+    second.calculate_trajectories()
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(second.get_trajectory_array(), first.get_trajectory_array())
+    np.testing.assert_array_equal(second.t_points, first.t_points)
+
+
+def test_key_depends_on_configuration(make_calculator):
+    base = make_cache_key(make_calculator())
+    assert make_cache_key(make_calculator()) == base
+    assert make_cache_key(make_calculator(dt=0.02)) != base
+    assert make_cache_key(make_calculator(output_stride=2)) != base
+    assert make_cache_key(make_calculator(field={'name': 'log_linear'})) == base
+    assert make_cache_key(make_calculator(body={'kind': 'circle', 'center_x': 5.0, 'center_y': -5.0,
+                                                'radius': 2.0, 'num_points': 36})) != base
+
+
+def test_hit_restores_adaptive_step(make_calculator, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    first = make_calculator(adaptive=True, t_end=0.8)
+    first.cache = cache
+    first.calculate_trajectories()
+
+    second = make_calculator(adaptive=True, t_end=0.8)
+    second.cache = cache
+    second.calculate_trajectories()
+    assert cache.hits == 1
+    assert second.next_dt == first.next_dt is not None
+
+    # Продолжение после попадания в кеш совпадает с продолжением исходного расчета
+    first.extend_to(1.5)
+    second.extend_to(1.5)
+    np.testing.assert_array_equal(second.t_points, first.t_points)
+    np.testing.assert_array_equal(second.get_trajectory_array(), first.get_trajectory_array())
+
+
+def key_with_field(make_calculator, field):
+    calculator = make_calculator()
+    calculator.velocity_field = field
+    return make_cache_key(calculator)
+
+
+def linear_field(a):
+    return LinearField(lambda t: a * np.eye(2))
+
+
+SCALE = 1.0
+
+
+def scaled_field():
+    return ExpressionField(lambda t, x, y: SCALE * x, lambda t, x, y: y)
+
+
+def test_callable_fields_are_keyed_by_behaviour(make_calculator):
+    key = functools.partial(key_with_field, make_calculator)
+    sin = key(ExpressionField(lambda t, x, y: np.sin(x), lambda t, x, y: y))
+    cos = key(ExpressionField(lambda t, x, y: np.cos(x), lambda t, x, y: y))
+    assert sin != cos
+    assert sin == key(ExpressionField(lambda t, x, y: np.sin(x), lambda t, x, y: y))
+
+    # Захваченные значения, значения по умолчанию и глобальные переменные входят в ключ
+    assert key(linear_field(1.0)) != key(linear_field(2.0))
+    assert key(linear_field(1.0)) == key(linear_field(1.0))
+    assert (key(ExpressionField(lambda t, x, y, k=1: k * x, lambda t, x, y: y))
+            != key(ExpressionField(lambda t, x, y, k=2: k * x, lambda t, x, y: y)))
+    global SCALE
+    before = key(scaled_field())
+    SCALE = 2.0
+    try:
+        assert key(scaled_field()) != before
+    finally:
+        SCALE = 1.0
+
+
+class Opaque:
+    def __call__(self, t, x, y):
+        return x
+
+
+def test_uncacheable_field_is_computed_without_cache(make_calculator, tmp_path):
+    field = ExpressionField(Opaque(), lambda t, x, y: y)
+    with pytest.raises(UncacheableError):
+        key_with_field(make_calculator, field)
+
+    cache = ResultCache(str(tmp_path))
+    calculator = make_calculator()
+    calculator.velocity_field = calculator.batch_velocity_func = field
+    calculator.cache = cache
+    calculator.calculate_trajectories()
+    assert (cache.hits, cache.misses, cache.uncacheable) == (0, 0, 1)
+    assert len(calculator.t_points) == 141
+    assert cache.get_size() == 0
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from models.body_factory import create_body
+from models.scene import Scene
+from services.trajectory_calculator import TrajectoryCalculator
+from tests.conftest import BASE_SPEC
+
+
+BODIES = [
+    {'kind': 'circle', 'center_x': 5.0, 'center_y': -5.0, 'radius': 3.0, 'num_points': 12},
+    {'kind': 'disk', 'center_x': 1.0, 'center_y': 2.0, 'radius': 1.0, 'num_points': 50},
+    {'kind': 'polygon', 'vertices': [[0, 0], [2, 0], [1, 2]], 'spacing': 0.3},
+]
+SCENE_SPEC = {**BASE_SPEC, 't_end': 0.5, 'body': {'kind': 'scene', 'bodies': BODIES}}
+
+
+def test_offsets_and_split():
+    scene = create_body('scene', bodies=BODIES[:2])
+    counts = [body.get_num_points() for body in scene.bodies]
+    np.testing.assert_array_equal(scene.offsets, np.cumsum([0] + counts))
+
+    index = scene.add_body(create_body(**BODIES[2]))
+    counts.append(scene.get_body(index).get_num_points())
+    np.testing.assert_array_equal(scene.offsets, np.cumsum([0] + counts))
+    assert scene.get_num_points() == sum(counts)
+
+    parts = scene.split(np.arange(scene.get_num_points()))
+    assert [len(part) for part in parts] == counts
+    for body, part in zip(scene.bodies, scene.split(scene.get_coordinates())):
+        np.testing.assert_array_equal(part, body.get_coordinates())
+
+
+def test_scene_matches_separate_bodies():
+    calculator = TrajectoryCalculator.from_spec(SCENE_SPEC)
+    calculator.calculate_trajectories()
+    for index, body_spec in enumerate(BODIES):
+        single = TrajectoryCalculator.from_spec({**SCENE_SPEC, 'body': body_spec})
+        single.calculate_trajectories()
+        np.testing.assert_allclose(calculator.body.get_body_trajectories(index), single.get_trajectory_array(),
+                                   rtol=1e-12, atol=1e-12)
+
+
+def test_body_trajectories_share_calculator_storage():
+    calculator = TrajectoryCalculator.from_spec(SCENE_SPEC)
+    calculator.calculate_trajectories()
+    scene = calculator.body
+    for index, body in enumerate(scene.bodies):
+        view = scene.get_body_trajectories(index)
+        assert np.shares_memory(view, calculator.trajectories)
+        # Тела сцены связаны со своей частью общего хранилища
+        first = body.get_points()[0].trajectory.as_array()
+        assert np.shares_memory(first, calculator.trajectories)
+
+    positions = calculator.get_positions_by_body(calculator.t_end)
+    assert [len(part) for part in positions] == [body.get_num_points() for body in scene.bodies]
+
+
+def test_scene_guards():
+    scene = Scene([create_body(**BODIES[0])])
+    with pytest.raises(RuntimeError):
+        scene.get_body_trajectories(0)
+    with pytest.raises(TypeError):
+        scene.apply_mask(np.ones(scene.get_num_points(), dtype=bool))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+
+def test_positions_at_time_between_nodes(make_calculator, exact_history, monkeypatch):
+    calculator = make_calculator()
+    calculator.calculate_trajectories()
+    # Внутри полной истории положения берутся из хранилища, без интегрирования
+    monkeypatch.setattr(calculator, '_integrate_positions', lambda *args: pytest.fail("интегрирование"))
+    t = 0.7345
+    np.testing.assert_allclose(calculator.get_positions_at_time(t), exact_history(calculator, [t])[:, 0], atol=1e-6)
+    x, y = calculator.get_form_at_time(t)
+    np.testing.assert_array_equal(np.column_stack([x, y]), calculator.get_positions_at_time(t))
+
+
+def test_positions_at_nodes_are_stored_values(make_calculator):
+    calculator = make_calculator()
+    calculator.calculate_trajectories()
+    for i in (0, 17, len(calculator.t_points) - 1):
+        np.testing.assert_array_equal(calculator.get_positions_at_time(calculator.t_points[i]),
+                                      calculator.get_trajectory_array()[:, i])
+
+
+@pytest.mark.parametrize('options', [
+    {'output_stride': 10},
+    {'output_stride': 10, 'adaptive': True, 'rtol': 1e-9},
+    {'output_times': [0.1, 0.6, 1.5], 'output_dtype': 'float32'},
+])
+def test_positions_at_time_with_sparse_output(make_calculator, exact_history, options):
+    calculator = make_calculator(**options)
+    calculator.calculate_trajectories()
+    for t in (0.345, 1.0, 1.4999):
+        np.testing.assert_allclose(calculator.get_positions_at_time(t), exact_history(calculator, [t])[:, 0],
+                                   atol=1e-6)
+
+
+def test_positions_outside_history(make_calculator, exact_history):
+    calculator = make_calculator(t_end=0.5)
+    calculator.calculate_trajectories()
+    for t in (0.503, 0.9):
+        np.testing.assert_allclose(calculator.get_positions_at_time(t), exact_history(calculator, [t])[:, 0],
+                                   atol=1e-6)
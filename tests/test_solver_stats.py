@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pytest
+
+from services.solver_stats import SolverStats
+
+
+@pytest.mark.parametrize('butcher_table, evaluations', [
+    ('rk4', lambda steps: 4 * steps),
+    # FSAL: первая стадия шага - последняя стадия предыдущего
+    ('dormand_prince', lambda steps: 6 * steps + 1),
+])
+def test_fixed_step_counters(make_calculator, butcher_table, evaluations):
+    calculator = make_calculator(butcher_table=butcher_table)
+    calculator.stats = SolverStats()
+    calculator.calculate_trajectories()
+
+    stats = calculator.stats
+    steps = len(calculator.t_points) - 1
+    assert stats.accepted_steps == steps
+    assert stats.rejected_steps == 0
+    assert stats.rhs_evaluations == evaluations(steps)
+    assert stats.rhs_points == 36 * stats.rhs_evaluations
+    assert stats.last_t == pytest.approx(calculator.t_end)
+    assert {'calculate', 'solve', 'rhs', 'store'} <= set(stats.timers)
+
+
+def test_adaptive_counters(make_calculator):
+    # Резкое включение сдвига около t = 1: регулятор отклоняет шаги
+    field = {'name': 'expression', 'params': {'vx': 'tanh(200 * (t - 1)) * y', 'vy': '0.1 * x'}}
+    calculator = make_calculator(adaptive=True, rtol=1e-8, field=field)
+    calculator.stats = SolverStats()
+    calculator.calculate_trajectories()
+
+    stats = calculator.stats
+    assert stats.rejected_steps > 0
+    assert stats.accepted_steps == len(calculator.t_points) - 1
+    # Дорман-Принс с FSAL: 6 новых стадий на попытку шага и одна в начале
+    assert stats.rhs_evaluations == 6 * (stats.accepted_steps + stats.rejected_steps) + 1
+
+
+def test_step_callback(make_calculator):
+    seen = []
+    calculator = make_calculator(t_end=0.5)
+    calculator.stats = SolverStats(callback=lambda t, y, stats: seen.append((t, y.shape, stats.accepted_steps)),
+                                   callback_interval=10)
+    calculator.calculate_trajectories()
+    assert [accepted for _, _, accepted in seen] == list(range(10, len(calculator.t_points), 10))
+    np.testing.assert_allclose([t for t, _, _ in seen], calculator.t_points[10::10])
+    assert all(shape == (36, 2) for _, shape, _ in seen)
+
+
+def test_json_export(make_calculator, tmp_path):
+    calculator = make_calculator(t_end=0.5)
+    calculator.stats = SolverStats()
+    calculator.calculate_trajectories()
+    path = tmp_path / 'stats.json'
+    text = calculator.stats.to_json(str(path))
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data == json.loads(text)
+    assert data['rhs_evaluations'] == calculator.stats.rhs_evaluations
+    assert data['timers']['stage_arithmetic'] >= 0
+
+
+def test_disabled_stats_do_not_wrap_rhs(make_calculator):
+    calculator = make_calculator(t_end=0.3)
+    assert calculator.stats is None
+    calculator.calculate_trajectories()
+    assert calculator.stats is None
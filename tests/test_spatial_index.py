@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from models.mesh_body import MeshBody
+from services.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    # Неравномерное облако: плотный кластер и разреженный фон
+    return np.vstack([rng.normal(0.0, 0.05, (2000, 2)), rng.uniform(-5, 5, (3000, 2))])
+
+
+def brute_force_nearest(points, queries):
+    d2 = ((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+    return np.sqrt(d2.min(axis=1))
+
+
+def test_nearest_matches_brute_force(points):
+    rng = np.random.default_rng(1)
+    queries = np.vstack([rng.uniform(-8, 8, (500, 2)), rng.normal(0.0, 0.05, (200, 2))])
+    index, distance = SpatialIndex(points).nearest(queries)
+
+    np.testing.assert_allclose(distance, brute_force_nearest(points, queries))
+    np.testing.assert_allclose(np.linalg.norm(points[index] - queries, axis=1), distance)
+
+
+def test_query_radius_matches_brute_force(points):
+    rng = np.random.default_rng(2)
+    queries = rng.uniform(-5, 5, (200, 2))
+    radius = 0.4
+    offsets, indices = SpatialIndex(points).query_radius(queries, radius)
+
+    distance = np.linalg.norm(queries[:, None, :] - points[None, :, :], axis=2)
+    for i in range(len(queries)):
+        assert set(indices[offsets[i]:offsets[i + 1]]) == set(np.flatnonzero(distance[i] <= radius))
+
+
+def test_locate_and_inverse_map_on_mesh():
+    body = MeshBody.from_disk(0.0, 0.0, 1.0, 0.1)
+    reference = body.get_coordinates()
+    # Аффинное отображение: барицентрическая интерполяция его обращает точно
+    matrix = np.array([[1.5, 0.3], [-0.2, 0.8]])
+    current = reference @ matrix.T + [2.0, -1.0]
+    index = SpatialIndex(current, triangles=body.triangles)
+
+    rng = np.random.default_rng(3)
+    inside = reference[body.triangles].mean(axis=1)[rng.choice(len(body.triangles), 100)]
+    queries = inside @ matrix.T + [2.0, -1.0]
+    np.testing.assert_allclose(index.inverse_map(queries, reference), inside, atol=1e-10)
+
+    outside = np.array([[10.0, 10.0], [-10.0, 0.0]])
+    assert not index.contains(outside).any()
+    assert index.contains(queries).all()
+
+
+def test_calculator_reference_positions(make_calculator):
+    # Поле LogLinearField - растяжение по осям: отображение аффинное, и барицентрическое обращение точно
+    calculator = make_calculator(body={'kind': 'mesh_disk', 'center_x': 5.0, 'center_y': -5.0, 'radius': 1.0,
+                                       'spacing': 0.1})
+    calculator.calculate_trajectories()
+    reference = calculator.body.get_coordinates()
+    triangles = calculator.body.triangles
+
+    inside = reference[triangles].mean(axis=1)
+    scale = calculator.velocity_field.exact_solution(calculator.t0, np.ones(2), calculator.t_end)
+    np.testing.assert_allclose(calculator.get_reference_positions(inside * scale), inside, atol=1e-6)
+
+    # Узлы деформированной сетки - ближайшие сами к себе
+    index = calculator.get_spatial_index()
+    nodes, distance = index.nearest(calculator.get_trajectory_array()[:, -1])
+    np.testing.assert_array_equal(nodes, np.arange(len(reference)))
+    np.testing.assert_array_equal(distance, 0.0)
+
+
+def test_inverse_map_without_mesh_returns_nodes(points):
+    reference = points * 0.5
+    index = SpatialIndex(points)
+    np.testing.assert_allclose(index.inverse_map(points[:50], reference), reference[:50])
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('options', [{}, {'output_stride': 9}, {'output_times': [0.2, 0.5, 1.5],
+                                                                  'output_dtype': 'float32'}])
+def test_streaming_matches_in_memory(make_calculator, tmp_path, options):
+    memory = make_calculator(**options)
+    memory.calculate_trajectories()
+    streamed = make_calculator(**options)
+    streamed.calculate_trajectories_streaming(str(tmp_path / 'run'), chunk_size=16)
+
+    np.testing.assert_array_equal(streamed.t_points, memory.t_points)
+    assert streamed.get_trajectory_array().dtype == memory.get_trajectory_array().dtype
+    np.testing.assert_array_equal(streamed.get_trajectory_array(), memory.get_trajectory_array())
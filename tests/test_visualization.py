@@ -0,0 +1,63 @@
+import matplotlib
+import numpy as np
+import pytest
+from PIL import Image
+
+matplotlib.use('Agg')
+
+from services.visualization import Visualization  # noqa: E402
+
+
+def test_gif_has_every_frame(make_calculator, tmp_path):
+    calculator = make_calculator(t_end=0.3, dt=0.05)
+    calculator.compute_trajectories()
+    path = Visualization.save_animation(calculator, str(tmp_path / 'body.gif'), fps=10, dpi=30,
+                                        show_field=False)
+
+    with Image.open(path) as image:
+        assert image.n_frames == len(calculator.t_points)
+        assert image.info['duration'] == 100
+        assert image.info['loop'] == 0
+        first = np.asarray(image.convert('RGB'))
+        image.seek(image.n_frames - 1)
+        last = np.asarray(image.convert('RGB'))
+    assert first.shape == last.shape
+    assert np.any(first != last)
+
+
+def test_empty_animation_is_rejected(make_calculator, tmp_path, monkeypatch):
+    monkeypatch.setattr(Visualization, 'iter_animation_frames', lambda *args, **kwargs: iter(()))
+    path = tmp_path / 'empty.gif'
+    with pytest.raises(ValueError, match='Нет кадров'):
+        Visualization.save_animation(make_calculator(), str(path))
+    assert not path.exists()
+
+
+def test_streamline_arrows_follow_flow():
+    from matplotlib.figure import Figure
+    from matplotlib.quiver import Quiver
+    from services.velocity_field import VelocityField
+
+    ax = Figure().gca()
+    Visualization.draw_streamlines(ax, 0.5, n_seeds=6)
+    quiver, = [artist for artist in ax.get_children() if isinstance(artist, Quiver)]
+    velocity = VelocityField.get_default_field().evaluate(0.5, quiver.get_offsets())
+    arrows = np.column_stack([quiver.U, quiver.V])
+    assert len(arrows) > 0
+    assert np.all(np.sum(arrows * velocity, axis=1) > 0)
+
+
+def test_ffmpeg_failure_reports_its_message(make_calculator, tmp_path, monkeypatch):
+    from services import visualization
+
+    # ffmpeg, завершающийся сразу: запись кадров в канал обрывается
+    script = tmp_path / 'ffmpeg'
+    script.write_text('#!/bin/sh\necho "Unknown encoder libx264" >&2\nexit 1\n')
+    script.chmod(0o755)
+    monkeypatch.setattr(visualization.FFMpegWriter, 'isAvailable', classmethod(lambda cls: True))
+    monkeypatch.setattr(visualization.FFMpegWriter, 'bin_path', classmethod(lambda cls: str(script)))
+
+    calculator = make_calculator(t_end=0.3, dt=0.05)
+    calculator.compute_trajectories()
+    with pytest.raises(RuntimeError, match='Unknown encoder libx264'):
+        Visualization.save_animation(calculator, str(tmp_path / 'body.mp4'), dpi=30, show_field=False)